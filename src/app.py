@@ -323,8 +323,10 @@ class FleDjSONApp:
         self.app_state = {
             "page": self.page,
             "raw_data": None,
+            "raw_data_kind": None,  # "list" | "dict"(raw_data設定時に一度だけ判定)
             "data_map": {},
             "children_map": {},
+            "parent_map": {},  # 子ノードID → 親ノードID(children_map の逆引き)
             "root_ids": [],
             "selected_node_id": None,
             "id_key": None,
@@ -0,0 +1,222 @@
+"""
+edit_buffer.py
+編集バッファ用の辞書クラス
+
+フォーム編集中の値を「キーパス → 値」で保持する edit_buffer に、
+キーパスのプレフィックス索引を付加する。
+"items[0].name" のようなキーを親パスごとに索引しておくことで、
+リスト項目やフィールド配下のキーをバッファ全体を走査せずに取得できる。
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+
+class EditBuffer(dict):
+    """
+    プレフィックス索引付きの編集バッファ
+
+    通常の dict と同じように使用でき、キーの追加・削除時に以下の索引を維持する
+    (索引内のキーは dict のキーとして保持し、バッファへの挿入順を保つ)
+
+    - _descendants: 親パス → 配下のキー集合
+      ("a.b[2].c" は "a", "a.b", "a.b[2]" の配下として登録される)
+    - _list_index: リストのキーパス → {インデックス: {キー: インデックス以降の部分}}
+      ("a.b[2].c" は "a.b" の 2 番目に ".c" として、"a.b[2]" 自身は "" として登録される)
+
+    キーの解析は挿入時に一度だけ行い、結果を索引に保持する
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._descendants: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._list_index: Dict[str, Dict[int, Dict[str, str]]] = defaultdict(dict)
+        self.update(*args, **kwargs)
+
+    # ----- 索引の維持 -----
+
+    @staticmethod
+    def _iter_ancestors(key: str) -> Iterator[Tuple[str, int, str]]:
+        """
+        キーパスの親パスを列挙する
+
+        Args:
+            key (str): キーパス
+
+        Yields:
+            Tuple[str, int, str]: (親パス, リストインデックス, インデックス以降の部分)。
+                親がリストでない('.' 区切りの)場合、インデックスは -1
+        """
+        for pos, char in enumerate(key):
+            if pos == 0:
+                continue
+            if char == ".":
+                yield key[:pos], -1, ""
+            elif char == "[":
+                end = key.find("]", pos)
+                index_str = key[pos + 1:end] if end != -1 else ""
+                if index_str.isdigit():
+                    yield key[:pos], int(index_str), key[end + 1:]
+                else:
+                    yield key[:pos], -1, ""
+
+    def _index_key(self, key: str) -> None:
+        if not isinstance(key, str):
+            return
+        for parent, index, trailing in self._iter_ancestors(key):
+            self._descendants[parent][key] = None
+            if index >= 0:
+                self._list_index[parent].setdefault(index, {})[key] = trailing
+
+    def _unindex_key(self, key: str) -> None:
+        if not isinstance(key, str):
+            return
+        for parent, index, _ in self._iter_ancestors(key):
+            keys = self._descendants.get(parent)
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del self._descendants[parent]
+            if index >= 0:
+                entries = self._list_index.get(parent)
+                if entries is not None and index in entries:
+                    entries[index].pop(key, None)
+                    if not entries[index]:
+                        del entries[index]
+                    if not entries:
+                        del self._list_index[parent]
+
+    # ----- dict のオーバーライド -----
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self:
+            self._index_key(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._unindex_key(key)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key in self:
+            self._unindex_key(key)
+        return super().pop(key, *default)
+
+    def popitem(self) -> Tuple[str, Any]:
+        key, value = super().popitem()
+        self._unindex_key(key)
+        return key, value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self._descendants.clear()
+        self._list_index.clear()
+
+    def copy(self) -> "EditBuffer":
+        return EditBuffer(self)
+
+    def __reduce__(self):
+        # copy / pickle 時は索引を __init__ で再構築する
+        return self.__class__, (dict(self),)
+
+    # ----- プレフィックス検索 -----
+
+    def children_with_prefix(self, prefix: str) -> List[str]:
+        """
+        指定パス配下のキーを取得する("items[0]" → "items[0].name" など)
+
+        Args:
+            prefix (str): 親パス
+
+        Returns:
+            List[str]: 配下のキー(prefix 自身は含まない、挿入順)
+        """
+        return list(self._descendants.get(prefix, ()))
+
+    def subtree_keys(self, path: str) -> List[str]:
+        """
+        指定パス自身とその配下のキーを取得する
+
+        Args:
+            path (str): キーパス
+
+        Returns:
+            List[str]: path 自身(バッファに存在する場合)と配下のキー
+        """
+        keys = self.children_with_prefix(path)
+        if path in self:
+            keys.insert(0, path)
+        return keys
+
+    def list_entries(self, key_path: str) -> Dict[int, List[str]]:
+        """
+        リストのキーパスについて、インデックスごとに項目のキーを取得する
+
+        Args:
+            key_path (str): リストのキーパス(例: "items")
+
+        Returns:
+            Dict[int, List[str]]: {インデックス: キーのリスト(挿入順)}。
+                例: {0: ["items[0].name", "items[0].value"], 1: ["items[1]"]}
+        """
+        return {index: list(keys) for index, keys in self._list_index.get(key_path, {}).items()}
+
+    def list_indices(self, key_path: str) -> List[int]:
+        """
+        リストのキーパスについて、バッファ内に項目があるインデックスを取得する
+
+        Args:
+            key_path (str): リストのキーパス(例: "items")
+
+        Returns:
+            List[int]: インデックスのリスト(昇順)
+        """
+        return sorted(self._list_index.get(key_path, ()))
+
+    def max_list_index(self, key_path: str) -> int:
+        """
+        リストのキーパスについて、バッファ内の最大インデックスを取得する
+
+        Args:
+            key_path (str): リストのキーパス(例: "items")
+
+        Returns:
+            int: 最大インデックス。項目がない場合は -1
+        """
+        return max(self._list_index.get(key_path, ()), default=-1)
+
+    def list_item_fields(self, key_path: str, index: int) -> List[Tuple[str, str]]:
+        """
+        リスト項目のキーと、インデックス以降の部分を取得する
+
+        Args:
+            key_path (str): リストのキーパス(例: "items")
+            index (int): 項目のインデックス
+
+        Returns:
+            List[Tuple[str, str]]: (キー, インデックス以降の部分) のリスト。
+                例: [("items[0].name", ".name"), ("items[0]", "")]
+        """
+        return list(self._list_index.get(key_path, {}).get(index, {}).items())
+
+    def remove_keys(self, keys: Iterable[str]) -> None:
+        """
+        複数のキーをまとめて削除する(存在しないキーは無視する)
+
+        Args:
+            keys: 削除するキー
+        """
+        for key in keys:
+            self.pop(key, None)
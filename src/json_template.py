@@ -9,7 +9,6 @@ from typing import Dict, List, Any, Optional, Set, Union, Tuple, Callable
 from collections import defaultdict, Counter
 import json
 import re
-import copy
 from enum import Enum, auto
 import statistics
 from datetime import datetime
@@ -156,6 +155,19 @@ class JSONTemplate:
             # 16進数カラーコード
             "color": re.compile(r'^#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})$'),
         }
+
+        # 日付・値のパターンを名前付きグループの選択（|）にまとめた正規表現
+        # （先に並べたパターンが優先されるため、日付 → 値のパターンの順に並べる）
+        self._value_type_groups: Dict[str, str] = {}
+        alternatives = []
+        for i, pattern in enumerate(self._date_patterns):
+            group_name = f"date_{i}"
+            self._value_type_groups[group_name] = FieldType.DATE.value
+            alternatives.append(f"(?P<{group_name}>{pattern.pattern})")
+        for type_name, pattern in self._value_patterns.items():
+            self._value_type_groups[type_name] = getattr(FieldType, type_name.upper()).value
+            alternatives.append(f"(?P<{type_name}>{pattern.pattern})")
+        self._value_type_re = re.compile("|".join(alternatives))
     
     def analyze_json_structure(self, data: Union[List, Dict]) -> Dict[str, Any]:
         """
@@ -349,15 +361,11 @@ class JSONTemplate:
             return FieldType.NUMBER.value
         
         if isinstance(value, str):
-            # 日付文字列かどうかをチェック
-            for pattern in self._date_patterns:
-                if pattern.match(value):
-                    return FieldType.DATE.value
-            
-            # その他の型パターンをチェック
-            for type_name, pattern in self._value_patterns.items():
-                if pattern.match(value):
-                    return getattr(FieldType, type_name.upper()).value
+            # 日付文字列・その他の型パターンを1回の match でチェック
+            # （一致したグループ名から型を求める。外側の名前付きグループが最後に閉じるため lastgroup で取得できる）
+            match = self._value_type_re.match(value)
+            if match:
+                return self._value_type_groups[match.lastgroup]
             
             # デフォルトは文字列型
             return FieldType.STRING.value
@@ -612,51 +620,13 @@ class JSONTemplate:
             data: 適用先のデータ
             
         Returns:
-            Dict[str, Any]: テンプレートが適用されたデータ
+            Dict[str, Any]: テンプレートが適用されたデータ（変更のない部分は data と共有します）
         """
         if not template or not data:
             return data
         
-        # データのコピーを作成
-        result = copy.deepcopy(data)
-        
-        # テンプレートがオブジェクト型の場合
-        if template["type"] == FieldType.OBJECT.value:
-            # 必須フィールドの補完
-            for field_name, field_info in template["fields"].items():
-                if field_info.get("importance") == FieldImportance.REQUIRED.value and field_name not in result:
-                    # サンプルデータがある場合はそれを使用
-                    if "sample_data" in template and field_name in template["sample_data"]:
-                        result[field_name] = template["sample_data"][field_name]
-                    else:
-                        # サンプルデータがない場合はデフォルト値を生成
-                        result[field_name] = self._generate_default_value(field_info["type"])
-            
-            # 再帰的に子オブジェクトにテンプレートを適用
-            for field_name, field_value in result.items():
-                if field_name in template["fields"]:
-                    field_template = template["fields"][field_name]
-                    
-                    if field_template["type"] == FieldType.OBJECT.value and isinstance(field_value, dict):
-                        result[field_name] = self.apply_template(field_template, field_value)
-                    elif field_template["type"] == FieldType.ARRAY.value and isinstance(field_value, list):
-                        # 配列の各要素にテンプレートを適用
-                        if "common_fields" in field_template and field_template["common_fields"]:
-                            result[field_name] = [
-                                self.apply_template({"type": FieldType.OBJECT.value, "fields": field_template["common_fields"]}, item)
-                                if isinstance(item, dict) else item
-                                for item in field_value
-                            ]
-        
-        # テンプレートが配列型の場合
-        elif template["type"] == FieldType.ARRAY.value and isinstance(data, list):
-            # 配列の各要素にテンプレートを適用
-            if "common_fields" in template and template["common_fields"]:
-                result = [
-                    self.apply_template({"type": FieldType.OBJECT.value, "fields": template["common_fields"]}, item)
-                    if isinstance(item, dict) else item
-                    for item in data
-                ]
+        # 不足フィールドの補完は、変更が必要な辞書・リストだけを作り直して行う（入力全体はコピーしない）
+        result = self._merge_template(template, data)
         
         # イベントハブが利用可能な場合、イベントを発行
         if self.event_hub:
@@ -672,6 +642,79 @@ class JSONTemplate:
         
         return result
     
+    def _merge_template(self, template: Dict[str, Any], data: Any) -> Any:
+        """
+        テンプレートをデータに適用した結果を作成します。
+
+        フィールドを補完する辞書と、要素が変わるリストだけを新しく作り、
+        それ以外の値は data の値をそのまま使用します（変更がなければ data 自身を返します）。
+
+        Args:
+            template: 適用するテンプレート
+            data: 適用先のデータ
+
+        Returns:
+            Any: テンプレートが適用されたデータ
+        """
+        if not template or not data:
+            return data
+
+        # テンプレートが配列型の場合、各要素に共通フィールドのテンプレートを適用
+        if template["type"] == FieldType.ARRAY.value:
+            if isinstance(data, list) and template.get("common_fields"):
+                return self._merge_items(template["common_fields"], data)
+            return data
+
+        if template["type"] != FieldType.OBJECT.value or not isinstance(data, dict):
+            return data
+
+        result = data
+        fields = template["fields"]
+
+        # 必須フィールドの補完
+        for field_name, field_info in fields.items():
+            if field_info.get("importance") == FieldImportance.REQUIRED.value and field_name not in result:
+                if result is data:
+                    result = dict(data)
+                # サンプルデータがある場合はそれを使用
+                if "sample_data" in template and field_name in template["sample_data"]:
+                    result[field_name] = template["sample_data"][field_name]
+                else:
+                    # サンプルデータがない場合はデフォルト値を生成
+                    result[field_name] = self._generate_default_value(field_info["type"])
+
+        # 再帰的に子オブジェクトにテンプレートを適用
+        for field_name, field_value in list(result.items()):
+            field_template = fields.get(field_name)
+            if field_template is None:
+                continue
+
+            new_value = field_value
+            if field_template["type"] == FieldType.OBJECT.value and isinstance(field_value, dict):
+                new_value = self._merge_template(field_template, field_value)
+            elif field_template["type"] == FieldType.ARRAY.value and isinstance(field_value, list):
+                if field_template.get("common_fields"):
+                    new_value = self._merge_items(field_template["common_fields"], field_value)
+
+            if new_value is not field_value:
+                if result is data:
+                    result = dict(data)
+                result[field_name] = new_value
+
+        return result
+
+    def _merge_items(self, common_fields: Dict[str, Any], items: List[Any]) -> List[Any]:
+        """配列の各要素に共通フィールドのテンプレートを適用します（いずれかの要素が変わった場合のみ新しいリストを返します）。"""
+        item_template = {"type": FieldType.OBJECT.value, "fields": common_fields}
+        new_items = []
+        changed = False
+        for item in items:
+            new_item = self._merge_template(item_template, item) if isinstance(item, dict) else item
+            if new_item is not item:
+                changed = True
+            new_items.append(new_item)
+        return new_items if changed else items
+
     def _generate_default_value(self, field_type: str) -> Any:
         """フィールドタイプに基づいてデフォルト値を生成します。"""
         if field_type == FieldType.STRING.value:
@@ -154,6 +154,8 @@ class AnalysisManager:
             "total_records": total_count,
             "analyzed_records": sample_count,
             "field_details": field_details,
+            # フィールド名 → 詳細の索引(フィールド詳細の線形探索を避けるため)
+            "field_details_by_name": {f["name"]: f for f in field_details},
             "heuristic_suggestions": heuristic_suggestions,
             "id_info": id_info,
             "file_path": file_path,
@@ -1401,8 +1403,12 @@ class AnalysisManager:
             # 状態更新
             self.app_state["analysis_results"] = analysis_results
             self.app_state["raw_data"] = raw_data
+            self.app_state["raw_data_kind"] = "list" if isinstance(raw_data, list) else "dict" if isinstance(raw_data, dict) else None
             self.app_state["data_map"] = {}
+            self.app_state.pop("_numeric_id_max", None)
+            self.app_state.pop("_next_new_item_counter", None)
             self.app_state["children_map"] = {}
+            self.app_state["parent_map"] = {}
             self.app_state["root_ids"] = []
             self.app_state["selected_node_id"] = None
             self.app_state["edit_buffer"] = {}
@@ -16,6 +16,7 @@ import gc
 import time
 from datetime import datetime
 import re
+import sys
 import traceback
 from collections import defaultdict
 
@@ -399,6 +400,7 @@ class DataManager:
         """読み込まれたデータを処理する"""
         try:
             self.app_state["raw_data"] = data
+            self.app_state["raw_data_kind"] = "list" if isinstance(data, list) else "dict" if isinstance(data, dict) else None
             self.app_state["current_file"] = file_path
             self.app_state["selected_node_id"] = None
             
@@ -460,7 +462,7 @@ class DataManager:
                 # 検索マネージャーのインデックス更新
                 search_manager = self.app_state.get("search_manager")
                 if search_manager:
-                    search_manager.update_search_index()
+                    search_manager.update_search_index(force=True)
                     logger.debug("検索インデックスを更新しました")
                 
                 # メインコンテンツと検索UIを表示
@@ -625,9 +627,12 @@ class DataManager:
         logger.debug("Clearing existing data structures for new file...")
         self.app_state["data_map"] = {}
         self.app_state["children_map"] = {}
+        self.app_state["parent_map"] = {}
         self.app_state["root_ids"] = []
         self.app_state["selected_node_id"] = None
         self.app_state["edit_buffer"] = {}
+        self.app_state.pop("_numeric_id_max", None)
+        self.app_state.pop("_next_new_item_counter", None)
         self.app_state["is_dirty"] = False
         
         # UI関連の状態もクリア
@@ -648,6 +653,7 @@ class DataManager:
             if isinstance(raw_data, dict):
                 raw_data = [raw_data]
                 self.app_state["raw_data"] = raw_data
+                self.app_state["raw_data_kind"] = "list"
                 logger.debug("単一オブジェクトをリスト形式に変換してdata_mapを構築します")
 
             id_key = analysis["heuristic_suggestions"].get("identifier")
@@ -670,20 +676,24 @@ class DataManager:
             # データマップとルートIDsをクリア
             self.app_state["data_map"] = {}
             self.app_state["children_map"] = {}
+            self.app_state["parent_map"] = {}
             self.app_state["root_ids"] = []
             all_child_ids = set()
 
             # データマップを構築
+            # (IDは data_map・children_map・検索インデックスで繰り返し使われるため sys.intern で共有する)
             for item in raw_data:
                 if isinstance(item, dict) and id_key in item:
-                    item_id = str(item[id_key])
+                    item_id = sys.intern(str(item[id_key]))
                     self.app_state["data_map"][item_id] = item.copy()  # itemのコピーをdata_mapに格納
 
                     # children_map の構築
                     if children_key and children_key in item and isinstance(item[children_key], list):
-                        child_ids = [str(c_id) for c_id in item[children_key] if c_id is not None]
+                        child_ids = [sys.intern(str(c_id)) for c_id in item[children_key] if c_id is not None]
                         self.app_state["children_map"][item_id] = child_ids
                         all_child_ids.update(child_ids)
+                        # 親の逆引き(子ノードから親ノードを走査せずに求める)
+                        self.app_state["parent_map"].update(dict.fromkeys(child_ids, item_id))
                 else:
                     logger.warning(f"Skipping item due to missing ID key ('{id_key}') or not a dict: {item}")
 
@@ -771,6 +781,7 @@ class DataManager:
             # データマップとツリー構造をクリア
             self.app_state["data_map"] = {}
             self.app_state["children_map"] = {}
+            self.app_state["parent_map"] = {}
             self.app_state["root_ids"] = []
 
             # raw_dataがリストの場合、各アイテムを処理
@@ -810,6 +821,7 @@ class DataManager:
                             child_ids = [str(c_id) for c_id in children if c_id is not None]
                             self.app_state["children_map"][item_id] = child_ids
                             all_child_ids.update(child_ids)
+                            self.app_state["parent_map"].update(dict.fromkeys(child_ids, item_id))
 
                 # ルートノードの特定(子ノードとして参照されていないノード)
                 all_ids = set(self.app_state["data_map"].keys())
@@ -836,6 +848,7 @@ class DataManager:
 
                 # raw_dataを平坦化後のデータで更新
                 self.app_state["raw_data"] = flattened_data
+                self.app_state["raw_data_kind"] = "list" if isinstance(flattened_data, list) else "dict" if isinstance(flattened_data, dict) else None
 
                 logger.info(
                     f"Flat structure built with flattening: "
@@ -1148,6 +1161,7 @@ class DataManager:
             
             # データをdata_mapとraw_dataに追加するが、raw_dataへの追加位置を工夫する
             self.app_state["data_map"][new_node_id] = node_data
+            self.app_state.pop("_numeric_id_max", None)
             
             # raw_dataへの追加方法を改善: 順序を考慮して追加
             if parent_id:
@@ -1217,6 +1231,7 @@ class DataManager:
                 if parent_id not in self.app_state["children_map"]:
                     self.app_state["children_map"][parent_id] = []
                 self.app_state["children_map"][parent_id].append(new_node_id)
+                self.app_state.setdefault("parent_map", {})[new_node_id] = parent_id
             
             # UIの更新
             ui_manager = self.app_state.get("ui_manager")
@@ -1238,40 +1253,10 @@ class DataManager:
                     search_manager = SearchManager(self.app_state, self.app_state.get("ui_controls", {}))
                     self.app_state["search_manager"] = search_manager
                 
-                # raw_dataの現在の内容を確認
-                
-                # 検索インデックスの状態を確認
-                if not hasattr(search_manager, 'search_index'):
-                    print("[WARNING] search_managerにsearch_index属性がありません")
-                
-                # 完全なインデックス再構築
-                search_manager.build_search_index()
-                print(f"[OK] 検索インデックスの完全再構築を実行しました")
-                
-                # 念のため、追加したノードが検索インデックスに含まれているか確認
-                node_indexed = False
-                for item in search_manager.search_index:
-                    if item.get("id") == new_node_id:
-                        node_indexed = True
-                        break
-                
-                if node_indexed:
-                    print(f"[OK] ノードID '{new_node_id}' は検索インデックスに含まれています")
-                else:
-                    # インデックスに含まれていなければ個別に追加
-                    print(f"[WARNING] ノードID '{new_node_id}' が検索インデックスに見つからないため、個別に追加します")
-                    search_manager.update_search_index(node_id=new_node_id)
-                    print(f"[OK] ノードID '{new_node_id}' の検索インデックスを個別に更新しました")
-                
-                # 特定のキーワード('dev')が検索できることを確認
-                dev_found = False
-                for item in search_manager.search_index:
-                    if 'dev' in item.get('text', '').lower() and item.get('id') == new_node_id:
-                        dev_found = True
-                        print(f"[OK] キーワード 'dev' がノード '{new_node_id}' の検索テキストに含まれています")
-                        break
-                if not dev_found:
-                    print(f"[WARNING] キーワード 'dev' がノード '{new_node_id}' の検索テキストに含まれていません")
+                # 追加したノードの行のみを検索インデックスに追加する
+                # (SearchManager がノードIDごとの行番号を保持しているため、全体の再構築やインデックスの走査は不要)
+                search_manager.update_search_index(new_node_id)
+                print(f"[OK] ノードID '{new_node_id}' の検索インデックスを更新しました")
             except Exception as search_ex:
                 # エラーがあってもノード追加自体は成功とする
                 print(f"[WARNING] 検索インデックス更新中にエラーが発生: {search_ex}")
@@ -1340,6 +1325,8 @@ class DataManager:
         for del_id in nodes_to_delete:
             if del_id in self.app_state["data_map"]:
                 del self.app_state["data_map"][del_id]
+        # 数値IDの最大値が削除された可能性があるため、次回の採番時に再計算させる
+        self.app_state.pop("_numeric_id_max", None)
 
         # 3. children_map から削除 (キーとして、および値として)
         new_children_map = {}
@@ -1349,6 +1336,10 @@ class DataManager:
                 if new_children: # 子が残っている場合のみマップに追加
                      new_children_map[parent_id] = new_children
         self.app_state["children_map"] = new_children_map
+        self.app_state["parent_map"] = {
+            child_id: parent_id for child_id, parent_id in self.app_state.get("parent_map", {}).items()
+            if child_id not in nodes_to_delete and parent_id not in nodes_to_delete
+        }
         print(f"  - Cleaned children_map")
 
         # 4. root_ids から削除
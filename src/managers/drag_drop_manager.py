@@ -122,6 +122,12 @@ class DragDropManager:
         Returns:
             Tuple[親ノードID, インデックス]。親がない場合は(None, index)を返す
         """
+        # 親の逆引き(parent_map)が現在の children_map と一致していれば走査せずに返す
+        parent_id = self.app_state.get("parent_map", {}).get(target_node_id)
+        children_ids = self.app_state["children_map"].get(parent_id) if parent_id is not None else None
+        if children_ids and target_node_id in children_ids:
+            return parent_id, children_ids.index(target_node_id)
+
         for parent_id, children_ids in self.app_state["children_map"].items():
             if target_node_id in children_ids:
                 try:
@@ -340,6 +346,7 @@ class DragDropManager:
             if original_parent_id in self.app_state["children_map"]:
                 try:
                     self.app_state["children_map"][original_parent_id].pop(original_index)
+                    self.app_state.get("parent_map", {}).pop(dragged_node_id, None)
                     print(f"  Removed {dragged_node_id} from children_map of {original_parent_id}")
                 except IndexError:
                      print(f"[WARNING] Index error removing {dragged_node_id} from children_map of {original_parent_id}")
@@ -392,6 +399,7 @@ class DragDropManager:
                 if target_parent_id not in self.app_state["children_map"]: 
                     self.app_state["children_map"][target_parent_id] = []
                 self.app_state["children_map"][target_parent_id].insert(target_index, dragged_node_id)
+                self.app_state.setdefault("parent_map", {})[dragged_node_id] = target_parent_id
                 print(f"  Inserted {dragged_node_id} into children_map of {target_parent_id} at index {target_index}")
             else:
                 self.app_state["root_ids"].insert(target_index, dragged_node_id)
@@ -432,6 +440,7 @@ class DragDropManager:
             if new_parent_id not in self.app_state["children_map"]: 
                 self.app_state["children_map"][new_parent_id] = []
             self.app_state["children_map"][new_parent_id].append(dragged_node_id)
+            self.app_state.setdefault("parent_map", {})[dragged_node_id] = new_parent_id
             print(f"  Appended {dragged_node_id} to children_map of {new_parent_id}")
 
             # raw_dataも更新
@@ -521,6 +530,13 @@ class DragDropManager:
         Returns:
             削除が成功した場合はTrue
         """
+        # 親の逆引き(parent_map)が現在の children_map と一致していれば走査しない
+        parent_id = self.app_state.get("parent_map", {}).pop(node_id, None)
+        children = self.app_state["children_map"].get(parent_id) if parent_id is not None else None
+        if children and node_id in children:
+            self.app_state["children_map"][parent_id] = [c for c in children if c != node_id]
+            return True
+
         # 全親子関係をチェック
         for parent_id, children in self.app_state["children_map"].items():
             if node_id in children:
@@ -668,6 +684,7 @@ class DragDropManager:
             
             # 新しいIDを追加
             self.app_state["data_map"][new_id] = node_data
+            self.app_state.pop("_numeric_id_max", None)
             print(f"  [OK] data_mapのエントリを更新: {old_id} → {new_id}")
                 
             # IDフィールド自体も更新（id_keyが指定されている場合）
@@ -710,6 +727,15 @@ class DragDropManager:
                         index = children.index(check_id)
                         children[index] = new_id
                         print(f"  [OK] 親ノード {parent_id} の子リスト内の参照を更新")
+
+            # 親の逆引き(parent_map)の更新(自身の親と、子ノードの親としての参照)
+            parent_map = self.app_state.get("parent_map")
+            if parent_map is not None:
+                for check_id in [old_id, old_id_str]:
+                    if check_id in parent_map:
+                        parent_map[new_id] = parent_map.pop(check_id)
+                for child_id in self.app_state["children_map"].get(new_id, ()):
+                    parent_map[child_id] = new_id
             
             # 4. root_idsの更新
             # 数値型と文字列型の両方をチェック
@@ -13,10 +13,73 @@ import os
 import uuid
 import copy
 import re
+import asyncio
 from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
 from managers.event_aware_manager import EventAwareManager
 from event_hub import EventHub, EventType
 from translation import t
+from edit_buffer import EditBuffer
+from logging_config import get_logger
+from debug_control import get_debug_control
+
+# ロガーの取得
+logger = get_logger(__name__)
+
+# 診断用の出力(DEBUG_MODE が無効な場合は何もしない関数にし、UIスレッドでの標準出力への書き込みを避ける)
+_debug_print = print if get_debug_control().is_enabled else (lambda *args, **kwargs: None)
+
+# 配列要素のキーパス(例: "tags[0]")を判定する正規表現
+_ARRAY_ITEM_KEY_RE = re.compile(r'^(.+)\[\d+\]$')
+
+# リスト項目追加時のデフォルト値(型 → 生成関数)。list/dict は項目ごとに新しいオブジェクトを生成する
+_DEFAULT_FACTORY_FOR_TYPE = {str: str, int: int, float: float, bool: bool, list: list, dict: dict}
+
+# フィールド追加・削除通知をまとめる待ち時間(秒)
+_SNACK_DEBOUNCE_SEC = 0.25
+
+# 連続したフィールド追加による追加フォームの再構築をまとめる待ち時間(秒)
+_ADD_FORM_DEBOUNCE_SEC = 0.1
+
+# UUID形式のIDを判定する正規表現
+_UUID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
+
+
+
+@lru_cache(maxsize=64)
+def _split_field_template(template: str) -> Optional[Tuple[str, str]]:
+    """
+    "{field}" を1つだけ含む翻訳テンプレートを前後に分割する(テンプレートごとに一度だけ行う)
+
+    Args:
+        template (str): 翻訳済みのテンプレート
+
+    Returns:
+        Optional[Tuple[str, str]]: (前半, 後半)。他の置換フィールドを含む場合は None
+    """
+    pre, sep, post = template.partition("{field}")
+    if not sep or "{" in pre or "}" in pre or "{" in post or "}" in post:
+        return None
+    return pre, post
+
+
+def _format_field(template: str, field: str) -> str:
+    """
+    template.format(field=field) と同じ文字列を str.format を使わずに組み立てる
+
+    Args:
+        template (str): "{field}" を含む翻訳済みのテンプレート
+        field (str): 埋め込むフィールド名
+
+    Returns:
+        str: 組み立てたメッセージ
+    """
+    parts = _split_field_template(template)
+    if parts is None:
+        return template.format(field=field)
+    return parts[0] + field + parts[1]
 
 
 class FormManager(EventAwareManager):
@@ -64,7 +127,7 @@ class FormManager(EventAwareManager):
 
         # 編集バッファの初期化
         if "edit_buffer" not in self.app_state:
-            self.app_state["edit_buffer"] = {}
+            self.app_state["edit_buffer"] = EditBuffer()
 
         # 削除予定フィールドの初期化
         if "removed_fields" not in self.app_state:
@@ -74,6 +137,27 @@ class FormManager(EventAwareManager):
         self._key_input_order = {}
         self._input_counter = 0  # 入力順序をカウントする変数
 
+        # _page_update_batch 中の更新送信先(None の場合は即時に更新する)
+        self._deferred_page: Optional[ft.Page] = None
+
+        # 既存IDの形式判定キャッシュ((ID数, 先頭ID) → UUID形式かどうか)
+        self._id_shape_signature = None
+        self._id_shape_is_uuid = False
+
+        # 代替通知システム(_notif で初回の通知時に生成する)
+        self._notifier = None
+
+        # フィールド追加・削除通知のキュー(_enqueue_snack 参照)
+        self._snack_queue: List[str] = []
+        self._snack_task = None
+
+        # 遅延させた追加フォーム再構築のタスク(_schedule_add_form_rebuild を参照)
+        self._add_form_task = None
+
+        # _toast で使い回す SnackBar(表示のたびに内容だけを書き換える)
+        self._snack_text = ft.Text("")
+        self._snack_bar = ft.SnackBar(content=self._snack_text)
+
         # コールバック関数の初期化
         self._on_save_callback = None
         self._on_cancel_callback = None
@@ -199,7 +283,7 @@ class FormManager(EventAwareManager):
                 return self._key_input_order[parent_path] + 0.1
                 
         # 配列インデックスの処理(例: tags[0])
-        array_match = re.match(r'^(.+)\[\d+\]$', key_path)
+        array_match = _ARRAY_ITEM_KEY_RE.match(key_path)
         if array_match:
             array_path = array_match.group(1)
             if array_path in self._key_input_order:
@@ -220,7 +304,7 @@ class FormManager(EventAwareManager):
             float: 親の入力順序。親がない場合は無限大
         """
         parts = key_path.split('.')
-        array_match = re.match(r'^(.+)\[\d+\]$', key_path)
+        array_match = _ARRAY_ITEM_KEY_RE.match(key_path)
         
         # 配列の場合
         if array_match and not '.' in key_path:
@@ -236,6 +320,368 @@ class FormManager(EventAwareManager):
             
         return float('inf')
     
+    def _sort_buffer_keys(self, keys) -> List[str]:
+        """
+        edit_buffer のキーを値の適用順にソートする
+
+        1. ルートレベルのフィールドは入力順序のみでソート
+        2. ネストされたキーは親の入力順に従ってソートしつつ、同じ親を持つキー同士では階層の浅いものを優先
+
+        キーの分類は一度の走査で行い、ソートキーは各キーにつき一度だけ計算する
+
+        Args:
+            keys: ソート対象のキー(edit_buffer などの len() を持つコレクション)
+
+        Returns:
+            List[str]: ルートキー、ネストされたキーの順に並べたキーのリスト
+        """
+        if len(keys) <= 1:
+            # ソートの必要がない
+            return list(keys)
+
+        root_keys = []
+        decorated_nested = []
+        for key in keys:
+            if '.' in key or '[' in key:
+                order = (self._get_parent_order(key), key.count('.'), self._get_key_input_order(key))
+                decorated_nested.append((order, key))
+            else:
+                root_keys.append(key)
+
+        root_keys.sort(key=self._get_key_input_order)
+        if not decorated_nested:
+            # フラットなバッファはルートキーのソートのみで完了
+            return root_keys
+
+        # 同順位のキーは挿入順を保つため、ソートキーのみで安定ソートする
+        decorated_nested.sort(key=itemgetter(0))
+        return root_keys + [key for _, key in decorated_nested]
+
+    def _is_uuid_like_ids(self, existing_ids: List[str]) -> bool:
+        """
+        既存IDがUUID形式かどうかを先頭のIDで簡易的に判定する
+
+        判定結果は (ID数, 先頭ID) をキーに保持し、データが変わらない限り再判定しない
+
+        Args:
+            existing_ids (List[str]): 既存のID一覧
+
+        Returns:
+            bool: UUID形式の場合True
+        """
+        signature = (len(existing_ids), existing_ids[0] if existing_ids else None)
+        if signature != self._id_shape_signature:
+            self._id_shape_signature = signature
+            self._id_shape_is_uuid = bool(existing_ids) and _UUID_RE.match(str(existing_ids[0])) is not None
+        return self._id_shape_is_uuid
+
+    def _get_field_details_by_name(self) -> Dict[str, Dict[str, Any]]:
+        """
+        フィールド名 → フィールド詳細の索引を取得する
+
+        AnalysisManager が作成した analysis_results["field_details_by_name"] を使用する。
+        索引がない場合は field_details から作成し、analysis_results に保持する
+        (analysis_results が置き換えられると索引も一緒に破棄される)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: フィールド名 → フィールド詳細
+        """
+        analysis_results = self.app_state.get("analysis_results") or {}
+        by_name = analysis_results.get("field_details_by_name")
+        if by_name is None:
+            by_name = {f["name"]: f for f in analysis_results.get("field_details", [])}
+            if analysis_results:
+                analysis_results["field_details_by_name"] = by_name
+        return by_name
+
+    def _get_numeric_id_max(self, existing_ids: List[str]) -> int:
+        """
+        既存の数値IDの最大値を取得する
+
+        最大値は app_state["_numeric_id_max"] に保持し、未計算の場合のみ既存IDを走査する。
+        ノードの追加・削除・ID変更時は各マネージャーがこの値を破棄する
+
+        Args:
+            existing_ids (List[str]): 既存のID一覧
+
+        Returns:
+            int: 数値IDの最大値。数値IDがない場合は0
+        """
+        max_id = self.app_state.get("_numeric_id_max")
+        if max_id is None:
+            max_id = max((int(id_) for id_ in existing_ids if str(id_).isdigit()), default=0)
+            self.app_state["_numeric_id_max"] = max_id
+        return max_id
+
+    def _note_numeric_id(self, node_id: Any) -> None:
+        """
+        追加したノードのIDで数値IDの最大値を更新する
+
+        Args:
+            node_id (Any): 追加したノードのID
+        """
+        max_id = self.app_state.get("_numeric_id_max")
+        if max_id is not None and str(node_id).isdigit() and int(node_id) > max_id:
+            self.app_state["_numeric_id_max"] = int(node_id)
+
+    def _generate_fallback_node_id(self, id_key: str, existing_ids: List[str]) -> Any:
+        """
+        プレフィックス付きIDが生成できない場合に、IDフィールドの型に応じた新規IDを生成する
+
+        Args:
+            id_key (str): IDフィールドのキー
+            existing_ids (List[str]): 既存のID一覧
+
+        Returns:
+            Any: 生成したID(int または str)
+        """
+        id_field_info = self._get_field_details_by_name().get(id_key)
+        id_type = "string" # デフォルトは文字列
+        if id_field_info and id_field_info["types"]:
+            id_type = id_field_info["types"][0][0] # 最も一般的な型を取得
+
+        if id_type == "int":
+            return self._get_numeric_id_max(existing_ids) + 1
+
+        if id_type == "string":
+            # UUID形式かどうかを簡易的にチェック
+            if self._is_uuid_like_ids(existing_ids):
+                return str(uuid.uuid4())
+
+            # UUID形式でなければ、単純な文字列IDを生成(例: "new_item_1")
+            # 前回見つけた番号から探索を再開し、使用済みの番号は集合で判定する
+            existing_set = set(existing_ids)
+            count = self.app_state.get("_next_new_item_counter", 1)
+            while f"new_item_{count}" in existing_set:
+                count += 1
+            self.app_state["_next_new_item_counter"] = count
+            return f"new_item_{count}"
+
+        # float や bool など、通常IDには使われない型の場合もUUIDを生成
+        return str(uuid.uuid4())
+
+    def _notif(self, page: ft.Page):
+        """
+        ページに対応する代替通知システムを取得する(一度だけ生成し、ページが変わった場合のみ作り直す)
+
+        Args:
+            page (ft.Page): 通知を表示するページ
+
+        Returns:
+            NotificationSystem: 代替通知システム
+        """
+        notification_system = self._notifier
+        if notification_system is None or notification_system.page is not page:
+            from notification_system import NotificationSystem
+            notification_system = self._notifier = NotificationSystem(page)
+        return notification_system
+
+    def _toast(self, page: ft.Page, message: str, *, duration: int = 2000,
+               bgcolor: Optional[str] = None, action: Optional[str] = None) -> None:
+        """
+        SnackBarでメッセージを表示する
+
+        Args:
+            page (ft.Page): 表示先のページ
+            message (str): 表示するメッセージ
+            duration (int): 表示時間(ミリ秒)
+            bgcolor (Optional[str]): 背景色
+            action (Optional[str]): アクションボタンのラベル
+        """
+        self._snack_text.value = message
+        snack_bar = self._snack_bar
+        snack_bar.action = action
+        snack_bar.duration = duration
+        snack_bar.bgcolor = bgcolor
+        snack_bar.open = True
+        page.snack_bar = snack_bar
+        if self._deferred_page is None:
+            page.update()
+
+    def _notify(self, page: ft.Page, message: str, *, kind: str = "info",
+                fallback_message: Optional[str] = None, duration: int = 2000,
+                action: Optional[str] = None) -> None:
+        """
+        代替通知システムで通知し、失敗した場合のみSnackBarで通知する
+
+        Args:
+            page (ft.Page): 通知を表示するページ
+            message (str): 通知メッセージ
+            kind (str): 通知の種類(NotificationSystem の show_<kind> に対応: info, success, warning, error)
+            fallback_message (Optional[str]): SnackBarで表示するメッセージ(省略時は message)
+            duration (int): SnackBarの表示時間(ミリ秒)
+            action (Optional[str]): SnackBarのアクションボタンのラベル
+        """
+        try:
+            getattr(self._notif(page), f"show_{kind}")(message)
+            return
+        except Exception as notif_ex:
+            _debug_print(f"代替通知システムエラー: {notif_ex}")
+
+        # フォールバック: 従来のSnackBar
+        try:
+            self._toast(page, fallback_message or message, duration=duration, action=action)
+        except Exception as toast_ex:
+            _debug_print(f"[WARNING] 全ての通知方法が失敗しました: {toast_ex}")
+
+    def _enqueue_snack(self, page: ft.Page, message: str) -> None:
+        """
+        フィールド追加・削除の通知をキューに入れる
+
+        最後の通知から _SNACK_DEBOUNCE_SEC 秒間次の通知がなければ、キューの内容を一度だけ表示する。
+        表示は page.run_task でイベントループ上で行う(_schedule_add_form_rebuild と同じ)
+
+        Args:
+            page (ft.Page): 通知を表示するページ。None の場合は即時に表示する
+            message (str): 通知メッセージ
+        """
+        self._snack_queue.append(message)
+        if self._snack_task is not None:
+            self._snack_task.cancel()
+            self._snack_task = None
+        if page is None:
+            self._flush_snack_queue(page)
+            return
+        self._snack_task = page.run_task(self._debounced_snack_flush, page)
+
+    async def _debounced_snack_flush(self, page: ft.Page) -> None:
+        """_SNACK_DEBOUNCE_SEC 秒待ってからキューの通知を表示する"""
+        await asyncio.sleep(_SNACK_DEBOUNCE_SEC)
+        self._snack_task = None
+        self._flush_snack_queue(page)
+
+    def _flush_snack_queue(self, page: ft.Page) -> None:
+        """
+        キューに溜まった通知を表示する(複数ある場合は最後の通知と件数をまとめて表示)
+
+        Args:
+            page (ft.Page): 通知を表示するページ
+        """
+        messages = self._snack_queue
+        self._snack_queue = []
+        if not messages:
+            return
+
+        message = messages[-1]
+        if len(messages) > 1:
+            message = t("notification.field_changes_batched").format(last=message, count=len(messages) - 1)
+
+        self._notify(page, message, action=t("dialog.close"))
+
+    def _schedule_add_form_rebuild(self, page: Optional[ft.Page]) -> None:
+        """
+        追加フォームの再構築を予約する
+
+        最後の予約から _ADD_FORM_DEBOUNCE_SEC 秒間次の予約がなければ、一度だけ再構築する。
+        再構築は page.run_task でイベントループ上で行う(別スレッドからフォームや edit_buffer を変更しない)
+
+        Args:
+            page (Optional[ft.Page]): タスクを実行するページ。None の場合は即時に再構築する
+        """
+        self._cancel_add_form_rebuild()
+        if page is None:
+            self.update_add_form()
+            return
+        self._add_form_task = page.run_task(self._debounced_add_form_rebuild)
+
+    async def _debounced_add_form_rebuild(self) -> None:
+        """_ADD_FORM_DEBOUNCE_SEC 秒待ってから追加フォームを再構築する"""
+        await asyncio.sleep(_ADD_FORM_DEBOUNCE_SEC)
+        self._add_form_task = None
+        self.update_add_form()
+
+    def _cancel_add_form_rebuild(self) -> None:
+        """予約済みの追加フォーム再構築を取り消す(フォームを直接描画し直す場合に呼ぶ)"""
+        if self._add_form_task is not None:
+            self._add_form_task.cancel()
+            self._add_form_task = None
+
+    def _get_edit_buffer(self) -> EditBuffer:
+        """
+        プレフィックス索引付きの編集バッファを取得する
+
+        他のマネージャーが app_state["edit_buffer"] に通常の dict を設定した場合は、
+        同じ内容の EditBuffer に置き換えてから返す
+
+        Returns:
+            EditBuffer: 編集バッファ
+        """
+        edit_buffer = self.app_state.get("edit_buffer")
+        if not isinstance(edit_buffer, EditBuffer):
+            edit_buffer = EditBuffer(edit_buffer or {})
+            self.app_state["edit_buffer"] = edit_buffer
+        return edit_buffer
+
+    def _get_raw_data_kind(self) -> Optional[str]:
+        """
+        raw_dataの種類("list" | "dict")を取得する
+
+        データ読み込み時にapp_stateへ記録された値を使用し、未設定の場合のみ一度判定してキャッシュする
+
+        Returns:
+            Optional[str]: "list"、"dict"、またはraw_dataが未設定の場合None
+        """
+        kind = self.app_state.get("raw_data_kind")
+        if kind is None:
+            raw_data = self.app_state.get("raw_data")
+            if isinstance(raw_data, list):
+                kind = "list"
+            elif isinstance(raw_data, dict):
+                kind = "dict"
+            else:
+                return None
+            self.app_state["raw_data_kind"] = kind
+        return kind
+
+    def _get_raw_obj_ref(self, node_id: str, id_key: Optional[str]) -> Optional[dict]:
+        """
+        raw_data内で指定IDに対応するオブジェクトへの参照を取得する
+
+        Args:
+            node_id (str): 対象ノードのID
+            id_key (str): IDフィールドのキー
+
+        Returns:
+            Optional[dict]: 対応するオブジェクト。見つからない場合はNone
+        """
+        raw_data = self.app_state.get("raw_data")
+        if not id_key or not raw_data:
+            return None
+
+        kind = self._get_raw_data_kind()
+        if kind == "list":
+            return next((item for item in raw_data if isinstance(item, dict) and str(item.get(id_key)) == node_id), None)
+        if kind == "dict" and str(raw_data.get(id_key)) == node_id:
+            # ルートが辞書の場合(非推奨だが考慮)
+            return raw_data
+        return None
+
+    @contextmanager
+    def _page_update_batch(self, page: Optional[ft.Page]):
+        """
+        ハンドラ内の画面更新をまとめ、終了時に page.update() を1回だけ送る
+
+        ブロック内の _update_control / _toast は更新を送らず、変更はまとめてクライアントへ送られる。
+        ネストした場合は最も外側の終了時にのみ送る
+
+        Args:
+            page (Optional[ft.Page]): 更新を送るページ
+        """
+        if self._deferred_page is not None or page is None:
+            yield
+            return
+        self._deferred_page = page
+        try:
+            yield
+        finally:
+            self._deferred_page = None
+            page.update()
+
+    def _update_control(self, control: ft.Control) -> None:
+        """コントロールの変更を送る(_page_update_batch 中は終了時の page.update() にまとめる)"""
+        if self._deferred_page is None:
+            control.update()
+
     # ----- コールバック設定メソッド -----
     
     def set_on_save_callback(self, callback: Callable[[ft.ControlEvent], None]):
@@ -263,9 +709,11 @@ class FormManager(EventAwareManager):
         Args:
             selected_node_id: 選択されたノードのID
         """
+        self._cancel_add_form_rebuild()
+
         # データ追加モードの場合は何もしない
         if self.app_state.get("add_mode", False):
-            print("[INFO] In add mode, skipping detail form update.")
+            _debug_print("[INFO] In add mode, skipping detail form update.")
             return
             
         # 削除確認モードを解除(UIStateManagerと整合させる)
@@ -275,14 +723,14 @@ class FormManager(EventAwareManager):
         else:
             self.app_state["delete_confirm_mode"] = False
         
-        print(f"[UPDATE] Updating detail form for node: {selected_node_id}")
+        _debug_print(f"[UPDATE] Updating detail form for node: {selected_node_id}")
         self.app_state["selected_node_id"] = selected_node_id
         controls = []
         
         # detail_form_columnの存在確認
         detail_form_column = self.ui_controls.get("detail_form_column")
         if detail_form_column is None:
-            print("[WARNING] Warning: detail_form_column is not initialized yet")
+            _debug_print("[WARNING] Warning: detail_form_column is not initialized yet")
             return
             
         detail_form_column.controls = controls  # いったんクリア
@@ -307,25 +755,12 @@ class FormManager(EventAwareManager):
                 
                 # edit_buffer の内容をマージ
                 if self.app_state.get("edit_buffer"):
-                    print("  Merging edit_buffer into node_data for rendering...")
+                    _debug_print("  Merging edit_buffer into node_data for rendering...")
                     # キーをソートして適用順序を制御
                     # 改良版: 階層レベルを考慮しつつ入力順序を優先するソート基準
                     # 1. ルートレベルのフィールドは入力順序のみでソート
                     # 2. 子フィールドは親の入力順序を継承しつつ、部分的に階層深さを考慮
-                    
-                    # まず、キーを階層ごとにグループ化
-                    root_keys = [k for k in self.app_state["edit_buffer"].keys() if '.' not in k and '[' not in k]
-                    nested_keys = [k for k in self.app_state["edit_buffer"].keys() if '.' in k or '[' in k]
-                    
-                    # ルートキーは入力順序だけでソート
-                    sorted_root_keys = sorted(root_keys, key=lambda x: self._get_key_input_order(x))
-                    
-                    # ネストされたキーは親の入力順に従ってソートしつつ、同じ親を持つキー同士では階層の浅いものを優先
-                    sorted_nested_keys = sorted(nested_keys, 
-                                      key=lambda x: (self._get_parent_order(x), x.count('.'), self._get_key_input_order(x)))
-                    
-                    # 両方を組み合わせる
-                    sorted_keys = sorted_root_keys + sorted_nested_keys
+                    sorted_keys = self._sort_buffer_keys(self.app_state["edit_buffer"])
                     for key_path in sorted_keys:
                         # バッファにキーが存在するか再確認
                         if key_path in self.app_state["edit_buffer"]:
@@ -335,26 +770,25 @@ class FormManager(EventAwareManager):
                                 data_manager = self.app_state.get("data_manager")
                                 if data_manager:
                                     data_manager.set_value_by_path(node_data_to_render, key_path, value_to_set)
-                                    print(f"    Merged buffer: {key_path} = {repr(value_to_set)}")
+                                    _debug_print(f"    Merged buffer: {key_path} = {repr(value_to_set)}")
                                 else:
                                     print(f"[ERROR] DataManager not available for set_value_by_path")
                                     raise RuntimeError("DataManager not initialized")
                             except Exception as merge_err:
                                 # マージエラーが発生しても、他のフィールドの描画は試みる
-                                print(f"    [WARNING] Error merging buffer key '{key_path}': {merge_err}")
+                                _debug_print(f"    [WARNING] Error merging buffer key '{key_path}': {merge_err}")
                         else:
-                            print(f"    [INFO] Skipping merge for key '{key_path}' as it's no longer in buffer.")
+                            _debug_print(f"    [INFO] Skipping merge for key '{key_path}' as it's no longer in buffer.")
             else:
-                print(f"[WARNING] Node data not found in data_map for ID: {selected_node_id}")
+                _debug_print(f"[WARNING] Node data not found in data_map for ID: {selected_node_id}")
                 
             if node_data_to_render and isinstance(node_data_to_render, dict):
                 field_details_map = {}
                 if self.app_state.get("analysis_results"):
-                    field_details_map = {
-                        f["name"]: f for f in self.app_state["analysis_results"]["field_details"]
-                    }
+                    field_details_map = self._get_field_details_by_name()
                     
                 # マージ後のデータでフォームコントロールを構築
+                self.ui_controls["form_fields_by_key"] = {}
                 form_controls = self.build_form_controls(node_data_to_render, field_details_map)
                 controls.extend(form_controls)
                 
@@ -449,7 +883,7 @@ class FormManager(EventAwareManager):
         # 構築したコントロールでフォームを更新
         detail_form_column.controls = controls
         detail_form_column.update()
-        print(f"[OK] Detail form column updated for node: {selected_node_id}")
+        _debug_print(f"[OK] Detail form column updated for node: {selected_node_id}")
 
         # ボタンの状態を明示的に更新 (is_dirty に基づいて)
         self.update_detail_buttons_state()
@@ -459,12 +893,13 @@ class FormManager(EventAwareManager):
     
     def clear_detail_form(self):
         """詳細フォームの内容をクリアする"""
-        print("[CLEANUP] Clearing detail form")
+        _debug_print("[CLEANUP] Clearing detail form")
+        self._cancel_add_form_rebuild()
         
         # detail_form_columnの存在確認
         detail_form_column = self.ui_controls.get("detail_form_column")
         if detail_form_column is None:
-            print("[WARNING] Warning: detail_form_column is not initialized yet")
+            _debug_print("[WARNING] Warning: detail_form_column is not initialized yet")
             return
             
         # 選択状態をクリア
@@ -473,6 +908,9 @@ class FormManager(EventAwareManager):
         
         # コントロールをクリア
         detail_form_column.controls = [ft.Text(t("form.select_node_message"))]
+        self.ui_controls.pop("new_field_name_input", None)
+        self.ui_controls.pop("add_field_section", None)
+        self.ui_controls.pop("form_fields_by_key", None)
         
         # ボタンを非表示に
         if self.ui_controls.get("detail_save_button"): 
@@ -484,7 +922,7 @@ class FormManager(EventAwareManager):
         
         # UIを更新
         detail_form_column.update()
-        print("[OK] Detail form cleared")
+        _debug_print("[OK] Detail form cleared")
         
         # UIStateManagerと状態同期(選択ノードIDがクリアされたことを通知)
         ui_state_manager = self.app_state.get("ui_state_manager")
@@ -498,7 +936,7 @@ class FormManager(EventAwareManager):
         cancel_button = self.ui_controls.get("detail_cancel_button")
         delete_button = self.ui_controls.get("detail_delete_button")
         
-        print(f"[UPDATE] Update detail buttons state: is_dirty={is_dirty}")
+        _debug_print(f"[UPDATE] Update detail buttons state: is_dirty={is_dirty}")
         
         # save_buttonがある場合は状態を更新
         if save_button:
@@ -541,7 +979,7 @@ class FormManager(EventAwareManager):
         
         # ボタン更新に問題がある場合、フォームコンテナ全体を再構築して更新
         if is_dirty and save_button and save_button.disabled:
-            print(f"[UPDATE] Button update issue detected, triggering full form update")
+            _debug_print(f"[UPDATE] Button update issue detected, triggering full form update")
             if self.app_state.get("selected_node_id"):
                 self.update_detail_form(self.app_state.get("selected_node_id"))
     
@@ -593,39 +1031,31 @@ class FormManager(EventAwareManager):
         if not detail_form_column:
             return
 
-        # ハイライトされたコントロールを再帰的に検索（key属性を優先）
-        def find_control_with_key(controls, target_key):
-            """key属性を持つコントロールを検索"""
-            for control in controls:
-                # key属性を直接チェック
-                if hasattr(control, 'key') and control.key == target_key:
-                    return control
-
-                # 子コントロールを再帰的に検索
-                if hasattr(control, 'controls'):
-                    result = find_control_with_key(control.controls, target_key)
-                    if result:
-                        return result
-                if hasattr(control, 'content') and control.content:
-                    if hasattr(control.content, 'controls'):
-                        result = find_control_with_key(control.content.controls, target_key)
-                        if result:
-                            return result
-
-            return None
-
-        # key属性でコントロールを検索
+        # フォーム構築時に登録したフィールドの索引から検索する(ツリーは走査しない)
         target_key = f"field_{first_highlight_path}"
-        highlighted_control = find_control_with_key(detail_form_column.controls, target_key)
+        highlighted_control = self.ui_controls.get("form_fields_by_key", {}).get(first_highlight_path)
 
         if highlighted_control:
             try:
                 # scroll_toメソッドが使用可能な場合はスクロール
                 if hasattr(detail_form_column, 'scroll_to'):
                     detail_form_column.scroll_to(key=target_key, duration=300)
-                print(f"[SCROLL] ハイライトフィールド '{first_highlight_path}' へスクロールしました")
+                _debug_print(f"[SCROLL] ハイライトフィールド '{first_highlight_path}' へスクロールしました")
             except (AttributeError, RuntimeError, ValueError) as e:
-                print(f"[WARNING] スクロールに失敗: {e}")
+                _debug_print(f"[WARNING] スクロールに失敗: {e}")
+
+    def _register_form_field(self, key_path: str, control: ft.Control) -> None:
+        """
+        フィールドのコントロールを ui_controls["form_fields_by_key"] に登録する
+
+        フォーム構築時に登録しておき、ハンドラからはツリーを走査せずにキーパスで参照する
+        (索引はフォームを構築し直すたびに作り直す)
+
+        Args:
+            key_path (str): フィールドのキーパス
+            control (ft.Control): フォームに追加したコントロール
+        """
+        self.ui_controls.setdefault("form_fields_by_key", {})[key_path] = control
 
     def build_form_controls(self, data_obj: dict, field_details_map: dict, key_prefix: str = "") -> list[ft.Control]:
         """
@@ -645,7 +1075,7 @@ class FormManager(EventAwareManager):
         if not toggle_expansion_func:
             # フォールバック: 簡単なダミー関数を定義
             def toggle_expansion_func(e):
-                print("[WARNING] toggle_expansion機能が利用できません")
+                _debug_print("[WARNING] toggle_expansion機能が利用できません")
                 pass
 
         controls = []
@@ -950,6 +1380,7 @@ class FormManager(EventAwareManager):
 
             if control_to_add:
                 controls.append(control_to_add)
+                self._register_form_field(current_key_path, control_to_add)
 
         return controls
     
@@ -957,12 +1388,14 @@ class FormManager(EventAwareManager):
     
     def update_add_form(self):
         """新規追加フォームを表示する"""
-        print("[UPDATE] Updating add form...")
+        _debug_print("[UPDATE] Updating add form...")
+        # 予約済みの再構築はこの描画で不要になる
+        self._cancel_add_form_rebuild()
         
         # ui_controlsからdetail_form_columnを取得
         detail_form_column = self.ui_controls.get("detail_form_column")
         if detail_form_column is None:
-            print("[WARNING] Warning: detail_form_column is not initialized yet")
+            _debug_print("[WARNING] Warning: detail_form_column is not initialized yet")
             return
 
         # 現在の選択状態をクリア
@@ -975,7 +1408,7 @@ class FormManager(EventAwareManager):
         # 分析結果がない場合は空のフォームを表示
         if not self.app_state.get("analysis_results") or not self.app_state.get("raw_data"):
             controls.append(ft.Text(t("error.file_not_selected"), color=Colors.RED))
-            detail_form_column.update()
+            self._update_control(detail_form_column)
             return
 
         # テンプレートオブジェクトを作成
@@ -987,10 +1420,10 @@ class FormManager(EventAwareManager):
             # 重要な修正: edit_bufferが空の場合のみ初期化する
             # 既に値が入力されている場合は既存のedit_bufferを使用
             if not self.app_state.get("edit_buffer"):
-                print("  Initializing new edit_buffer with template values")
+                _debug_print("  Initializing new edit_buffer with template values")
                 sample_obj = None
 
-                if isinstance(self.app_state["raw_data"], list) and len(self.app_state["raw_data"]) > 0:
+                if self._get_raw_data_kind() == "list" and len(self.app_state["raw_data"]) > 0:
                     # サンプルとしてノードを1つ選択
                     for item in self.app_state["raw_data"]:
                         if isinstance(item, dict) and id_key in item:
@@ -1048,7 +1481,7 @@ class FormManager(EventAwareManager):
                 reset_values(template_obj)
 
                 # 新しいedit_bufferを初期化
-                self.app_state["edit_buffer"] = {}
+                self.app_state["edit_buffer"] = EditBuffer()
 
                 # テンプレートから各フィールドの初期値をバッファに設定
                 def populate_edit_buffer(obj, prefix=""):
@@ -1081,57 +1514,32 @@ class FormManager(EventAwareManager):
                 else:
                     # データマネージャーが利用できない場合はNoneを返す
                     prefixed_id = None
-                    print("[WARNING] DataManagerが利用できないため、プレフィックス付きID生成をスキップします")
+                    _debug_print("[WARNING] DataManagerが利用できないため、プレフィックス付きID生成をスキップします")
 
                 if prefixed_id:
                     # プレフィックス付きIDが生成できた場合はそれを使用
                     new_id = prefixed_id
-                    print(f"  Generated prefixed ID: {new_id}")
+                    _debug_print(f"  Generated prefixed ID: {new_id}")
                 else:
                     # プレフィックス付きIDが生成できなかった場合、フォールバックのロジックを実行
-                    id_field_info = next((f for f in self.app_state["analysis_results"]["field_details"] if f["name"] == id_key), None)
-                    id_type = "string" # デフォルトは文字列
-                    if id_field_info and id_field_info["types"]:
-                        id_type = id_field_info["types"][0][0] # 最も一般的な型を取得
-
-                    if id_type == "int":
-                        numeric_ids = [int(id_) for id_ in existing_ids if str(id_).isdigit()]
-                        new_id = max(numeric_ids) + 1 if numeric_ids else 1
-                    elif id_type == "string":
-                         # UUID形式かどうかを簡易的にチェック
-                         is_uuid_like = False
-                         if existing_ids:
-                             uuid_pattern = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
-                             if uuid_pattern.match(str(existing_ids[0])):
-                                 is_uuid_like = True
-
-                         if is_uuid_like:
-                             new_id = str(uuid.uuid4())
-                         else:
-                             # UUID形式でなければ、単純な文字列IDを生成(例: "new_item_1")
-                             count = 1
-                             while f"new_item_{count}" in existing_ids:
-                                 count += 1
-                             new_id = f"new_item_{count}"
-                    else: # float や bool など、通常IDには使われない型の場合もUUIDを生成
-                         new_id = str(uuid.uuid4())
+                    new_id = self._generate_fallback_node_id(id_key, existing_ids)
 
                 if new_id is not None:
                     # IDをバッファに設定
                     self.app_state["edit_buffer"][id_key] = new_id
-                    print(f"  Auto-generated ID set in edit_buffer: {id_key} = {new_id}")
+                    _debug_print(f"  Auto-generated ID set in edit_buffer: {id_key} = {new_id}")
 
-                print(f"  Initialized edit_buffer with {len(self.app_state['edit_buffer'])} default fields")
+                _debug_print(f"  Initialized edit_buffer with {len(self.app_state['edit_buffer'])} default fields")
             else:
-                print(f"  Using existing edit_buffer with {len(self.app_state['edit_buffer'])} fields")
+                _debug_print(f"  Using existing edit_buffer with {len(self.app_state['edit_buffer'])} fields")
 
             # フォームを構築
             # field_detailsを取得
             field_details = self.app_state["analysis_results"].get("field_details", [])
             if not field_details:
-                print("[WARNING] Warning: field_detailsが見つかりません")
+                _debug_print("[WARNING] Warning: field_detailsが見つかりません")
                 controls.append(ft.Text(t("error.field_info_missing"), color=Colors.RED))
-                detail_form_column.update()
+                self._update_control(detail_form_column)
                 return
 
             # フォームを構築
@@ -1146,7 +1554,7 @@ class FormManager(EventAwareManager):
                     try:
                         data_manager.set_value_by_path(rebuilt_obj, key_path, value)
                     except Exception as ex:
-                        print(f"  [WARNING] Error setting path {key_path}: {ex}")
+                        _debug_print(f"  [WARNING] Error setting path {key_path}: {ex}")
             
             # 新規作成フォームのタイトルとヘルプテキスト
             controls.append(
@@ -1160,6 +1568,7 @@ class FormManager(EventAwareManager):
             )
             
             # 再構築したオブジェクトからフォームコントロールを生成
+            self.ui_controls["form_fields_by_key"] = {}
             form_controls = self.build_add_form_controls(rebuilt_obj, field_details_map)
             controls.extend(form_controls)
 
@@ -1193,16 +1602,55 @@ class FormManager(EventAwareManager):
             
             # 構築したコントロールでフォームを更新
             detail_form_column.controls = controls
-            detail_form_column.update()
-            print(f"[OK] Add form updated with {len(form_controls)} controls")
+            self._update_control(detail_form_column)
+            _debug_print(f"[OK] Add form updated with {len(form_controls)} controls")
 
         except Exception as ex:
             print(f"[ERROR] Error in update_add_form: {ex}")
-            import traceback
-            traceback.print_exc()
+            logger.debug("Error in update_add_form", exc_info=True)
             controls.append(ft.Text(f"{t('form.error')}: {str(ex)}", color=Colors.RED))
             detail_form_column.controls = controls
-            detail_form_column.update()
+            self._update_control(detail_form_column)
+
+    def _build_template_field_control(self, field: str, value: Any, field_roles: Dict[str, str]) -> ft.TextField:
+        """
+        テンプレートフォーム用のフィールド入力コントロールを作成する
+
+        Args:
+            field (str): フィールド名
+            value (Any): 初期値
+            field_roles (Dict[str, str]): フィールド名 → 役割
+
+        Returns:
+            ft.TextField: 入力コントロール
+        """
+        # フィールドの型情報(利用可能な場合)
+        field_type = None
+        data_templates = self.app_state.get("data_templates", {})
+        if "main" in data_templates and "fields" in data_templates["main"]:
+            field_info = data_templates["main"]["fields"].get(field, {})
+            field_type = field_info.get("type")
+
+        # テキストフィールドを作成
+        field_label = field
+        if field in field_roles:
+            field_label = f"{field} ({field_roles[field]})"
+
+        field_control = ft.TextField(
+            label=field_label,
+            value="" if value is None else str(value),
+            data={"field_path": field, "field_type": field_type},
+            on_change=self.on_form_field_change,
+            hint_text=t("form.input_hint").format(type=field_type) if field_type else t("form.enter_value"),
+            expand=True
+        )
+
+        # 役割に基づいて追加のスタイルを適用
+        if field_roles.get(field) in ["id", "parent_id"]:
+            field_control.label_style = ft.TextStyle(weight="bold")
+
+        self._register_form_field(field, field_control)
+        return field_control
 
     def update_add_form_with_template(self, template_data: Dict[str, Any]):
         """テンプレートを使用して新規追加モード用のフォームを表示する
@@ -1210,7 +1658,7 @@ class FormManager(EventAwareManager):
         Args:
             template_data (Dict): テンプレートから生成されたデータ
         """
-        print("[UPDATE] Updating add form with template...")
+        _debug_print("[UPDATE] Updating add form with template...")
         
         # 詳細表示エリアをクリア
         detail_form_column = self.ui_controls.get("detail_form_column")
@@ -1229,7 +1677,7 @@ class FormManager(EventAwareManager):
         detail_form_column.controls.append(description)
         
         # テンプレートデータをバッファにコピー
-        self.app_state["edit_buffer"] = copy.deepcopy(template_data)
+        self.app_state["edit_buffer"] = EditBuffer(copy.deepcopy(template_data))
         
         # パターン情報を取得
         detected_patterns = self.app_state.get("detected_patterns", {})
@@ -1237,6 +1685,7 @@ class FormManager(EventAwareManager):
         
         # フォームフィールドを構築
         form_fields = []
+        self.ui_controls["form_fields_by_key"] = {}
         
         # フィールドの役割に基づいてソート
         field_order = []
@@ -1252,51 +1701,27 @@ class FormManager(EventAwareManager):
         
         # 順序付けされたフィールドでフォーム構築
         for field, _ in sorted(field_order, key=lambda x: x[1]):
-            value = template_data.get(field)
-            
-            # フィールドの型情報(利用可能な場合)
-            field_type = None
-            data_templates = self.app_state.get("data_templates", {})
-            if "main" in data_templates and "fields" in data_templates["main"]:
-                field_info = data_templates["main"]["fields"].get(field, {})
-                field_type = field_info.get("type")
-            
-            # テキストフィールドを作成
-            field_label = field
-            if field in field_roles:
-                field_label = f"{field} ({field_roles[field]})"
-                
-            field_control = ft.TextField(
-                label=field_label,
-                value="" if value is None else str(value),
-                data={"field_path": field, "field_type": field_type},
-                on_change=self.on_form_field_change,
-                hint_text=t("form.input_hint").format(type=field_type) if field_type else t("form.enter_value"),
-                expand=True
-            )
-            
-            # 役割に基づいて追加のスタイルを適用
-            if field_roles.get(field) in ["id", "parent_id"]:
-                field_control.label_style = ft.TextStyle(weight="bold")
-                
-            form_fields.append(field_control)
+            form_fields.append(self._build_template_field_control(field, template_data.get(field), field_roles))
         
         # フォームフィールドを追加
         for control in form_fields:
             detail_form_column.controls.append(control)
             
         # フィールド追加セクション
-        add_field_section = ft.Container(
+        # 入力フィールドはクリック時にフォームを走査せず参照できるよう ui_controls に保持する
+        new_field_name_input = ft.TextField(
+            label=t("form.field_name_label"),
+            expand=True,
+            data="new_field_name"
+        )
+        self.ui_controls["new_field_name_input"] = new_field_name_input
+        add_field_section = self.ui_controls["add_field_section"] = ft.Container(
             content=ft.Column(
                 [
                     ft.Text(t("form.add_field_title"), size=16, weight="bold"),
                     ft.Row(
                         [
-                            ft.TextField(
-                                label=t("form.field_name_label"),
-                                expand=True,
-                                data="new_field_name"
-                            ),
+                            new_field_name_input,
                             ft.IconButton(
                                 icon=ft.Icons.ADD_CIRCLE,
                                 tooltip=t("form.add_field_tooltip"),
@@ -1341,7 +1766,7 @@ class FormManager(EventAwareManager):
         # ui_controlsからdetail_form_columnを取得
         detail_form_column = self.ui_controls.get("detail_form_column")
         if detail_form_column is None:
-            print("[WARNING] Warning: detail_form_column is not initialized yet")
+            _debug_print("[WARNING] Warning: detail_form_column is not initialized yet")
             return
 
         # 現在の選択状態をクリア
@@ -1366,10 +1791,10 @@ class FormManager(EventAwareManager):
             # 重要な修正: edit_bufferが空の場合のみ初期化する
             # 既に値が入力されている場合は既存のedit_bufferを使用
             if not self.app_state.get("edit_buffer"):
-                print("  Initializing new edit_buffer with template values")
+                _debug_print("  Initializing new edit_buffer with template values")
                 sample_obj = None
 
-                if isinstance(self.app_state["raw_data"], list) and len(self.app_state["raw_data"]) > 0:
+                if self._get_raw_data_kind() == "list" and len(self.app_state["raw_data"]) > 0:
                     # サンプルとしてノードを1つ選択
                     for item in self.app_state["raw_data"]:
                         if isinstance(item, dict) and id_key in item:
@@ -1427,7 +1852,7 @@ class FormManager(EventAwareManager):
                 reset_values(template_obj)
 
                 # 新しいedit_bufferを初期化
-                self.app_state["edit_buffer"] = {}
+                self.app_state["edit_buffer"] = EditBuffer()
 
                 # テンプレートから各フィールドの初期値をバッファに設定
                 def populate_edit_buffer(obj, prefix=""):
@@ -1460,49 +1885,24 @@ class FormManager(EventAwareManager):
                 else:
                     # データマネージャーが利用できない場合はNoneを返す
                     prefixed_id = None
-                    print("[WARNING] DataManagerが利用できないため、プレフィックス付きID生成をスキップします")
+                    _debug_print("[WARNING] DataManagerが利用できないため、プレフィックス付きID生成をスキップします")
 
                 if prefixed_id:
                     # プレフィックス付きIDが生成できた場合はそれを使用
                     new_id = prefixed_id
-                    print(f"  Generated prefixed ID: {new_id}")
+                    _debug_print(f"  Generated prefixed ID: {new_id}")
                 else:
                     # プレフィックス付きIDが生成できなかった場合、フォールバックのロジックを実行
-                    id_field_info = next((f for f in self.app_state["analysis_results"]["field_details"] if f["name"] == id_key), None)
-                    id_type = "string" # デフォルトは文字列
-                    if id_field_info and id_field_info["types"]:
-                        id_type = id_field_info["types"][0][0] # 最も一般的な型を取得
-
-                    if id_type == "int":
-                        numeric_ids = [int(id_) for id_ in existing_ids if str(id_).isdigit()]
-                        new_id = max(numeric_ids) + 1 if numeric_ids else 1
-                    elif id_type == "string":
-                         # UUID形式かどうかを簡易的にチェック
-                         is_uuid_like = False
-                         if existing_ids:
-                             uuid_pattern = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
-                             if uuid_pattern.match(str(existing_ids[0])):
-                                 is_uuid_like = True
-
-                         if is_uuid_like:
-                             new_id = str(uuid.uuid4())
-                         else:
-                             # UUID形式でなければ、単純な文字列IDを生成(例: "new_item_1")
-                             count = 1
-                             while f"new_item_{count}" in existing_ids:
-                                 count += 1
-                             new_id = f"new_item_{count}"
-                    else: # float や bool など、通常IDには使われない型の場合もUUIDを生成
-                         new_id = str(uuid.uuid4())
+                    new_id = self._generate_fallback_node_id(id_key, existing_ids)
 
                 if new_id is not None:
                     # IDをバッファに設定
                     self.app_state["edit_buffer"][id_key] = new_id
-                    print(f"  Auto-generated ID set in edit_buffer: {id_key} = {new_id}")
+                    _debug_print(f"  Auto-generated ID set in edit_buffer: {id_key} = {new_id}")
 
-                print(f"  Initialized edit_buffer with {len(self.app_state['edit_buffer'])} default fields")
+                _debug_print(f"  Initialized edit_buffer with {len(self.app_state['edit_buffer'])} default fields")
             else:
-                print(f"  Using existing edit_buffer with {len(self.app_state['edit_buffer'])} fields")
+                _debug_print(f"  Using existing edit_buffer with {len(self.app_state['edit_buffer'])} fields")
 
             # フォームを構築
             # field_detailsを取得
@@ -1519,7 +1919,7 @@ class FormManager(EventAwareManager):
                     try:
                         data_manager.set_value_by_path(rebuilt_obj, key_path, value)
                     except Exception as ex:
-                        print(f"  [WARNING] Error setting path {key_path}: {ex}")
+                        _debug_print(f"  [WARNING] Error setting path {key_path}: {ex}")
             else:
                 # DataManagerが利用できない場合はエラー
                 print(f"[ERROR] DataManager not available for rebuilding object")
@@ -1537,6 +1937,7 @@ class FormManager(EventAwareManager):
             )
 
             # 再構築したオブジェクトからフォームコントロールを生成
+            self.ui_controls["form_fields_by_key"] = {}
             form_controls = self.build_add_form_controls(rebuilt_obj, field_details_map)
             controls.extend(form_controls)
 
@@ -1571,12 +1972,11 @@ class FormManager(EventAwareManager):
             # 構築したコントロールでフォームを更新
             detail_form_column.controls = controls
             detail_form_column.update()
-            print(f"[OK] Add form updated with {len(form_controls)} controls")
+            _debug_print(f"[OK] Add form updated with {len(form_controls)} controls")
 
         except Exception as ex:
             print(f"[ERROR] Error updating add form: {ex}")
-            import traceback
-            print(traceback.format_exc())
+            logger.debug("Error updating add form", exc_info=True)
             controls.append(ft.Text(t("error.general").format(error=str(ex)), color=Colors.RED))
             detail_form_column.update()
 
@@ -1603,7 +2003,7 @@ class FormManager(EventAwareManager):
         Args:
             e: コントロールイベント
         """
-        print("[UPDATE] Toggling add mode...")
+        _debug_print("[UPDATE] Toggling add mode...")
         
         # 現在のモードを反転
         current_mode = self.app_state.get("add_mode", False)
@@ -1623,29 +2023,27 @@ class FormManager(EventAwareManager):
             self.ui_controls["add_data_button"].update()
         
         # エディットバッファをクリア
-        self.app_state["edit_buffer"] = {}
+        self.app_state["edit_buffer"] = EditBuffer()
         
         # 現在選択されているノードを保存
         previously_selected = self.app_state.get("selected_node_id")
         
         if new_mode:  # 通常モード → 追加モード
-            print("  Entering add mode")
+            _debug_print("  Entering add mode")
             # 追加モード用のフォームを表示
             self.update_add_form()
             # スナックバー表示
             if self.page:
-                self.page.snack_bar = ft.SnackBar(ft.Text(t("notification.add_mode_started")), open=True, duration=2000)
-                self.page.update()
+                self._toast(self.page, t("notification.add_mode_started"))
         else:  # 追加モード → 通常モード
-            print("  Exiting add mode")
+            _debug_print("  Exiting add mode")
             # 以前選択していたノードのフォームを表示
             self.update_detail_form(previously_selected)
             # スナックバー表示
             if self.page:
-                self.page.snack_bar = ft.SnackBar(ft.Text(t("notification.add_mode_ended")), open=True, duration=2000)
-                self.page.update()
+                self._toast(self.page, t("notification.add_mode_ended"))
         
-        print(f"[OK] Add mode toggled: {new_mode}")
+        _debug_print(f"[OK] Add mode toggled: {new_mode}")
     
     def build_add_form_controls(self, data_obj: dict, field_details_map: dict, key_prefix: str = "") -> list[ft.Control]:
         """
@@ -1665,7 +2063,7 @@ class FormManager(EventAwareManager):
         if not toggle_expansion_func:
             # フォールバック: 簡単なダミー関数を定義
             def toggle_expansion_func(e):
-                print("[WARNING] toggle_expansion機能が利用できません")
+                _debug_print("[WARNING] toggle_expansion機能が利用できません")
                 pass
 
         controls = []
@@ -1704,7 +2102,7 @@ class FormManager(EventAwareManager):
                         ft.IconButton(
                             icon=ft.Icons.CLOSE,
                             icon_size=16,
-                            tooltip=t("tooltip.delete_field").format(field=key),
+                            tooltip=_format_field(t("tooltip.delete_field"), key),
                             data={"key_path": current_key_path, "key": key},
                             on_click=lambda e: self.confirm_delete_field(e, e.control.data["key_path"], e.control.data["key"])
                         )
@@ -1933,6 +2331,7 @@ class FormManager(EventAwareManager):
 
             if control_to_add:
                 controls.append(control_to_add)
+                self._register_form_field(current_key_path, control_to_add)
 
         return controls
     
@@ -1966,7 +2365,7 @@ class FormManager(EventAwareManager):
                 converted_value = data_manager.convert_value_based_on_type(new_value, field_type, key_path)
             else:
                 # DataManagerが利用できない場合はそのまま使用
-                print(f"[WARNING] DataManager not available for convert_value_based_on_type, using raw value")
+                _debug_print(f"[WARNING] DataManager not available for convert_value_based_on_type, using raw value")
                 converted_value = new_value
 
             # edit_buffer に記録
@@ -2001,11 +2400,11 @@ class FormManager(EventAwareManager):
                     ui_state_manager.set_edit_mode(True)
 
                 self.update_detail_buttons_state() # ボタンの状態のみ更新
-                print("[UPDATE] Form state changed to dirty")
+                _debug_print("[UPDATE] Form state changed to dirty")
         else:
-            print(f"[WARNING] Field change event without valid key_path: Control={control}, Data={field_data}")
+            _debug_print(f"[WARNING] Field change event without valid key_path: Control={control}, Data={field_data}")
             if hasattr(control, 'label'):
-                print(f"[WARNING] Label: {control.label}")
+                _debug_print(f"[WARNING] Label: {control.label}")
 
     def on_id_field_change(self, e: ft.ControlEvent):
         """
@@ -2035,13 +2434,13 @@ class FormManager(EventAwareManager):
 
         # 状態チェック
         if not current_node_id or not id_key or key_path != id_key:
-            print(f"[WARNING] ID field change detected but state is inconsistent: path={key_path}, current_id={current_node_id}, id_key={id_key}")
+            _debug_print(f"[WARNING] ID field change detected but state is inconsistent: path={key_path}, current_id={current_node_id}, id_key={id_key}")
             self.on_form_field_change(e) # 通常の変更として処理
             return
 
         node_data = self.app_state["data_map"].get(current_node_id)
         if node_data is None:
-            print(f"[WARNING] Cannot get original node data for ID {current_node_id}")
+            _debug_print(f"[WARNING] Cannot get original node data for ID {current_node_id}")
             self.on_form_field_change(e) # 通常の変更として処理
             return
 
@@ -2062,7 +2461,7 @@ class FormManager(EventAwareManager):
                 new_value = data_manager.convert_value_based_on_type(new_value_str, original_type_name, key_path)
             else:
                 # DataManagerが利用できない場合はそのまま使用
-                print(f"[WARNING] DataManager not available for convert_value_based_on_type, using raw value")
+                _debug_print(f"[WARNING] DataManager not available for convert_value_based_on_type, using raw value")
                 new_value = new_value_str
 
             new_id_str = str(new_value)
@@ -2076,7 +2475,7 @@ class FormManager(EventAwareManager):
 
         except ValueError:
             # 変換エラー時はバッファには文字列のまま入れ、エラー表示
-            print(f"[WARNING] Invalid ID format entered: '{new_value_str}' for type {original_type_name}")
+            _debug_print(f"[WARNING] Invalid ID format entered: '{new_value_str}' for type {original_type_name}")
             new_value = new_value_str # バッファには元の文字列を入れる
             control.error_text = t("error.invalid_format").format(type=original_type_name)
             control.update()
@@ -2092,7 +2491,7 @@ class FormManager(EventAwareManager):
                 ui_state_manager.set_edit_mode(True)
 
             self.update_detail_buttons_state()
-            print("[UPDATE] Form state changed to dirty due to ID change")
+            _debug_print("[UPDATE] Form state changed to dirty due to ID change")
 
     def save_changes(self, e: ft.ControlEvent):
         """
@@ -2101,13 +2500,12 @@ class FormManager(EventAwareManager):
         Args:
             e: コントロールイベント
         """
-        print("[SAVE] Saving changes...")
+        _debug_print("[SAVE] Saving changes...")
         page = e.page # スナックバー表示用に取得
 
         if not self.app_state.get("is_dirty") or not self.app_state["edit_buffer"]:
-            print("[INFO] No changes to save.")
-            page.snack_bar = ft.SnackBar(ft.Text(t("error.no_changes_to_save")), open=True, duration=2000)
-            page.update()
+            _debug_print("[INFO] No changes to save.")
+            self._toast(page, t("error.no_changes_to_save"))
             return
 
         current_node_id = self.app_state.get("selected_node_id")
@@ -2126,17 +2524,9 @@ class FormManager(EventAwareManager):
 
         # raw_data 内の対応するオブジェクトへの参照を取得
         id_key = self.app_state.get("id_key")
-        raw_obj_ref = None
-        if id_key and self.app_state.get("raw_data"):
-            # raw_data がリストであることを確認
-            if isinstance(self.app_state["raw_data"], list):
-                raw_obj_ref = next((item for item in self.app_state["raw_data"] if isinstance(item, dict) and str(item.get(id_key)) == current_node_id), None)
-            elif isinstance(self.app_state["raw_data"], dict) and str(self.app_state["raw_data"].get(id_key)) == current_node_id:
-                # ルートが辞書の場合(非推奨だが考慮)
-                raw_obj_ref = self.app_state["raw_data"]
-
-            if raw_obj_ref is None:
-                print(f"[WARNING] Warning: Corresponding object not found in raw_data for ID: {current_node_id}")
+        raw_obj_ref = self._get_raw_obj_ref(current_node_id, id_key)
+        if raw_obj_ref is None and id_key and self.app_state.get("raw_data"):
+            _debug_print(f"[WARNING] Warning: Corresponding object not found in raw_data for ID: {current_node_id}")
 
         # ID変更の処理
         new_id = None
@@ -2145,26 +2535,18 @@ class FormManager(EventAwareManager):
             new_id_value = self.app_state["edit_buffer"][id_key]
             new_id_str = str(new_id_value)
             if new_id_str != current_node_id:
-                print(f"[UPDATE] ID change requested: '{current_node_id}' -> '{new_id_str}'")
+                _debug_print(f"[UPDATE] ID change requested: '{current_node_id}' -> '{new_id_str}'")
                 if new_id_str in self.app_state["data_map"]:
                     print(f"[ERROR] Error: New ID '{new_id_str}' already exists.")
                     # 代替通知システムを使用
-                    try:
-                        from notification_system import NotificationSystem
-                        notification_system = NotificationSystem(page)
-                        notification_system.show_error(t("error.id_already_used").format(id=new_id_str))
-                    except Exception as notif_ex:
-                        # フォールバック: 従来のSnackBar
-                        page.snack_bar = ft.SnackBar(ft.Text(t("error.id_already_used").format(id=new_id_str)), open=True, duration=3000)
-                        page.snack_bar.open = True
-                        page.update()
+                    self._notify(page, t("error.id_already_used").format(id=new_id_str), kind="error", duration=3000)
                     # ID変更をバッファから削除して処理を続行
                     del self.app_state["edit_buffer"][id_key]
                 else:
                     new_id = new_id_str # ID変更を確定
 
         # edit_buffer の内容を data_map (node_data) と raw_data (raw_obj_ref) に適用
-        print("Applying changes from edit_buffer:")
+        _debug_print("Applying changes from edit_buffer:")
         update_errors = {}
 
         # DataManagerのメソッドを使用
@@ -2174,38 +2556,25 @@ class FormManager(EventAwareManager):
         # 改良版: 階層レベルを考慮しつつ入力順序を優先するソート基準
         # 1. ルートレベルのフィールドは入力順序のみでソート
         # 2. 子フィールドは親の入力順序を継承しつつ、部分的に階層深さを考慮
-        
-        # まず、キーを階層ごとにグループ化
-        root_keys = [k for k in self.app_state["edit_buffer"].keys() if '.' not in k and '[' not in k]
-        nested_keys = [k for k in self.app_state["edit_buffer"].keys() if '.' in k or '[' in k]
-        
-        # ルートキーは入力順序だけでソート
-        sorted_root_keys = sorted(root_keys, key=lambda x: self._get_key_input_order(x))
-        
-        # ネストされたキーは親の入力順に従ってソートしつつ、同じ親を持つキー同士では階層の浅いものを優先
-        sorted_nested_keys = sorted(nested_keys, 
-                          key=lambda x: (self._get_parent_order(x), x.count('.'), self._get_key_input_order(x)))
-        
-        # 両方を組み合わせる
-        sorted_keys = sorted_root_keys + sorted_nested_keys
+        sorted_keys = self._sort_buffer_keys(self.app_state["edit_buffer"])
+
+        # ID自体の更新は data_map キー変更後に行うため、ループ外で一度だけ処理する(new_id が設定されている場合)
+        if new_id is not None:
+            _debug_print(f"  Skipping data_map value update for ID key '{id_key}' for now.")
+            # raw_data の ID はここで更新しておく
+            if raw_obj_ref is not None:
+                try:
+                    if data_manager:
+                        data_manager.set_value_by_path(raw_obj_ref, id_key, self.app_state["edit_buffer"][id_key])
+                        _debug_print(f"    [OK] Successfully set raw_data value for ID key '{id_key}'")
+                except Exception as err:
+                    print(f"    [ERROR] Error setting raw_data value for ID key '{id_key}': {err}")
+                    update_errors[f"{id_key} (raw_data)"] = str(err)
+            sorted_keys = [k for k in sorted_keys if k != id_key]
 
         for key_path in sorted_keys:
             value_to_set = self.app_state["edit_buffer"][key_path]
-            # ID自体の更新は data_map キー変更後に行うためスキップ(new_id が設定されている場合)
-            if key_path == id_key and new_id is not None:
-                print(f"  Skipping data_map value update for ID key '{key_path}' for now.")
-                # raw_data の ID はここで更新しておく
-                if raw_obj_ref is not None:
-                    try:
-                        if data_manager:
-                            data_manager.set_value_by_path(raw_obj_ref, key_path, value_to_set)
-                            print(f"    [OK] Successfully set raw_data value for ID key '{key_path}'")
-                    except Exception as err:
-                        print(f"    [ERROR] Error setting raw_data value for ID key '{key_path}': {err}")
-                        update_errors[f"{key_path} (raw_data)"] = str(err)
-                continue
-
-            print(f"  Applying: {key_path} = {repr(value_to_set)} (Type: {type(value_to_set)})")
+            _debug_print(f"  Applying: {key_path} = {repr(value_to_set)} (Type: {type(value_to_set)})")
             try:
                 # data_map (node_data) を更新
                 if data_manager:
@@ -2214,7 +2583,7 @@ class FormManager(EventAwareManager):
                     
                     set_value_by_path(node_data, key_path, value_to_set)
 
-                print(f"    [OK] Successfully set data_map value for {key_path}")
+                _debug_print(f"    [OK] Successfully set data_map value for {key_path}")
 
                 # raw_data も更新 (参照が存在すれば)
                 if raw_obj_ref is not None:
@@ -2224,7 +2593,7 @@ class FormManager(EventAwareManager):
                         
                         set_value_by_path(raw_obj_ref, key_path, value_to_set)
 
-                    print(f"    [OK] Successfully set raw_data value for {key_path}")
+                    _debug_print(f"    [OK] Successfully set raw_data value for {key_path}")
 
             except (KeyError, IndexError, TypeError, ValueError) as err:
                 print(f"    [ERROR] Error setting value for {key_path}: {err}")
@@ -2232,7 +2601,7 @@ class FormManager(EventAwareManager):
 
         # ID変更があった場合の data_map キー更新処理
         if new_id is not None:
-            print(f"  Updating data_map key from '{original_node_id}' to '{new_id}'")
+            _debug_print(f"  Updating data_map key from '{original_node_id}' to '{new_id}'")
             # node_data の ID キーの値を最終確認・設定
             try:
                 final_id_value = self.app_state["edit_buffer"].get(id_key, node_data.get(id_key)) # バッファの値優先
@@ -2248,9 +2617,19 @@ class FormManager(EventAwareManager):
             self.app_state["data_map"][new_id] = node_data # 新しいIDでデータを登録
             if original_node_id in self.app_state["data_map"]:
                 del self.app_state["data_map"][original_node_id] # 古いIDのデータを削除
+            self.app_state.pop("_numeric_id_max", None) # 数値IDの最大値は次回の採番時に再計算
             self.app_state["selected_node_id"] = new_id # 選択中のノードIDも更新
             current_node_id = new_id # 後続処理のために更新
-            print(f"    [OK] data_map key updated.")
+            _debug_print(f"    [OK] data_map key updated.")
+
+        # バッファをクリアする前に構造変更(ID変更・リスト追加/削除)の有無を記録
+        structure_changed = new_id is not None or any(
+            isinstance(v, list) for v in self.app_state["edit_buffer"].values()
+        )
+        # 値のみの変更であれば、検索インデックスはフィールド単位で更新する
+        saved_values = {} if structure_changed or update_errors else {
+            key_path: self.app_state["edit_buffer"][key_path] for key_path in sorted_keys
+        }
 
         # 変更フラグとバッファをクリア
         self.app_state["edit_buffer"].clear()
@@ -2279,8 +2658,9 @@ class FormManager(EventAwareManager):
                         force_label_update=True
                     )
 
-            # ツリービュー全体を更新(左ペイン) - ID変更があった場合、表示が変わる
-            if ui_manager:
+            # ツリービュー全体を更新(左ペイン) - ID変更やリスト構造の変更があった場合のみ
+            # 値のみの変更は上記のノードスタイル更新でラベルまで反映済み
+            if structure_changed and ui_manager:
                 ui_manager.update_tree_view()
 
             # 詳細フォームを再表示(右ペイン) - 保存後は最新のデータで再描画 (更新後の current_node_id で)
@@ -2289,40 +2669,29 @@ class FormManager(EventAwareManager):
             # 検索インデックスを更新(検索機能が利用可能な場合)
             search_manager = self.app_state.get("search_manager")
             if search_manager:
-                # 現在のノードIDの検索インデックスを更新
-                search_manager.update_search_index(current_node_id)
-                print(f"[OK] ノードID '{current_node_id}' の検索インデックスを更新しました")
+                # 変更したフィールドのみを反映できない場合は、現在のノードIDの検索インデックスを更新
+                if not saved_values or not all(
+                    search_manager.mark_field_dirty(current_node_id, key_path, value)
+                    for key_path, value in saved_values.items()
+                ):
+                    search_manager.update_search_index(current_node_id)
+                elif search_manager.search_term:
+                    search_manager.perform_search()
+                _debug_print(f"[OK] ノードID '{current_node_id}' の検索インデックスを更新しました")
         except Exception as ex:
-            print(f"[WARNING] Warning: Error updating UI after save: {ex}")
-            import traceback
-            print(traceback.format_exc())
+            _debug_print(f"[WARNING] Warning: Error updating UI after save: {ex}")
+            logger.debug("Error updating UI after save", exc_info=True)
 
         # 結果を通知
         if not update_errors:
-            print("[OK] Changes saved successfully.")
+            _debug_print("[OK] Changes saved successfully.")
             # 代替通知システムを使用
-            try:
-                from notification_system import NotificationSystem
-                notification_system = NotificationSystem(page)
-                notification_system.show_success(t("notification.changes_saved"))
-            except Exception as notif_ex:
-                # フォールバック: 従来のSnackBar
-                page.snack_bar = ft.SnackBar(ft.Text(t("notification.changes_saved")), open=True, duration=2000)
-                page.snack_bar.open = True
-                page.update()
+            self._notify(page, t("notification.changes_saved"), kind="success")
         else:
-            print(f"[WARNING] Changes saved with {len(update_errors)} errors.")
+            _debug_print(f"[WARNING] Changes saved with {len(update_errors)} errors.")
             error_keys = ", ".join(update_errors.keys())
             # 代替通知システムを使用
-            try:
-                from notification_system import NotificationSystem
-                notification_system = NotificationSystem(page)
-                notification_system.show_warning(t("notification.partial_save_warning").format(errors=error_keys))
-            except Exception as notif_ex:
-                # フォールバック: 従来のSnackBar
-                page.snack_bar = ft.SnackBar(ft.Text(t("notification.partial_save_warning").format(errors=error_keys)), open=True, duration=4000)
-                page.snack_bar.open = True
-                page.update()
+            self._notify(page, t("notification.partial_save_warning").format(errors=error_keys), kind="warning", duration=4000)
 
         page.update()
 
@@ -2333,7 +2702,7 @@ class FormManager(EventAwareManager):
         Returns:
             tuple[bool, dict]: (成功フラグ, エラー辞書)
         """
-        print("[UPDATE] Applying edit_buffer to data...")
+        _debug_print("[UPDATE] Applying edit_buffer to data...")
         
         if not self.app_state.get("edit_buffer"):
             return True, {}
@@ -2350,15 +2719,9 @@ class FormManager(EventAwareManager):
             
         # raw_data 内の対応するオブジェクトへの参照を取得
         id_key = self.app_state.get("id_key")
-        raw_obj_ref = None
-        if id_key and self.app_state.get("raw_data"):
-            if isinstance(self.app_state["raw_data"], list):
-                raw_obj_ref = next((item for item in self.app_state["raw_data"] if isinstance(item, dict) and str(item.get(id_key)) == current_node_id), None)
-            elif isinstance(self.app_state["raw_data"], dict) and str(self.app_state["raw_data"].get(id_key)) == current_node_id:
-                raw_obj_ref = self.app_state["raw_data"]
-                
-            if raw_obj_ref is None:
-                print(f"[WARNING] Warning: Corresponding object not found in raw_data for ID: {current_node_id}")
+        raw_obj_ref = self._get_raw_obj_ref(current_node_id, id_key)
+        if raw_obj_ref is None and id_key and self.app_state.get("raw_data"):
+            _debug_print(f"[WARNING] Warning: Corresponding object not found in raw_data for ID: {current_node_id}")
                 
         # ID変更の処理
         new_id = None
@@ -2367,7 +2730,7 @@ class FormManager(EventAwareManager):
             new_id_value = self.app_state["edit_buffer"][id_key]
             new_id_str = str(new_id_value)
             if new_id_str != current_node_id:
-                print(f"[UPDATE] ID change requested: '{current_node_id}' -> '{new_id_str}'")
+                _debug_print(f"[UPDATE] ID change requested: '{current_node_id}' -> '{new_id_str}'")
                 if new_id_str in self.app_state["data_map"]:
                     print(f"[ERROR] Error: New ID '{new_id_str}' already exists.")
                     return False, {id_key: t("error.id_already_exists").format(id=new_id_str)}
@@ -2375,38 +2738,31 @@ class FormManager(EventAwareManager):
                     new_id = new_id_str
                     
         # edit_buffer の内容を適用
-        print("Applying changes from edit_buffer:")
+        _debug_print("Applying changes from edit_buffer:")
         update_errors = {}
         
         # DataManagerのメソッドを使用
         data_manager = self.app_state.get("data_manager")
         
         # キーをソート
-        root_keys = [k for k in self.app_state["edit_buffer"].keys() if '.' not in k and '[' not in k]
-        nested_keys = [k for k in self.app_state["edit_buffer"].keys() if '.' in k or '[' in k]
-        
-        sorted_root_keys = sorted(root_keys, key=lambda x: self._get_key_input_order(x))
-        sorted_nested_keys = sorted(nested_keys, 
-                          key=lambda x: (self._get_parent_order(x), x.count('.'), self._get_key_input_order(x)))
+        sorted_keys = self._sort_buffer_keys(self.app_state["edit_buffer"])
         
-        sorted_keys = sorted_root_keys + sorted_nested_keys
+        # ID自体の更新は data_map キー変更後に行うため、ループ外で一度だけ処理する
+        if new_id is not None:
+            _debug_print(f"  Skipping data_map value update for ID key '{id_key}' for now.")
+            if raw_obj_ref is not None:
+                try:
+                    if data_manager:
+                        data_manager.set_value_by_path(raw_obj_ref, id_key, self.app_state["edit_buffer"][id_key])
+                        _debug_print(f"    [OK] Successfully set raw_data value for ID key '{id_key}'")
+                except Exception as err:
+                    print(f"    [ERROR] Error setting raw_data value for ID key '{id_key}': {err}")
+                    update_errors[f"{id_key} (raw_data)"] = str(err)
+            sorted_keys = [k for k in sorted_keys if k != id_key]
         
         for key_path in sorted_keys:
             value_to_set = self.app_state["edit_buffer"][key_path]
-            # ID自体の更新は data_map キー変更後に行うためスキップ
-            if key_path == id_key and new_id is not None:
-                print(f"  Skipping data_map value update for ID key '{key_path}' for now.")
-                if raw_obj_ref is not None:
-                    try:
-                        if data_manager:
-                            data_manager.set_value_by_path(raw_obj_ref, key_path, value_to_set)
-                            print(f"    [OK] Successfully set raw_data value for ID key '{key_path}'")
-                    except Exception as err:
-                        print(f"    [ERROR] Error setting raw_data value for ID key '{key_path}': {err}")
-                        update_errors[f"{key_path} (raw_data)"] = str(err)
-                continue
-                
-            print(f"  Applying: {key_path} = {repr(value_to_set)} (Type: {type(value_to_set)})")
+            _debug_print(f"  Applying: {key_path} = {repr(value_to_set)} (Type: {type(value_to_set)})")
             try:
                 # data_map (node_data) を更新
                 if data_manager:
@@ -2414,7 +2770,7 @@ class FormManager(EventAwareManager):
                 else:
                     set_value_by_path(node_data, key_path, value_to_set)
                     
-                print(f"    [OK] Successfully set data_map value for {key_path}")
+                _debug_print(f"    [OK] Successfully set data_map value for {key_path}")
                 
                 # raw_data も更新
                 if raw_obj_ref is not None:
@@ -2423,7 +2779,7 @@ class FormManager(EventAwareManager):
                     else:
                         set_value_by_path(raw_obj_ref, key_path, value_to_set)
                         
-                    print(f"    [OK] Successfully set raw_data value for {key_path}")
+                    _debug_print(f"    [OK] Successfully set raw_data value for {key_path}")
                     
             except (KeyError, IndexError, TypeError, ValueError) as err:
                 print(f"    [ERROR] Error setting value for {key_path}: {err}")
@@ -2431,7 +2787,7 @@ class FormManager(EventAwareManager):
                 
         # ID変更があった場合の data_map キー更新処理
         if new_id is not None:
-            print(f"  Updating data_map key from '{original_node_id}' to '{new_id}'")
+            _debug_print(f"  Updating data_map key from '{original_node_id}' to '{new_id}'")
             try:
                 final_id_value = self.app_state["edit_buffer"].get(id_key, node_data.get(id_key))
                 if data_manager:
@@ -2445,8 +2801,9 @@ class FormManager(EventAwareManager):
             self.app_state["data_map"][new_id] = node_data
             if original_node_id in self.app_state["data_map"]:
                 del self.app_state["data_map"][original_node_id]
+            self.app_state.pop("_numeric_id_max", None)
             self.app_state["selected_node_id"] = new_id
-            print(f"    [OK] data_map key updated.")
+            _debug_print(f"    [OK] data_map key updated.")
             
         # 変更フラグとバッファをクリア
         self.app_state["edit_buffer"].clear()
@@ -2458,10 +2815,10 @@ class FormManager(EventAwareManager):
             ui_state_manager.set_edit_mode(False)
             
         if not update_errors:
-            print("[OK] Edit buffer applied successfully.")
+            _debug_print("[OK] Edit buffer applied successfully.")
             return True, {}
         else:
-            print(f"[WARNING] Edit buffer applied with {len(update_errors)} errors.")
+            _debug_print(f"[WARNING] Edit buffer applied with {len(update_errors)} errors.")
             return True, update_errors  # 部分的成功
 
     def cancel_changes(self, e: ft.ControlEvent):
@@ -2471,9 +2828,9 @@ class FormManager(EventAwareManager):
         Args:
             e: コントロールイベント
         """
-        print("[CANCEL] Canceling changes...")
+        _debug_print("[CANCEL] Canceling changes...")
         if not self.app_state.get("is_dirty"):
-            print("[INFO] No changes to cancel.")
+            _debug_print("[INFO] No changes to cancel.")
             return
 
         self.app_state["edit_buffer"].clear()
@@ -2488,22 +2845,14 @@ class FormManager(EventAwareManager):
         if selected_node_id:
             # フォームを元のデータ(変更前)で再描画
             self.update_detail_form(selected_node_id)
-            print(f"[CANCEL] Changes canceled. Restored form for node {selected_node_id}.")
+            _debug_print(f"[CANCEL] Changes canceled. Restored form for node {selected_node_id}.")
         else:
             self.update_detail_form(None) # ノードが選択されていない場合はフォームをクリア
-            print("[CANCEL] Changes canceled. No node selected, cleared form.")
+            _debug_print("[CANCEL] Changes canceled. No node selected, cleared form.")
 
         # 通知表示
         page = e.page
-        try:
-            from notification_system import NotificationSystem
-            notification_system = NotificationSystem(page)
-            notification_system.show_info(t("notification.changes_cancelled"))
-        except Exception as notif_ex:
-            # フォールバック: 従来のSnackBar
-            page.snack_bar = ft.SnackBar(ft.Text(t("notification.changes_cancelled")), open=True, duration=2000)
-            page.snack_bar.open = True
-            page.update()
+        self._notify(page, t("notification.changes_cancelled"))
     
     # ----- リスト項目操作メソッド -----
     
@@ -2515,11 +2864,11 @@ class FormManager(EventAwareManager):
             e: コントロールイベント
             key_path: 対象リストのキーパス
         """
-        print(f"[ADD] Request to add list item to: {key_path}")
+        _debug_print(f"[ADD] Request to add list item to: {key_path}")
         page = e.page
         current_node_id = self.app_state.get("selected_node_id")
         if not current_node_id:
-            print("[WARNING] No node selected.")
+            _debug_print("[WARNING] No node selected.")
             return
 
         node_data = self.app_state["data_map"].get(current_node_id)
@@ -2541,7 +2890,7 @@ class FormManager(EventAwareManager):
                     
                     target_list = get_value_by_path(node_data, key_path)
             else:
-                print(f"  Using list from edit_buffer for {key_path}")
+                _debug_print(f"  Using list from edit_buffer for {key_path}")
 
             # 取得したものがリストであることを確認
             if not isinstance(target_list, list):
@@ -2578,7 +2927,7 @@ class FormManager(EventAwareManager):
                         else:
                             # その他の型はNoneに
                             new_item[key] = None
-                    print(f"  Created new dict item by copying structure from last item: {new_item}")
+                    _debug_print(f"  Created new dict item by copying structure from last item: {new_item}")
                 else:
                     # 辞書型でない場合は単純なタイプなのでデフォルト値を取得
                     if data_manager and hasattr(data_manager, "get_default_value_for_list_item"):
@@ -2587,7 +2936,7 @@ class FormManager(EventAwareManager):
                         # フォールバック
                         
                         new_item = get_default_value_for_list_item(target_list)
-                    print(f"  Using default value for new item: {new_item}")
+                    _debug_print(f"  Using default value for new item: {new_item}")
             else:
                 # リストが空の場合はデフォルト値
                 if data_manager and hasattr(data_manager, "get_default_value_for_list_item"):
@@ -2596,7 +2945,7 @@ class FormManager(EventAwareManager):
                     # フォールバック
                     
                     new_item = get_default_value_for_list_item(target_list)
-                print(f"  List was empty, using default value for new item: {new_item}")
+                _debug_print(f"  List was empty, using default value for new item: {new_item}")
 
             new_index = len(target_list)
 
@@ -2607,7 +2956,7 @@ class FormManager(EventAwareManager):
 
             # edit_buffer にリスト全体の変更として記録
             self.app_state["edit_buffer"][key_path] = new_list
-            print(f"  Buffered list change for {key_path}: {len(new_list)} items. Added: {repr(new_item)}")
+            _debug_print(f"  Buffered list change for {key_path}: {len(new_list)} items. Added: {repr(new_item)}")
 
             # 一時的にフォームの状態を保存
             was_dirty = self.app_state.get("is_dirty", False)
@@ -2644,34 +2993,17 @@ class FormManager(EventAwareManager):
                 search_manager.update_search_index(current_node_id)
                 # 元に戻す
                 self.app_state["data_map"][current_node_id] = node_data
-                print(f"  [OK] Updated search index for node {current_node_id} after list item addition")
+                _debug_print(f"  [OK] Updated search index for node {current_node_id} after list item addition")
 
-            print(f"[OK] Item addition buffered for {key_path}. Form updated.")
+            _debug_print(f"[OK] Item addition buffered for {key_path}. Form updated.")
             # 代替通知システムを使用
-            try:
-                from notification_system import NotificationSystem
-                notification_system = NotificationSystem(page)
-                notification_system.show_success(t("notification.item_added_success").format(path=key_path))
-            except Exception as notif_ex:
-                # フォールバック: 従来のSnackBar
-                page.snack_bar = ft.SnackBar(ft.Text(t("notification.item_added_success").format(path=key_path)), open=True, duration=2500)
-                page.snack_bar.open = True
-                page.update()
+            self._notify(page, t("notification.item_added_success").format(path=key_path), kind="success", duration=2500)
 
         except Exception as err:
             print(f"[ERROR] Error processing list item addition: {err}")
-            import traceback
-            print(traceback.format_exc())
+            logger.debug("Error processing list item addition", exc_info=True)
             # 代替通知システムを使用
-            try:
-                from notification_system import NotificationSystem
-                notification_system = NotificationSystem(page)
-                notification_system.show_error(t("error.list_operation").format(operation="追加", error=err))
-            except Exception as notif_ex:
-                # フォールバック: 従来のSnackBar
-                page.snack_bar = ft.SnackBar(ft.Text(t("error.list_operation").format(operation="追加", error=err)), open=True)
-                page.snack_bar.open = True
-                page.update()
+            self._notify(page, t("error.list_operation").format(operation="追加", error=err), kind="error", duration=4000)
 
     def delete_list_item(self, e: ft.ControlEvent, key_path: str, index: int):
         """
@@ -2682,11 +3014,11 @@ class FormManager(EventAwareManager):
             key_path: 対象リストのキーパス
             index: 削除する項目のインデックス
         """
-        print(f"[DELETE] Request to delete list item: {key_path}[{index}]")
+        _debug_print(f"[DELETE] Request to delete list item: {key_path}[{index}]")
         page = e.page
         current_node_id = self.app_state.get("selected_node_id")
         if not current_node_id:
-            print("[WARNING] No node selected.")
+            _debug_print("[WARNING] No node selected.")
             return
 
         node_data = self.app_state["data_map"].get(current_node_id)
@@ -2695,8 +3027,10 @@ class FormManager(EventAwareManager):
             return
 
         try:
+            edit_buffer = self._get_edit_buffer()
+
             # 現在のリストの値を取得 (edit_buffer にあればそちらを優先)
-            target_list = self.app_state["edit_buffer"].get(key_path)
+            target_list = edit_buffer.get(key_path)
 
             data_manager = self.app_state.get("data_manager")
             if target_list is None:
@@ -2707,25 +3041,24 @@ class FormManager(EventAwareManager):
                     
                     target_list = get_value_by_path(node_data, key_path)
             else:
-                print(f"  Using list from edit_buffer for {key_path}")
+                _debug_print(f"  Using list from edit_buffer for {key_path}")
 
             if isinstance(target_list, list) and 0 <= index < len(target_list):
                 # 新しいリストを作成して項目を削除
                 new_list = [item for i, item in enumerate(target_list) if i != index]
 
                 # edit_buffer にリスト全体の変更として記録
-                self.app_state["edit_buffer"][key_path] = new_list
-                print(f"  Buffered list change for {key_path}: {len(new_list)} items")
+                edit_buffer[key_path] = new_list
+                _debug_print(f"  Buffered list change for {key_path}: {len(new_list)} items")
 
                 # 関連するバッファエントリの削除(例: list[index].field)
                 prefix_to_remove = f"{key_path}[{index}]"
-                keys_to_remove = [k for k in self.app_state["edit_buffer"] if k.startswith(prefix_to_remove)]
+                keys_to_remove = edit_buffer.subtree_keys(prefix_to_remove)
                 if keys_to_remove:
-                    print(f"  Removing related buffer entries: {keys_to_remove}")
+                    _debug_print(f"  Removing related buffer entries: {keys_to_remove}")
+                    # subtree_keys は現在バッファにあるキーのみを返すため、存在確認は不要
                     for k in keys_to_remove:
-                        # 削除対象のキーが存在するか確認してから削除
-                        if k in self.app_state["edit_buffer"]:
-                            del self.app_state["edit_buffer"][k]
+                        del edit_buffer[k]
 
                 if not self.app_state.get("is_dirty"):
                     self.app_state["is_dirty"] = True
@@ -2737,35 +3070,18 @@ class FormManager(EventAwareManager):
 
                 # UIを更新(フォーム全体を再描画)
                 self.update_detail_form(current_node_id)
-                print(f"[OK] Item deletion buffered for {key_path}[{index}]. Form updated.")
+                _debug_print(f"[OK] Item deletion buffered for {key_path}[{index}]. Form updated.")
                 # 代替通知システムを使用
-                try:
-                    from notification_system import NotificationSystem
-                    notification_system = NotificationSystem(page)
-                    notification_system.show_success(t("notification.item_delete_recorded").format(index=index))
-                except Exception as notif_ex:
-                    # フォールバック: 従来のSnackBar
-                    page.snack_bar = ft.SnackBar(ft.Text(t("notification.item_delete_recorded").format(index=index)), open=True, duration=2500)
-                    page.snack_bar.open = True
-                    page.update()
+                self._notify(page, t("notification.item_delete_recorded").format(index=index), kind="success", duration=2500)
 
             else:
                 print(f"[ERROR] Error deleting list item: List not found or index out of bounds at {key_path}")
 
         except Exception as err:
             print(f"[ERROR] Error processing list item deletion: {err}")
-            import traceback
-            print(traceback.format_exc())
+            logger.debug("Error processing list item deletion", exc_info=True)
             # 代替通知システムを使用
-            try:
-                from notification_system import NotificationSystem
-                notification_system = NotificationSystem(page)
-                notification_system.show_error(t("error.list_operation").format(operation="削除", error=err))
-            except Exception as notif_ex:
-                # フォールバック: 従来のSnackBar
-                page.snack_bar = ft.SnackBar(ft.Text(t("error.list_operation").format(operation="削除", error=err)), open=True)
-                page.snack_bar.open = True
-                page.update()
+            self._notify(page, t("error.list_operation").format(operation="削除", error=err), kind="error", duration=4000)
 
     def add_list_item_in_add_mode(self, e: ft.ControlEvent, key_path: str):
         """
@@ -2775,58 +3091,39 @@ class FormManager(EventAwareManager):
             e: コントロールイベント
             key_path: 対象リストのキーパス
         """
-        print(f"[ADD] Request to add list item to: {key_path}")
+        _debug_print(f"[ADD] Request to add list item to: {key_path}")
         page = e.page
 
         try:
-            # edit_bufferから該当キーパスのリスト情報を取得
-            target_list = []
-            prefix = f"{key_path}["
-            list_items = {}
-
-            # edit_bufferからリストの内容を収集
-            for buffer_key in self.app_state["edit_buffer"].keys():
-                if buffer_key.startswith(prefix) and "]" in buffer_key:
-                    try:
-                        # インデックスを抽出 (例: "items[0]" -> 0)
-                        index_str = buffer_key[len(prefix):buffer_key.index("]", len(prefix))]
-                        if index_str.isdigit():
-                            index = int(index_str)
-                            if index not in list_items:
-                                list_items[index] = True  # 存在確認用
-                    except ValueError:
-                        pass
-
-            # 現在のリストの最大インデックスを計算
-            new_index = max(list_items.keys()) + 1 if list_items else 0
+            # edit_bufferから該当キーパスのリストの最大インデックスを取得(項目がなければ -1)
+            # 以降は最後の項目のフィールドのみを走査する
+            edit_buffer = self._get_edit_buffer()
+            max_index = edit_buffer.max_list_index(key_path)
+            new_index = max_index + 1
 
             # 既存アイテムの構造を確認
             template_item = None
             template_index = -1
 
             # 既存のリストアイテムから最後のアイテムをテンプレートとして使用
-            if list_items:
-                max_index = max(list_items.keys())
-
+            if max_index >= 0:
                 # edit_bufferから最後のアイテムの構造を再構築
                 template_item = {}
-                for buffer_key, buffer_value in self.app_state["edit_buffer"].items():
-                    if buffer_key.startswith(f"{key_path}[{max_index}]"):
-                        # サブフィールドを持つ辞書アイテムの場合
-                        if "." in buffer_key[buffer_key.index("]")+1:]:
-                            field_parts = buffer_key.split(f"{key_path}[{max_index}].")
-                            if len(field_parts) > 1:
-                                field_name = field_parts[1]
-
-                                if template_index == -1:
-                                    template_index = max_index
-
-                                template_item[field_name] = buffer_value
-                        else:
-                            # 単純な値の場合
-                            template_item = buffer_value
+                for buffer_key, trailing in edit_buffer.list_item_fields(key_path, max_index):
+                    buffer_value = edit_buffer[buffer_key]
+                    # サブフィールドを持つ辞書アイテムの場合 (trailing: ".name" など)
+                    if trailing.startswith("."):
+                        field_name = trailing[1:]
+
+                        if template_index == -1:
                             template_index = max_index
 
+                        template_item[field_name] = buffer_value
+                    else:
+                        # 単純な値の場合
+                        template_item = buffer_value
+                        template_index = max_index
+
                 # 空の辞書の場合は単純値と判断
                 if isinstance(template_item, dict) and not template_item:
                     template_item = ""
@@ -2837,83 +3134,56 @@ class FormManager(EventAwareManager):
                     # 辞書型の場合は構造をコピーして値をリセット
                     new_item = {}
                     for key, value in template_item.items():
-                        if isinstance(value, str):
-                            new_item[key] = ""
-                        elif isinstance(value, int):
-                            new_item[key] = 0
-                        elif isinstance(value, float):
-                            new_item[key] = 0.0
-                        elif isinstance(value, bool):
-                            new_item[key] = False
-                        elif isinstance(value, (list, dict)):
-                            # 複雑な構造はリセット
-                            new_item[key] = [] if isinstance(value, list) else {}
-                        else:
-                            new_item[key] = None
+                        default_factory = _DEFAULT_FACTORY_FOR_TYPE.get(type(value))
+                        new_item[key] = default_factory() if default_factory else None
 
                     # 新しいアイテムの各フィールドをedit_bufferに追加
                     for sub_key, sub_value in new_item.items():
                         full_key_path = f"{key_path}[{new_index}].{sub_key}"
-                        self.app_state["edit_buffer"][full_key_path] = sub_value
-                        print(f"  Added {full_key_path} = {sub_value} to edit_buffer")
+                        edit_buffer[full_key_path] = sub_value
+                        _debug_print(f"  Added {full_key_path} = {sub_value} to edit_buffer")
                 else:
                     # 単純型の場合
-                    default_value = ""
-                    if isinstance(template_item, int):
-                        default_value = 0
-                    elif isinstance(template_item, float):
-                        default_value = 0.0
-                    elif isinstance(template_item, bool):
-                        default_value = False
+                    default_factory = _DEFAULT_FACTORY_FOR_TYPE.get(type(template_item), str)
+                    default_value = default_factory()
 
                     # edit_bufferに直接追加
                     new_key_path = f"{key_path}[{new_index}]"
-                    self.app_state["edit_buffer"][new_key_path] = default_value
-                    print(f"  Added {new_key_path} = {default_value} to edit_buffer")
+                    edit_buffer[new_key_path] = default_value
+                    _debug_print(f"  Added {new_key_path} = {default_value} to edit_buffer")
             else:
                 # テンプレートがない場合は空の文字列アイテムを追加
                 new_key_path = f"{key_path}[{new_index}]"
-                self.app_state["edit_buffer"][new_key_path] = ""
-                print(f"  Added {new_key_path} = \"\" to edit_buffer")
+                edit_buffer[new_key_path] = ""
+                _debug_print(f"  Added {new_key_path} = \"\" to edit_buffer")
 
             # 重要：フォーム状態の保存
-            # 現在のフォーム状態を一時的にバックアップ
-            form_state_backup = dict(self.app_state["edit_buffer"])
+            # 変更対象のリスト配下のフィールドのみを一時的にバックアップ
+            form_state_backup = {k: edit_buffer[k] for k in edit_buffer.subtree_keys(key_path)}
 
-            print(f"Added {key_path}[{new_index}] to edit_buffer")
+            _debug_print(f"Added {key_path}[{new_index}] to edit_buffer")
 
             # フォームを更新
             self.update_add_form()
 
             # 重要：バックアップしたフォーム状態を復元
             # update_add_form()で空になったフィールドを元の値で復元する
+            edit_buffer = self._get_edit_buffer()
             for key, value in form_state_backup.items():
-                if key not in self.app_state["edit_buffer"]:
-                    self.app_state["edit_buffer"][key] = value
-                    print(f"  Restored form field: {key}")
+                if key not in edit_buffer:
+                    edit_buffer[key] = value
+                    _debug_print(f"  Restored form field: {key}")
 
             # dirtyフラグを設定
             self.app_state["is_dirty"] = True
 
             # 完了通知
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text(t("notification.new_item_added").format(path=key_path)),
-                action=t("dialog.close"),
-                duration=2000
-            )
-            page.update()
+            self._toast(page, t("notification.new_item_added").format(path=key_path), action=t("dialog.close"))
 
         except Exception as ex:
             print(f"[ERROR] Error adding list item in add mode: {ex}")
-            import traceback
-            print(traceback.format_exc())
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text(t("notification.item_add_failed").format(error=str(ex))),
-                action=t("dialog.close"),
-                duration=3000,
-                bgcolor=ft.Colors.RED
-            )
-            page.update()
+            logger.debug("Error adding list item in add mode", exc_info=True)
+            self._toast(page, t("notification.item_add_failed").format(error=str(ex)), duration=3000, bgcolor=ft.Colors.RED, action=t("dialog.close"))
 
     def delete_list_item_in_add_mode(self, e: ft.ControlEvent, key_path: str, index: int):
         """
@@ -2924,77 +3194,46 @@ class FormManager(EventAwareManager):
             key_path: 対象リストのキーパス
             index: 削除する項目のインデックス
         """
-        print(f"[DELETE] Request to delete list item: {key_path}[{index}]")
+        _debug_print(f"[DELETE] Request to delete list item: {key_path}[{index}]")
         page = e.page
 
         try:
             # edit_bufferから該当する項目を削除
-            prefix = f"{key_path}[{index}]"
-            keys_to_delete = [k for k in self.app_state["edit_buffer"].keys() if k.startswith(prefix)]
+            edit_buffer = self._get_edit_buffer()
+            keys_to_delete = [k for k, _ in edit_buffer.list_item_fields(key_path, index)]
 
             if keys_to_delete:
                 for k in keys_to_delete:
-                    del self.app_state["edit_buffer"][k]
-                    print(f"  Deleted {k} from edit_buffer")
+                    del edit_buffer[k]
+                    _debug_print(f"  Deleted {k} from edit_buffer")
 
                 # 後続のインデックスを更新
-                for buffer_key in list(self.app_state["edit_buffer"].keys()):
-                    if buffer_key.startswith(f"{key_path}["):
-                        try:
-                            start_idx = len(f"{key_path}[")
-                            end_idx = buffer_key.index("]", start_idx)
-                            idx_str = buffer_key[start_idx:end_idx]
-
-                            if idx_str.isdigit():
-                                idx = int(idx_str)
-                                if idx > index:
-                                    # 新しいキーパスを作成
-                                    remaining = buffer_key[end_idx:]
-                                    new_key = f"{key_path}[{idx-1}]{remaining}"
-                                    self.app_state["edit_buffer"][new_key] = self.app_state["edit_buffer"][buffer_key]
-                                    del self.app_state["edit_buffer"][buffer_key]
-                                    print(f"  Updated index: {buffer_key} -> {new_key}")
-                        except ValueError:
-                            pass
+                # 1. 変更計画(旧キー, 新キー)をインデックスの小さい順に作成
+                renames = []
+                for idx in edit_buffer.list_indices(key_path):
+                    if idx <= index:
+                        continue
+                    new_prefix = f"{key_path}[{idx-1}]"
+                    for buffer_key, remaining in edit_buffer.list_item_fields(key_path, idx):
+                        renames.append((buffer_key, new_prefix + remaining))
+
+                # 2. 計画をまとめて適用(移動先は削除済みか直前に移動済みのため衝突しない)
+                for buffer_key, new_key in renames:
+                    edit_buffer[new_key] = edit_buffer.pop(buffer_key)
+                    _debug_print(f"  Updated index: {buffer_key} -> {new_key}")
 
                 # フォームを更新
                 self.update_add_form()
 
                 # 完了通知(代替システム)
-                try:
-                    from notification_system import NotificationSystem
-                    notification_system = NotificationSystem(page)
-                    notification_system.show_info(t("notification.item_deleted").format(index=index))
-                except Exception as notif_ex:
-                    print(f"代替通知システムエラー: {notif_ex}")
-                    try:
-                        page.snack_bar = ft.SnackBar(
-                            content=ft.Text(t("notification.item_deleted").format(index=index)),
-                            action=t("dialog.close"),
-                            duration=2000
-                        )
-                        page.update()
-                    except:
-                        print("[WARNING] 全ての通知方法が失敗しました")
+                self._notify(page, t("notification.item_deleted").format(index=index), action=t("dialog.close"))
             else:
-                page.snack_bar = ft.SnackBar(
-                    content=ft.Text(t("notification.item_not_found").format(path=key_path, index=index)),
-                    action=t("dialog.close"),
-                    duration=2000
-                )
-                page.update()
+                self._toast(page, t("notification.item_not_found").format(path=key_path, index=index), action=t("dialog.close"))
 
         except Exception as ex:
             print(f"[ERROR] Error deleting list item in add mode: {ex}")
-            import traceback
-            print(traceback.format_exc())
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text(t("notification.item_delete_failed").format(error=str(ex))),
-                action=t("dialog.close"),
-                duration=3000,
-                bgcolor=ft.Colors.RED
-            )
-            page.update()
+            logger.debug("Error deleting list item in add mode", exc_info=True)
+            self._toast(page, t("notification.item_delete_failed").format(error=str(ex)), duration=3000, bgcolor=ft.Colors.RED, action=t("dialog.close"))
     
     # ----- ノード追加・削除関連メソッド -----
     
@@ -3005,16 +3244,12 @@ class FormManager(EventAwareManager):
         Args:
             e: コントロールイベント
         """
-        print("[SAVE] Committing new node...")
+        _debug_print("[SAVE] Committing new node...")
         page = e.page
+        edit_buffer = self._get_edit_buffer()
 
-        if not self.app_state["edit_buffer"]:
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text(t("notification.no_data_to_add")),
-                action=t("dialog.close"),
-                duration=2000
-            )
-            page.update()
+        if not edit_buffer:
+            self._toast(page, t("notification.no_data_to_add"), action=t("dialog.close"))
             return
 
         try:
@@ -3023,28 +3258,18 @@ class FormManager(EventAwareManager):
 
             # edit_bufferからIDを取得
             node_id = None
-            if id_key in self.app_state["edit_buffer"]:
-                node_id = self.app_state["edit_buffer"][id_key]
+            if id_key in edit_buffer:
+                node_id = edit_buffer[id_key]
 
                 # ID値の妥当性チェック
                 if not node_id or str(node_id).strip() == "":
-                    page.snack_bar = ft.SnackBar(
-                        content=ft.Text(t("notification.id_field_required").format(field=id_key)),
-                        action=t("dialog.close"),
-                        duration=3000
-                    )
-                    page.update()
+                    self._toast(page, t("notification.id_field_required").format(field=id_key), duration=3000, action=t("dialog.close"))
                     return
 
                 # ID重複チェック
                 node_id_str = str(node_id)
                 if node_id_str in self.app_state["data_map"]:
-                    page.snack_bar = ft.SnackBar(
-                        content=ft.Text(t("notification.id_already_exists").format(id=node_id_str)),
-                        action=t("dialog.close"),
-                        duration=3000
-                    )
-                    page.update()
+                    self._toast(page, t("notification.id_already_exists").format(id=node_id_str), duration=3000, action=t("dialog.close"))
                     return
             else:
                 # IDが指定されていない場合は自動生成
@@ -3057,42 +3282,17 @@ class FormManager(EventAwareManager):
                 else:
                     # データマネージャーが利用できない場合はNoneを返す
                     node_id = None
-                    print("[WARNING] DataManagerが利用できないため、プレフィックス付きID生成をスキップします")
+                    _debug_print("[WARNING] DataManagerが利用できないため、プレフィックス付きID生成をスキップします")
 
-                print(f"  Attempted prefixed ID generation for commit: result={node_id}")
+                _debug_print(f"  Attempted prefixed ID generation for commit: result={node_id}")
 
                 # プレフィックス付きIDが生成できなかった場合、既存のロジックを実行
                 if node_id is None:
-                    id_field_info = next((f for f in self.app_state["analysis_results"]["field_details"] if f["name"] == id_key), None)
-                    id_type = "string" # デフォルトは文字列
-                    if id_field_info and id_field_info["types"]:
-                        id_type = id_field_info["types"][0][0] # 最も一般的な型を取得
-
-                    if id_type == "int":
-                        numeric_ids = [int(id_) for id_ in existing_ids if str(id_).isdigit()]
-                        node_id = max(numeric_ids) + 1 if numeric_ids else 1
-                    elif id_type == "string":
-                         # UUID形式かどうかを簡易的にチェック
-                         is_uuid_like = False
-                         if existing_ids:
-                             uuid_pattern = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
-                             if uuid_pattern.match(str(existing_ids[0])):
-                                 is_uuid_like = True
-
-                         if is_uuid_like:
-                             node_id = str(uuid.uuid4())
-                         else:
-                             # UUID形式でなければ、単純な文字列IDを生成(例: "new_item_1")
-                             count = 1
-                             while f"new_item_{count}" in existing_ids:
-                                 count += 1
-                             node_id = f"new_item_{count}"
-                    else: # float や bool など、通常IDには使われない型の場合もUUIDを生成
-                         node_id = str(uuid.uuid4())
+                    node_id = self._generate_fallback_node_id(id_key, existing_ids)
 
                 # 生成したIDをバッファに追加
-                self.app_state["edit_buffer"][id_key] = node_id
-                print(f"  Auto-generated ID set in edit_buffer: id = {node_id}")
+                edit_buffer[id_key] = node_id
+                _debug_print(f"  Auto-generated ID set in edit_buffer: id = {node_id}")
 
             # 新しいノードオブジェクトを作成
             node_id_str = str(node_id)
@@ -3102,33 +3302,20 @@ class FormManager(EventAwareManager):
             # 改良版: 階層レベルを考慮しつつ入力順序を優先するソート基準
             # 1. ルートレベルのフィールドは入力順序のみでソート
             # 2. 子フィールドは親の入力順序を継承しつつ、部分的に階層深さを考慮
-            
-            # まず、キーを階層ごとにグループ化
-            root_keys = [k for k in self.app_state["edit_buffer"].keys() if '.' not in k and '[' not in k]
-            nested_keys = [k for k in self.app_state["edit_buffer"].keys() if '.' in k or '[' in k]
-            
-            # ルートキーは入力順序だけでソート
-            sorted_root_keys = sorted(root_keys, key=lambda x: self._get_key_input_order(x))
-            
-            # ネストされたキーは親の入力順に従ってソートしつつ、同じ親を持つキー同士では階層の浅いものを優先
-            sorted_nested_keys = sorted(nested_keys, 
-                               key=lambda x: (self._get_parent_order(x), x.count('.'), self._get_key_input_order(x)))
-            
-            # 両方を組み合わせる
-            sorted_keys = sorted_root_keys + sorted_nested_keys
+            sorted_keys = self._sort_buffer_keys(edit_buffer)
             
             # IDキーだけは常に最初に処理する
             if id_key in sorted_keys:
                 sorted_keys.remove(id_key)
                 sorted_keys.insert(0, id_key)
                 
-            print(f"  [UPDATE] Using input order for node construction: {sorted_keys}")
+            _debug_print(f"  [UPDATE] Using input order for node construction: {sorted_keys}")
 
             # DataManagerのメソッドを使用
             data_manager = self.app_state.get("data_manager")
 
             for key_path in sorted_keys:
-                value = self.app_state["edit_buffer"][key_path]
+                value = edit_buffer[key_path]
                 # IDキー自体は既に設定済みなのでスキップ
                 if key_path == id_key:
                     continue
@@ -3142,22 +3329,23 @@ class FormManager(EventAwareManager):
                         
                         set_value_by_path(new_node, key_path, value)
 
-                    print(f"  Set {key_path} = {repr(value)}")
+                    _debug_print(f"  Set {key_path} = {repr(value)}")
                 except Exception as err:
-                    print(f"  [WARNING] Error setting value for {key_path}: {err}")
+                    _debug_print(f"  [WARNING] Error setting value for {key_path}: {err}")
 
             # 新しいノードをデータモデルに追加
             self.app_state["data_map"][node_id_str] = new_node
+            self._note_numeric_id(node_id_str)
 
             # raw_dataにも追加
-            if isinstance(self.app_state["raw_data"], list):
+            if self._get_raw_data_kind() == "list":
                 self.app_state["raw_data"].append(new_node)
-                print("  Added node to raw_data")
+                _debug_print("  Added node to raw_data")
 
             # ルートノードとして追加
             if "root_ids" in self.app_state:
                 self.app_state["root_ids"].append(node_id_str)
-                print("  Added node to root_ids")
+                _debug_print("  Added node to root_ids")
 
             # UIマネージャーを使ってUIを更新
             ui_manager = self.app_state.get("ui_manager")
@@ -3167,14 +3355,14 @@ class FormManager(EventAwareManager):
             # 検索インデックスを更新(重要：新規追加ノードを検索可能にする)
             search_manager = self.app_state.get("search_manager")
             if search_manager:
-                # 新規ノードの場合は全インデックスを再構築する方が確実
-                search_manager.update_search_index(None)  # None を渡すと全インデックスを再構築
+                # 追加したノードのみをインデックスに追加する(全体の再構築は読み込み時などに限る)
+                search_manager.update_search_index(node_id_str)
             else:
-                print("[WARNING] SearchManagerが見つからないため、検索インデックスの更新をスキップ")
+                _debug_print("[WARNING] SearchManagerが見つからないため、検索インデックスの更新をスキップ")
 
             # 追加モードを終了して通常モードに戻る
             self.app_state["add_mode"] = False
-            self.app_state["edit_buffer"].clear()
+            edit_buffer.clear()
 
             # UIStateManagerと状態同期
             ui_state_manager = self.app_state.get("ui_state_manager")
@@ -3191,25 +3379,13 @@ class FormManager(EventAwareManager):
                 self.ui_controls["add_data_button"].update()
 
             # 完了通知
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text(t("notification.node_added_success").format(id=node_id_str)),
-                action=t("dialog.close"),
-                duration=3000
-            )
-            page.update()
-            print(f"[OK] Successfully added new node with ID: {node_id_str}")
+            self._toast(page, t("notification.node_added_success").format(id=node_id_str), duration=3000, action=t("dialog.close"))
+            _debug_print(f"[OK] Successfully added new node with ID: {node_id_str}")
 
         except Exception as ex:
             print(f"[ERROR] Error committing new node: {ex}")
-            import traceback
-            print(traceback.format_exc())
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text(t("notification.new_node_add_failed").format(error=str(ex))),
-                action=t("dialog.close"),
-                duration=4000,
-                bgcolor=ft.Colors.RED
-            )
-            page.update()
+            logger.debug("Error committing new node", exc_info=True)
+            self._toast(page, t("notification.new_node_add_failed").format(error=str(ex)), duration=4000, bgcolor=ft.Colors.RED, action=t("dialog.close"))
 
     def show_delete_confirmation(self, e: ft.ControlEvent):
         """
@@ -3220,7 +3396,7 @@ class FormManager(EventAwareManager):
         """
         node_id = self.app_state.get("selected_node_id")
         if not node_id:
-            print("[WARNING] No node selected for deletion.")
+            _debug_print("[WARNING] No node selected for deletion.")
             return
 
         # 現在のフォームを退避して確認UIを表示
@@ -3308,7 +3484,7 @@ class FormManager(EventAwareManager):
         """ノードを削除する内部メソッド"""
         node_id = self.app_state.get("selected_node_id")
         if not node_id:
-            print("[WARNING] No node selected for deletion.")
+            _debug_print("[WARNING] No node selected for deletion.")
             return
 
         # DataManagerのメソッドを使用してノードを削除
@@ -3337,23 +3513,13 @@ class FormManager(EventAwareManager):
             self.clear_detail_form()
 
             # 完了通知(代替システム)
-            try:
-                from notification_system import NotificationSystem
-                notification_system = NotificationSystem(e.page)
-                notification_system.show_info(t("notification.node_deleted_success").format(id=node_id))
-            except Exception as notif_ex:
-                # フォールバック: 従来のSnackBar
-                print(f"代替通知システムエラー: {notif_ex}")
-                try:
-                    e.page.snack_bar = ft.SnackBar(
-                        content=ft.Text(t("notification.node_id_deleted").format(id=node_id)),
-                        action=t("dialog.close"),
-                        duration=3000
-                    )
-                    e.page.update()
-                    print("[OK] フォールバック：従来スナックバーを表示")
-                except:
-                    print("[WARNING] 全ての通知方法が失敗しました")
+            self._notify(
+                e.page,
+                t("notification.node_deleted_success").format(id=node_id),
+                fallback_message=t("notification.node_id_deleted").format(id=node_id),
+                duration=3000,
+                action=t("dialog.close")
+            )
 
     def restore_form(self, e: ft.ControlEvent):
         """
@@ -3385,15 +3551,15 @@ class FormManager(EventAwareManager):
             key: 削除するフィールドのキー名
         """
         def close_dialog(dialog_result):
-            dialog.open = False
-            e.page.update()
-
-            if dialog_result:
-                self.delete_field(e, key_path, key)
+            # ダイアログを閉じる更新とフォームの再描画を1回の送信にまとめる
+            with self._page_update_batch(e.page):
+                dialog.open = False
+                if dialog_result:
+                    self.delete_field(e, key_path, key)
 
         dialog = ft.AlertDialog(
             title=ft.Text(t("dialog.field_delete_title")),
-            content=ft.Text(t("dialog.field_delete_message").format(field=key)),
+            content=ft.Text(_format_field(t("dialog.field_delete_message"), key)),
             actions=[
                 ft.TextButton(t("dialog.yes"), on_click=lambda _: close_dialog(True)),
                 ft.TextButton(t("dialog.no"), on_click=lambda _: close_dialog(False)),
@@ -3415,82 +3581,118 @@ class FormManager(EventAwareManager):
             key: 削除するフィールドのキー名
         """
         try:
-            # キーパスを分解
-            keys = key_path.split('.')
-
-            # edit_bufferからフィールドを削除
-            for buffer_key in list(self.app_state["edit_buffer"].keys()):
-                if buffer_key == key_path or buffer_key.startswith(f"{key_path}.") or buffer_key.startswith(f"{key_path}["):
-                    del self.app_state["edit_buffer"][buffer_key]
+            # edit_bufferからフィールド(と配下のキー)を削除
+            edit_buffer = self._get_edit_buffer()
+            edit_buffer.remove_keys(edit_buffer.subtree_keys(key_path))
 
             # 追加モードのフォームを更新
             self.update_add_form()
 
-            # フィールド削除通知(代替システム)
-            try:
-                from notification_system import NotificationSystem
-                notification_system = NotificationSystem(e.page)
-                notification_system.show_info(t("notification.field_deleted").format(field=key))
-            except Exception as notif_ex:
-                print(f"代替通知システムエラー: {notif_ex}")
-                try:
-                    e.page.snack_bar = ft.SnackBar(
-                        content=ft.Text(t("notification.field_deleted").format(field=key)),
-                        action=t("dialog.close"),
-                        duration=2000
-                    )
-                    e.page.update()
-                except:
-                    print("[WARNING] 全ての通知方法が失敗しました")
+            # フィールド削除通知(連続した削除はまとめて表示する)
+            self._enqueue_snack(e.page, _format_field(t("notification.field_deleted"), key))
 
         except Exception as ex:
             print(f"[ERROR] Error deleting field: {ex}")
-            import traceback
-            print(traceback.format_exc())
-            e.page.snack_bar = ft.SnackBar(
-                content=ft.Text(t("notification.field_delete_failed").format(error=str(ex))),
-                action=t("dialog.close"),
-                duration=4000
-            )
-            e.page.update()
+            logger.debug("Error deleting field", exc_info=True)
+            self._toast(e.page, t("notification.field_delete_failed").format(error=str(ex)), duration=4000, action=t("dialog.close"))
+
+    @staticmethod
+    def _iter_descendants(root: Optional[ft.Control]):
+        """
+        コントロールツリーの子孫を深さ優先で列挙する(root 自身は含まない)
+
+        controls / content を持つコントロールを明示的なスタックで走査する
+
+        Args:
+            root (Optional[ft.Control]): 走査を開始するコントロール
+
+        Yields:
+            ft.Control: 子孫のコントロール
+        """
+        if root is None:
+            return
+        # ループ内の属性参照を減らすため、スタック操作はローカル名に束縛しておく
+        stack = [root]
+        pop, push = stack.pop, stack.append
+        while stack:
+            node = pop()
+            children = getattr(node, "controls", None)
+            if children is None:
+                content = getattr(node, "content", None)
+                children = (content,) if content is not None else ()
+            for child in children:
+                yield child
+                push(child)
+
+    @classmethod
+    def _find_control_by_data(cls, root: Optional[ft.Control], data: Any) -> Optional[ft.Control]:
+        """
+        コントロールツリーから data が一致するコントロールを探す(最初に一致した時点で走査を終える)
+
+        Args:
+            root (Optional[ft.Control]): 探索を開始するコントロール
+            data (Any): 探すコントロールの data 属性の値
+
+        Returns:
+            Optional[ft.Control]: 見つかったコントロール。見つからない場合は None
+        """
+        return next(
+            (control for control in cls._iter_descendants(root) if getattr(control, "data", None) == data),
+            None
+        )
 
     def _on_add_field_click(self, e):
         """新規フィールド追加ボタンのクリックハンドラ"""
-        # detail_form_columnから入力フィールドを探す
-        detail_form_column = self.ui_controls.get("detail_form_column")
-        if not detail_form_column:
-            return
-            
-        new_field_name = None
-        for control in detail_form_column.controls:
-            if isinstance(control, ft.Container):
-                # コンテナ内のフィールドを探す
-                content = control.content
-                if isinstance(content, ft.Column):
-                    for row in content.controls:
-                        if isinstance(row, ft.Row):
-                            for field in row.controls:
-                                if isinstance(field, ft.TextField) and hasattr(field, 'data') and field.data == "new_field_name":
-                                    new_field_name = field.value
-                                    field.value = ""  # 入力をクリア
-                                    break
-        
-        if new_field_name:
+        # 入力のクリア・フォームへの挿入をまとめて1回の page.update() で送る
+        with self._page_update_batch(e.page):
+            # フィールド追加セクション構築時に保持した入力フィールドを参照する
+            new_field_name_input = self.ui_controls.get("new_field_name_input")
+            if not new_field_name_input:
+                # 参照がない場合のみフォームから探す
+                new_field_name_input = self._find_control_by_data(
+                    self.ui_controls.get("detail_form_column"), "new_field_name"
+                )
+                if not new_field_name_input:
+                    return
+                # 次回以降のクリックで走査しないよう参照を保持する
+                self.ui_controls["new_field_name_input"] = new_field_name_input
+
+            # 前後の空白を除去し、空・既存フィールド名の場合はフォームを更新せずに終了する
+            new_field_name = (new_field_name_input.value or "").strip()
+            new_field_name_input.value = ""  # 入力をクリア
+            if not new_field_name:
+                return
+            if new_field_name in self.app_state["edit_buffer"]:
+                self._notify(e.page, _format_field(t("error.field_already_exists"), new_field_name), kind="error")
+                return
+
             # 新しいフィールドをedit_bufferに追加
             self.app_state["edit_buffer"][new_field_name] = ""
-            
-            # フォームを再構築
-            self.update_add_form()
-            
-            # 通知
-            notification = self.app_state.get("notification_system")
-            if notification:
-                notification.show_success(t("notification.field_added").format(field=new_field_name))
+
+            # フォーム全体を再構築せず、フィールド追加セクションの直前に新しいフィールドのみを挿入する
+            detail_form_column = self.ui_controls.get("detail_form_column")
+            add_field_section = self.ui_controls.get("add_field_section")
+            insert_at = None
+            if detail_form_column is not None and add_field_section is not None:
+                insert_at = next(
+                    (i for i, c in enumerate(detail_form_column.controls) if c is add_field_section), None
+                )
+            if insert_at is not None:
+                field_control = self._build_template_field_control(
+                    new_field_name, "", self.app_state.get("field_roles", {})
+                )
+                detail_form_column.controls.insert(insert_at, field_control)
+                self._update_control(detail_form_column)
+            else:
+                # 追加セクションが表示されていない場合はフォームを再構築する
+                # (連続した追加は最後のクリック後の1回にまとめる)
+                self._schedule_add_form_rebuild(e.page)
+
+            # 通知(連続した追加はまとめて表示する)
+            self._enqueue_snack(e.page, _format_field(t("notification.field_added"), new_field_name))
 
 
 def create_form_manager(app_state: Dict[str, Any], ui_controls: Dict[str, Any], 
                         page: Optional[ft.Page] = None) -> FormManager:
-    """FormManagerのインスタンスを作成する工場関数"""
-    form_manager = FormManager(app_state, ui_controls, page)
-    app_state["form_manager"] = form_manager
-    return form_manager
+    """FormManagerのインスタンスを作成する工場関数(app_state への登録は __init__ で行う)"""
+    return FormManager(app_state, ui_controls, page)
@@ -7,13 +7,39 @@ FleDjSONでの検索機能を提供する
 """
 
 import asyncio
+import logging
 import flet as ft
-from typing import Dict, List, Any, Optional, Callable, Tuple, Set
+from typing import Dict, List, Any, Optional, Callable, Tuple, Set, Iterable, Union
 import re
-from collections import defaultdict
+import sys
+from bisect import insort
+from collections import defaultdict, deque
+from itertools import chain
 from .event_aware_manager import EventAwareManager
 from event_hub import EventType
 from translation import t
+from debug_control import get_debug_control
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# デバッグモード時のみ出力する(本番ではインデックス構築・検索中の大量出力を抑える)
+_debug_print = print if get_debug_control().is_enabled else (lambda *args, **kwargs: None)
+
+# 検索テキストとして登録するプリミティブ値の型
+_LEAF_TYPES = frozenset((str, int, float, bool))
+
+# 検索フィールド入力後、検索を実行するまでの待ち時間(秒)
+_SEARCH_DEBOUNCE_SEC = 0.2
+
+# 検索結果をキャッシュする検索語の数(入力の打ち直しや消去時に再検索しないため)
+_SEARCH_CACHE_SIZE = 64
+
+# 検索テキストを語(英数字・かな漢字などの連続、'_' は区切りとして扱う)に分割する正規表現
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# sys.intern する検索テキストの最大長(短い値はタグなどノード間で繰り返し現れることが多い)
+_INTERN_MAX_LEN = 32
 
 
 class SearchManager(EventAwareManager):
@@ -52,11 +78,37 @@ class SearchManager(EventAwareManager):
         )
         
         # 検索状態の初期化
-        self.search_term = ""
+        self.search_term: str = ""
         self.search_results = []
+        self._result_id_set: Set[str] = set()  # search_results のIDの集合(ツリーのスタイル更新用)
         self.current_search_index = -1
         self.search_index = []
         self.debounce_task = None
+
+        # 転置インデックス(語 → search_index の行番号のリスト)
+        # search_index が変わった後の最初の検索時に構築する(_get_token_postings 参照)
+        self._token_postings: Optional[Dict[str, List[int]]] = None
+        self._postings_source: Optional[List[Dict[str, Any]]] = None
+        self._postings_size = 0
+
+        # search_index の検索テキストだけを行番号順に並べた列(検索時の走査用、_get_row_texts 参照)
+        self._row_texts: List[str] = []
+        self._row_texts_source: Optional[List[Dict[str, Any]]] = None
+        # 検索テキストの列を UTF-8 にしたもの(ASCII の検索語用、_get_row_bytes 参照)
+        self._row_bytes: List[bytes] = []
+        self._row_bytes_source: Optional[List[str]] = None
+
+        # ノードID → search_index の行番号のリスト(update_search_index で行を差し替えるために使用)
+        self._rows_by_id: Dict[str, List[int]] = {}
+
+        # search_index を変更するたびに増やす版数と、(検索語, 版数) → 検索結果 のキャッシュ(古い順)
+        self._index_version = 0
+        self._search_cache: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+
+        # 直前の検索語と、その語を含む search_index の行番号
+        # 検索語を打ち足した場合は、この行だけを調べれば済む
+        self._last_match_term = ""
+        self._last_match_rows: List[int] = []
         
         # UI要素の参照
         self.search_field = None
@@ -138,33 +190,69 @@ class SearchManager(EventAwareManager):
     def build_search_index(self) -> None:
         """全ノードの検索インデックスを構築"""
         self.search_index = []
+        self._token_postings = None
+        self._rows_by_id = {}
+        self._mark_index_changed()
 
         # JSONデータが読み込まれていない場合は何もしない
         if not self.app_state.get("raw_data"):
             return
 
+        # 検索対象フィールドの特定(ループ内で毎回 app_state を参照しないよう先に取得する)
+        id_key = self.app_state.get("id_key", "id")
+        label_key = self.app_state.get("label_key", "name")
+        children_key = self.app_state.get("children_key", "children")
+
         # 検索インデックスの構築
-        def index_node(
-            node: Dict[str, Any],
-            path: str,
-            override_node_id: Optional[str] = None,
-        ) -> None:
-            """ノードとその子ノードを検索インデックスに追加
-
-            Args:
-                node: インデックスに追加するノード
-                path: ノードのパス
-                override_node_id: 外部から指定するノードID(data_mapのキーなど)
-            """
-            # 検索対象フィールドの特定
-            id_key = self.app_state.get("id_key", "id")
-            label_key = self.app_state.get("label_key", "name")
-            children_key = self.app_state.get("children_key", "children")
+        # 再帰呼び出しの代わりに作業スタックで全ノードを深さ優先(先行順)に処理する
+        # スタックの要素: (ノード, パス, 外部から指定するノードID(data_mapのキーなど))
+        roots: List[Tuple[Any, str, Optional[str]]] = []
+
+        # data_mapが利用可能な場合はそちらを優先使用
+        data_map = self.app_state.get("data_map")
+        if data_map:
+            # 辞書のコピーを作成して反復中の変更を防ぐ
+            for map_node_id, node_data in list(data_map.items()):
+                if isinstance(node_data, dict):
+                    # data_mapのキーをノードIDとして渡す
+                    roots.append((node_data, f"root:{map_node_id}", map_node_id))
+                else:
+                    _debug_print(f"[WARNING] Skipped non-dict node: {map_node_id}")
+        else:
+            # fallback: raw_dataから処理
+            for i, node in enumerate(self.app_state["raw_data"]):
+                if isinstance(node, dict):  # 辞書型のノードのみ処理
+                    # ノードのIDを取得
+                    node_id = None
+                    if id_key in node:
+                        node_id = str(node[id_key])
+
+                    # パスを構築
+                    path = f"root:{i}"
+                    if node_id:
+                        path = f"root:{node_id}"
+
+                    roots.append((node, path, None))
+                else:
+                    _debug_print(f"[WARNING] Warning: スキップしたルートノード (辞書型ではない): {node}")
+
+        # ノードオブジェクト(id)ごとのフィールド走査結果
+        # data_map のノードは親の子リストからも辿られるため、同じノードの再走査を省く
+        field_cache: Dict[int, Tuple[Dict[str, str], Tuple, str]] = {}
+
+        # ノードを登録するデータマップ
+        if data_map is None:
+            data_map = self.app_state["data_map"] = {}
+
+        # 逆順に積み、元の順序で取り出す
+        stack = roots[::-1]
+        while stack:
+            node, path, override_node_id = stack.pop()
 
             # ノードが辞書型でない場合はスキップ
             if not isinstance(node, dict):
-                print(f"[WARNING] Warning: スキップしたノード (辞書型ではない): {node}")
-                return
+                _debug_print(f"[WARNING] Warning: スキップしたノード (辞書型ではない): {node}")
+                continue
 
             # ノードIDを取得(override_node_idが指定されていればそれを優先)
             if override_node_id is not None:
@@ -175,209 +263,217 @@ class SearchManager(EventAwareManager):
             # ノードIDが空の場合はパスから生成
             if not node_id:
                 node_id = path
+            node_id = sys.intern(node_id)
+
+            # インデックスに追加
+            self._rows_by_id.setdefault(node_id, []).append(len(self.search_index))
+            self.search_index.append(self._build_index_row(node, path, node_id, label_key, children_key, field_cache))
 
-            node_text = str(node.get(label_key, ""))
-
-            # 検索対象に追加するフィールド(キーと値の両方)
-            extra_fields = []
-
-            # フィールドパスと検索テキストのマッピング(マッチしたフィールド特定用)
-            field_text_map = {}
-
-            # 重要: タグや配列フィールドの特別処理を追加
-            if "tags" in node and isinstance(node["tags"], list):
-                # タグ配列の各要素を個別にインデックスに追加
-                tags_str = " ".join([str(tag) for tag in node["tags"] if str(tag).strip()])
-                if tags_str:
-                    extra_fields.append(tags_str)
-                    field_text_map["tags"] = tags_str.lower()
-
-                # 各タグを個別に追加
-                for i, tag in enumerate(node["tags"]):
-                    tag_str = str(tag)
-                    if tag_str.strip():
-                        extra_fields.append(tag_str)
-                        field_text_map[f"tags[{i}]"] = tag_str.lower()
-                        print(f"  - タグ {tag_str} を検索テキストに追加")
-
-            # 再帰的にノードのすべてのフィールドを検索対象に追加
-            def extract_searchable_text(obj, prefix=""):
-                """オブジェクトから検索可能なテキストを再帰的に抽出"""
-                if isinstance(obj, dict):
-                    # 辞書全体を文字列として追加(JSON構造全体で検索できるように)
-                    dict_str = str(obj)
-                    if dict_str and dict_str.strip():
-                        extra_fields.append(dict_str)
-                        if prefix:
-                            field_text_map[prefix] = dict_str.lower()
-
-                    for k, v in obj.items():
-                        # キー名も検索対象に追加
-                        if isinstance(k, str):
-                            extra_fields.append(k)
-                            current_path = f"{prefix}.{k}" if prefix else k
-                            # キー名自体もマッピングに追加
-                            if current_path not in field_text_map:
-                                field_text_map[current_path] = k.lower()
-                        # 値を再帰的に処理
-                        extract_searchable_text(v, f"{prefix}.{k}" if prefix else k)
-                elif isinstance(obj, list):
-                    # リスト全体を文字列として追加(重要)
-                    list_str = str(obj)
-                    if list_str and list_str.strip():
-                        extra_fields.append(list_str)
-                        if prefix:
-                            field_text_map[prefix] = list_str.lower()
-
-                    # リストの各要素も個別に追加
-                    for i, item in enumerate(obj):
-                        # 各要素を文字列化して直接追加(プリミティブ値)
-                        item_str = str(item)
-                        if item_str and item_str.strip():
-                            extra_fields.append(item_str)
-                            item_path = f"{prefix}[{i}]"
-                            field_text_map[item_path] = item_str.lower()
-                        # 複雑な型は再帰的に処理
-                        if isinstance(item, (dict, list)):
-                            extract_searchable_text(item, f"{prefix}[{i}]")
-                elif isinstance(obj, (str, int, float, bool)):
-                    # プリミティブ値は文字列に変換して追加
-                    obj_str = str(obj)
-                    if obj_str and obj_str.strip():  # 空でない場合のみ追加
-                        extra_fields.append(obj_str)
-                        if prefix:
-                            # 既存のマッピングがある場合は追加
-                            if prefix in field_text_map:
-                                field_text_map[prefix] = f"{field_text_map[prefix]} {obj_str.lower()}"
-                            else:
-                                field_text_map[prefix] = obj_str.lower()
-
-            # ノード内のすべてのフィールドを抽出
-            for key, value in node.items():
-                if key not in [children_key]:  # children_field は別途処理するので除外
-                    # 重要: リスト型の場合は特別処理を追加
-                    if isinstance(value, list):
-                        print(f"  リストフィールド {key} を処理中")
-                        # リスト全体を文字列として追加
-                        extra_fields.append(str(value))
-                        field_text_map[key] = str(value).lower()
-
-                        # リストの各要素も個別に追加
-                        for i, item in enumerate(value):
-                            item_str = str(item)
-                            if item_str and item_str.strip():
-                                extra_fields.append(item_str)
-                                field_text_map[f"{key}[{i}]"] = item_str.lower()
-                                print(f"    - 要素 {item_str} を検索テキストに追加")
-
-                    extract_searchable_text(value, key)
-
-                    # キー名自体も検索対象に追加
-                    extra_fields.append(key)
-
-            # 重複を排除してリストを効率化
-            unique_extra_fields = list(set(extra_fields))
-
-            # 空文字を除外
-            unique_extra_fields = [field for field in unique_extra_fields if field and field.strip()]
-
-            # デバッグ出力
-
-            # 検索対象の文字列をまとめる
-            search_text = f"{node_text} {node_id} {' '.join(unique_extra_fields)}"
-
-            # インデックスに追加(field_text_mapも含める)
-            self.search_index.append({
-                "text": search_text.lower(),
-                "path": path,
-                "node": node,
-                "id": node_id,
-                "field_text_map": field_text_map  # フィールドパスと検索テキストのマッピング
-            })
-            
             # データマップに登録する
-            if "data_map" not in self.app_state:
-                self.app_state["data_map"] = {}
-            self.app_state["data_map"][node_id] = node
+            data_map[node_id] = node
             
-            # 子ノードも処理
+            # 子ノードも処理(逆順に積み、元の順序で取り出す)
             if children_key in node and isinstance(node[children_key], list):
-                for i, child in enumerate(node[children_key]):
+                children = node[children_key]
+                for i in range(len(children) - 1, -1, -1):
+                    child = children[i]
                     # 子ノードがNoneまたはプリミティブ値の場合はスキップ
                     if child is None or not isinstance(child, dict):
                         continue
-                    
+
                     # 子ノードのIDを取得
                     child_id = None
-                    if isinstance(child, dict) and id_key in child:
+                    if id_key in child:
                         child_id = str(child[id_key])
-                    
+
                     # パスを構築
                     child_path = f"{path}:{i}"
                     if child_id:
                         child_path = f"{path}:{child_id}"
-                    
-                    # 子ノードを処理
-                    index_node(child, child_path)
-        
-        # data_mapが利用可能な場合はそちらを優先使用
-        data_map = self.app_state.get("data_map", {})
-        if data_map:
-            # 辞書のコピーを作成して反復中の変更を防ぐ
-            data_map_copy = dict(data_map)
-            for map_node_id, node_data in data_map_copy.items():
-                if isinstance(node_data, dict):
-                    path = f"root:{map_node_id}"
-                    # data_mapのキーをノードIDとして渡す
-                    index_node(node_data, path, override_node_id=map_node_id)
-                    print(f"[OK] Indexed node: {map_node_id}")
-                else:
-                    print(f"[WARNING] Skipped non-dict node: {map_node_id}")
-        else:
-            # fallback: raw_dataから処理
-            for i, node in enumerate(self.app_state["raw_data"]):
-                if isinstance(node, dict):  # 辞書型のノードのみ処理
-                    # ノードのIDを取得
-                    node_id = None
-                    id_key = self.app_state.get("id_key", "id")
-                    if id_key in node:
-                        node_id = str(node[id_key])
-                    
-                    # パスを構築
-                    path = f"root:{i}"
-                    if node_id:
-                        path = f"root:{node_id}"
-                    
-                    index_node(node, path)
-                else:
-                    print(f"[WARNING] Warning: スキップしたルートノード (辞書型ではない): {node}")
-        
-        print(f"[DATA] 検索インデックスを構築しました({len(self.search_index)}ノード)")
+
+                    stack.append((child, child_path, None))
+
+        field_cache.clear()
+        _debug_print(f"[DATA] 検索インデックスを構築しました({len(self.search_index)}ノード)")
     
+    def _build_index_row(self, node: Dict[str, Any], path: str, node_id: str,
+                         label_key: str, children_key: str,
+                         field_cache: Optional[Dict[int, Tuple[Dict[str, str], Tuple, str]]] = None) -> Dict[str, Any]:
+        """
+        1ノード分の検索インデックス項目を作成する(子ノードは含まない)
+
+        Args:
+            node: インデックスに追加するノード
+            path: ノードのパス
+            node_id: ノードID
+            label_key: ラベルのキー
+            children_key: 子ノードのキー(検索テキストから除外する)
+            field_cache: id(ノード) → (field_text_map, field_entries, ノード部分の検索テキスト)。
+                指定時は同じノードオブジェクトのフィールド走査結果を再利用する
+
+        Returns:
+            Dict[str, Any]: 検索インデックスの項目
+        """
+        cached = field_cache.get(id(node)) if field_cache is not None else None
+        if cached is None:
+            cached = self._collect_node_fields(node, label_key, children_key)
+            if field_cache is not None:
+                field_cache[id(node)] = cached
+        field_text_map, field_entries, node_search_text = cached
+
+        return {
+            # ノードIDのみパスごとに異なるため、ここで結合する
+            "text": f"{node_search_text} {node_id.casefold()}",
+            # ノード本体は保持しない(必要な場合は data_map から ID で参照する)
+            "path": path,
+            "id": node_id,
+            "field_text_map": field_text_map,  # フィールドパスと検索テキストのマッピング
+            "field_entries": field_entries  # マッチ判定用(_find_matched_field_paths 参照)
+        }
+
+    def _collect_node_fields(self, node: Dict[str, Any], label_key: str,
+                             children_key: str) -> Tuple[Dict[str, str], Tuple, str]:
+        """
+        ノードのフィールドを走査し、検索テキストを収集する(ノードIDに依存しない部分)
+
+        Args:
+            node: 対象ノード
+            label_key: ラベルのキー
+            children_key: 子ノードのキー(検索テキストから除外する)
+
+        Returns:
+            Tuple: (field_text_map, field_entries, ラベル・ルートのキー名・フィールド値を連結した検索テキスト)
+        """
+        # フィールドパスと検索テキストのマッピング(マッチしたフィールド特定用、値は casefold 済み)
+        field_text_map = {}
+
+        # ノード内の値を明示的なスタックで走査し、プリミティブ値(葉)のみを検索テキストとして収集する
+        # (辞書・リスト全体の文字列表現は階層ごとに同じ部分木を何度も文字列化するため使用しない)
+        # スタックの要素: (値, フィールドパス, 親が辞書の場合のキー名)。子は逆順に積み、元の順序で取り出す
+        # (フィールドパスは同じ構造のノード間で繰り返し現れるため、sys.intern で1つの文字列を共有する)
+        field_stack = [(value, key, None) for key, value in reversed(node.items()) if key != children_key]
+        pop = field_stack.pop
+        push = field_stack.append
+        intern = sys.intern
+        while field_stack:
+            value, field_path, key_name = pop()
+            # 型は type() で直接判定し、サブクラスの場合のみ isinstance で基本型に対応付ける
+            value_type = type(value)
+            if value_type is not dict and value_type is not list and value_type not in _LEAF_TYPES:
+                value_type = (dict if isinstance(value, dict) else list if isinstance(value, list)
+                              else str if isinstance(value, (str, int, float, bool)) else None)
+            if value_type is dict:
+                if key_name is not None:
+                    # キー名も検索対象に追加
+                    field_text_map.setdefault(field_path, key_name.casefold())
+                for k, v in reversed(value.items()):
+                    push((v, intern(f"{field_path}.{k}"), str(k)))
+            elif value_type is list:
+                if key_name is not None:
+                    field_text_map.setdefault(field_path, key_name.casefold())
+                for i in range(len(value) - 1, -1, -1):
+                    push((value[i], intern(f"{field_path}[{i}]"), None))
+            elif value_type is not None:
+                value_str = str(value)
+                if value_str.strip():  # 空でない場合のみ追加
+                    value_str = value_str.casefold()
+                    # ネストした辞書のフィールドは「キー名 値」で登録する
+                    if key_name is not None:
+                        value_str = f"{key_name.casefold()} {value_str}"
+                    field_text_map[field_path] = intern(value_str) if len(value_str) < _INTERN_MAX_LEN else value_str
+                elif key_name is not None:
+                    field_text_map[field_path] = key_name.casefold()
+
+        search_text = self._node_search_text(node, field_text_map, label_key, children_key)
+        return field_text_map, self._build_field_entries(field_text_map), search_text
+
+    @staticmethod
+    def _node_search_text(node: Dict[str, Any], field_text_map: Dict[str, str],
+                          label_key: str, children_key: str) -> str:
+        """
+        ノードのラベル・ルートのキー名・フィールドの検索テキストを連結する(ノードIDを除く)
+
+        Args:
+            node: 対象ノード
+            field_text_map: フィールドパス → 検索テキスト(casefold 済み)
+            label_key: ラベルのキー
+            children_key: 子ノードのキー
+
+        Returns:
+            str: casefold した検索テキスト
+        """
+        node_text = str(node.get(label_key, "")).casefold()
+        # 検索対象の文字列を1回の join で連結する(ルートのキー名も検索対象に含める)
+        # (field_text_map の値は casefold 済みのため、ラベルとキー名だけを casefold する)
+        # 同じ値(共通のタグなど)は dict.fromkeys で順序を保ったまま重複を除いて連結する
+        return " ".join(chain(
+            (node_text,),
+            (key.casefold() for key in node if key != children_key and isinstance(key, str)),
+            dict.fromkeys(field_text_map.values()),
+        ))
+
     def on_search_change(self, e: ft.ControlEvent) -> None:
         """検索フィールド変更時のハンドラ(デバウンス処理)"""
         # 検索語を保存
         self.search_term = e.control.value
-        
+
+        # 入力が続いている間の検索は取り消す
+        self._cancel_debounced_search()
+
         # 検索が空の場合は結果をクリア
         if not self.search_term:
             self.clear_search_results()
             return
-        
-        # 検索実行
-        self.perform_search()
-    
-    async def _debounced_search(self) -> None:
-        """デバウンス処理(検索実行を遅延)"""
-        # 200ms待機してから検索実行
-        await asyncio.sleep(0.2)
-        
-        # UI更新はメインスレッドで行う必要がある
-        if self.page:
-            self.page.update_async(lambda: self.perform_search())
-        else:
+
+        # ページがない場合は即時に検索し、ある場合は入力が止まってから検索する
+        if not self.page:
             self.perform_search()
+            return
+        self.debounce_task = self.page.run_task(self._debounced_search, self.search_term)
+
+    async def _debounced_search(self, search_term: str) -> None:
+        """
+        デバウンス処理(検索実行を遅延)
+
+        Args:
+            search_term: 予約時の検索語。待機中に検索語が変わった場合は検索しない
+        """
+        await asyncio.sleep(_SEARCH_DEBOUNCE_SEC)
+        if search_term != self.search_term:
+            return
+        self.debounce_task = None
+        self.perform_search()
+
+    def _cancel_debounced_search(self) -> None:
+        """予約済みの検索を取り消す"""
+        if self.debounce_task is not None:
+            self.debounce_task.cancel()
+            self.debounce_task = None
     
+    @staticmethod
+    def _build_field_entries(field_text_map: Dict[str, str]) -> Tuple[Tuple[str, str, str, Tuple[str, ...]], ...]:
+        """
+        フィールドごとの検索テキストを、マッチ判定用に前処理したタプルに変換する
+
+        より具体的なパスが先に来るように並べ、正規化したパス(tags[0].name → tags.0.name)と
+        その親プレフィックスを事前に計算しておく(ノード間で共通のため sys.intern する)
+
+        Args:
+            field_text_map: フィールドパス → 検索テキスト(casefold 済み)
+
+        Returns:
+            (フィールドパス, 検索テキスト, 正規化したパス, 親プレフィックスのタプル) のタプル
+        """
+        entries = []
+        for field_path, field_text in field_text_map.items():
+            parts = field_path.replace('[', '.').replace(']', '').split('.')
+            parents = tuple(sys.intern('.'.join(parts[:i])) for i in range(1, len(parts)))
+            entries.append((field_path, field_text, sys.intern('.'.join(parts)), parents))
+        # マッチしたパスを優先度でソート(より具体的なパスを先に)
+        # 例: "profile.email" は "profile" より優先
+        entries.sort(key=lambda entry: (-entry[0].count('.'), -entry[0].count('['), entry[0]))
+        return tuple(entries)
+
     def _find_matched_field_paths(self, item: Dict[str, Any], search_term_lower: str) -> List[str]:
         """
         検索インデックス項目からマッチしたフィールドパスを特定する
@@ -386,124 +482,357 @@ class SearchManager(EventAwareManager):
 
         Args:
             item: 検索インデックスの項目
-            search_term_lower: 小文字に変換された検索語
+            search_term_lower: casefold した検索語
 
         Returns:
             マッチしたフィールドパスのリスト(最も具体的なパスのみ)
         """
-        matched_paths = []
-        field_text_map = item.get("field_text_map", {})
+        entries = item.get("field_entries")
+        if entries is None:
+            entries = self._build_field_entries(item.get("field_text_map", {}))
 
-        for field_path, field_text in field_text_map.items():
+        # エントリは子パスが親パスより先に来る順に並んでいるため、一度の走査で親パスを除外できる
+        # 例: ["organization.name", "organization"] → ["organization.name"]
+        matched_paths = []
+        parent_prefixes = set()
+        for field_path, field_text, normalized, parents in entries:
             if search_term_lower in field_text:
-                matched_paths.append(field_path)
+                if normalized not in parent_prefixes:
+                    matched_paths.append(field_path)
+                parent_prefixes.update(parents)
 
-        if not matched_paths:
-            return []
+        return matched_paths
 
-        # マッチしたパスを優先度でソート(より具体的なパスを先に)
-        # 例: "profile.email" は "profile" より優先
-        matched_paths.sort(key=lambda x: (-x.count('.'), -x.count('['), x))
+    def _has_direct_field_match(self, item: Dict[str, Any], search_term_lower: str) -> bool:
+        """
+        マッチしたフィールドパス(最も具体的なパスのみ)に直接フィールドが含まれるかどうかを判定する
 
-        # 親パスを除外(子パスが存在する場合)
-        # 例: ["organization.name", "organization"] → ["organization.name"]
-        # セットベースの最適化: O(n)でプレフィックスセットを構築
+        _find_matched_field_paths と同じ順序で走査し、直接フィールドが見つかった時点で打ち切る。
+        ネストレベル(ドット数 + ブラケット数)が1以下のパスを直接フィールドとみなす
+        例: name(0), tags[0](1), organization.name(1) → 直接フィールド
+        例: products[0].name(2), products[0].clients[0].industry(4) → 深いパス
+
+        Args:
+            item: 検索インデックスの項目
+            search_term_lower: casefold した検索語
+
+        Returns:
+            bool: 直接フィールドでマッチしている場合 True
+        """
+        entries = item.get("field_entries")
+        if entries is None:
+            entries = self._build_field_entries(item.get("field_text_map", {}))
+
+        # 子パスは親パスより先に走査されるため、直接フィールドに到達した時点で親として除外されるかが確定している
         parent_prefixes = set()
-        for path in matched_paths:
-            # このパスの全ての親プレフィックスを追加
-            # パスを正規化: tags[0].name → tags.0.name
-            normalized = path.replace('[', '.').replace(']', '')
-            parts = normalized.split('.')
-            for i in range(1, len(parts)):
-                # 正規化されたプレフィックスを追加
-                parent_prefixes.add('.'.join(parts[:i]))
-
-        # 親プレフィックスに含まれないパスのみを残す(正規化して比較)
-        def normalize_path(p):
-            return p.replace('[', '.').replace(']', '')
-
-        filtered_paths = [
-            path for path in matched_paths
-            if normalize_path(path) not in parent_prefixes
-        ]
-
-        return filtered_paths
+        for _field_path, field_text, normalized, parents in entries:
+            if search_term_lower in field_text:
+                if normalized not in parent_prefixes and len(parents) <= 1:
+                    return True
+                parent_prefixes.update(parents)
+        return False
 
-    def perform_search(self) -> None:
-        """検索を実行し結果を更新"""
-        # 検索が空の場合は結果をクリア
-        if not self.search_term:
-            self.clear_search_results()
-            return
+    def _get_matched_paths(self, result: Dict[str, Any]) -> List[str]:
+        """
+        検索結果のマッチしたフィールドパスを取得する
 
-        # インデックスが構築されていない場合は構築
-        if not self.search_index:
-            self.build_search_index()
+        パスは結果を選択したときに初めて計算し、結果の項目に保持する
 
-        # 検索実行の開始をログに記録
+        Args:
+            result: 検索結果の項目
 
-        # 検索語を小文字に変換
-        search_term_lower = self.search_term.lower()
+        Returns:
+            List[str]: マッチしたフィールドパスのリスト(複数語の場合は語ごとのパスを重複なく連結)
+        """
+        matched_paths = result.get("matched_paths")
+        if matched_paths is None:
+            terms = result.get("search_terms", ())
+            if len(terms) == 1:
+                matched_paths = self._find_matched_field_paths(result, terms[0])
+            else:
+                matched_paths = list(dict.fromkeys(
+                    path for term in terms for path in self._find_matched_field_paths(result, term)
+                ))
+            result["matched_paths"] = matched_paths
+        return matched_paths
+
+    def _mark_index_changed(self) -> None:
+        """search_index の変更を記録し、変更前の内容に対する検索結果のキャッシュを破棄する"""
+        self._index_version += 1
+        self._search_cache.clear()
+        self._last_match_term = ""
+        self._last_match_rows = []
+
+    def _postings_valid(self) -> bool:
+        """転置インデックスが現在の search_index に対応しているかどうか"""
+        return (self._token_postings is not None
+                and self._postings_source is self.search_index
+                and self._postings_size == len(self.search_index))
+
+    def _replace_index_rows(self, nodes: List[Tuple[str, Dict[str, Any]]], label_key: str,
+                            children_key: str) -> List[Tuple[int, str, str]]:
+        """
+        指定ノードの検索インデックス項目を作り直す
 
-        # 検索実行(一時的な結果リスト)
-        temp_results = []
-        for item in self.search_index:
-            if search_term_lower in item["text"]:
-                # マッチしたフィールドパスを特定
-                matched_paths = self._find_matched_field_paths(item, search_term_lower)
-
-                # 結果に追加(matched_pathsも含める)
-                result_item = {
-                    "text": item["text"],
-                    "path": item["path"],
-                    "node": item["node"],
-                    "id": item["id"],
-                    "matched_paths": matched_paths  # マッチしたフィールドパスのリスト
-                }
-                temp_results.append(result_item)
-                print(f"  一致: ID={item['id']}, マッチフィールド={matched_paths[:3]}...")
-
-        # 親ノードを除外(子ノードがすでに結果に含まれる場合)
-        result_ids = [r["id"] for r in temp_results]
-
-        # セットベースの最適化: 親IDを事前計算 O(n)
-        parent_ids = set()
-        for node_id in result_ids:
-            # このIDの全ての親プレフィックスを追加
-            parts = node_id.replace('[', '.').split('.')
-            for i in range(1, len(parts)):
-                prefix = '.'.join(parts[:i])
-                parent_ids.add(prefix)
+        既存の行はその場で差し替え(他の行の行番号は変えない)、行がない場合は末尾に追加する。
+        転置インデックスが構築済みであれば、変化した語の分だけ更新する
 
-        self.search_results = []
-        for result in temp_results:
-            node_id = result["id"]
-            matched_paths = result.get("matched_paths", [])
+        Args:
+            nodes: (ノードID, ノードのデータ) のリスト
+            label_key: ラベルのキー
+            children_key: 子ノードのキー
 
-            # マッチしたパスがない場合は除外
-            if not matched_paths:
-                print(f"  除外: {node_id} はマッチパスがないため")
-                continue
+        Returns:
+            List[Tuple[int, str, str]]: (行番号, 更新前のテキスト, 更新後のテキスト) のリスト
+        """
+        # 転置インデックス・検索テキストの列の有効性はノードごとではなく一度だけ判定する
+        postings = self._token_postings if self._postings_valid() else None
+        row_texts = self._row_texts if self._row_texts_valid() else None
+        self._mark_index_changed()
+
+        search_index = self.search_index
+        append = search_index.append
+        rows_by_id = self._rows_by_id
+        build_row = self._build_index_row
+        changes = []  # (行番号, 更新前のテキスト, 更新後のテキスト)
+        for node_id, node in nodes:
+            rows = rows_by_id.get(node_id)
+            if rows:
+                for row in rows:
+                    old_item = search_index[row]
+                    new_item = build_row(node, old_item["path"], node_id, label_key, children_key)
+                    search_index[row] = new_item
+                    changes.append((row, old_item["text"], new_item["text"]))
+            else:
+                row = len(search_index)
+                new_item = build_row(node, f"root:{node_id}", node_id, label_key, children_key)
+                append(new_item)
+                rows_by_id[node_id] = [row]
+                changes.append((row, "", new_item["text"]))
+
+        self._apply_row_text_changes(changes, postings, row_texts)
+        return changes
+
+    def _apply_row_text_changes(self, changes: List[Tuple[int, str, str]],
+                                postings: Optional[Dict[str, List[int]]],
+                                row_texts: Optional[List[str]]) -> None:
+        """
+        行のテキストの変更を検索テキストの列と転置インデックスに反映する
 
-            # マッチしたパスが全て深いパス(ネストされた子フィールド)のみの場合は除外
-            # ネストレベル = ドット数 + ブラケット数（2以上は深いパスとみなす）
-            # 例: name(0), tags[0](1), organization.name(1) → 直接フィールド
-            # 例: products[0].name(2), products[0].clients[0].industry(4) → 深いパス
-            has_direct_field = any(
-                (path.count('.') + path.count('[')) <= 1
-                for path in matched_paths
+        Args:
+            changes: (行番号, 更新前のテキスト, 更新後のテキスト) のリスト。新しい行の更新前テキストは ""
+            postings: 変更前に有効だった転置インデックス(無効だった場合は None)
+            row_texts: 変更前に有効だった検索テキストの列(無効だった場合は None)
+        """
+        if row_texts is not None:
+            row_bytes = self._row_bytes if self._row_bytes_valid() else None
+            for row, _, new_text in changes:
+                if row < len(row_texts):
+                    row_texts[row] = new_text
+                else:
+                    row_texts.append(new_text)
+                if row_bytes is not None:
+                    if row < len(row_bytes):
+                        row_bytes[row] = new_text.encode("utf-8")
+                    else:
+                        row_bytes.append(new_text.encode("utf-8"))
+            if row_bytes is None:
+                # 検索テキストの列はその場で更新したため、UTF-8 の列は次回の使用時に作り直す
+                self._row_bytes_source = None
+
+        if postings is None:
+            # 未構築(または古い)場合は次回の検索時に作り直す
+            self._token_postings = None
+            return
+        for row, old_text, new_text in changes:
+            old_tokens = set(_TOKEN_RE.findall(old_text))
+            new_tokens = set(_TOKEN_RE.findall(new_text))
+            for token in old_tokens - new_tokens:
+                token_rows = postings.get(token)
+                if token_rows and row in token_rows:
+                    token_rows.remove(row)
+                    if not token_rows:
+                        del postings[token]
+            for token in new_tokens - old_tokens:
+                insort(postings.setdefault(token, []), row)
+        self._postings_size = len(self.search_index)
+
+    def mark_field_dirty(self, node_id: str, field_path: str, new_value: Any) -> bool:
+        """
+        ノードの1フィールドの値の変更を検索インデックスに反映する(ノード全体は走査しない)
+
+        既存の葉フィールドの値がプリミティブ値に変わった場合のみ、そのフィールドの検索テキストを差し替える。
+        ラベルの変更、フィールドの追加・削除、値が空になる変更など、行の構成が変わる場合は何もせず False を返す
+        (呼び出し元で update_search_index を使用する)
+
+        Args:
+            node_id: ノードID
+            field_path: 変更したフィールドのパス(例: "profile.email", "tags[0]")
+            new_value: 変更後の値
+
+        Returns:
+            bool: インデックスに反映した場合 True
+        """
+        label_key = self.app_state.get("label_key", "name")
+        children_key = self.app_state.get("children_key", "children")
+        rows = self._rows_by_id.get(node_id)
+        if not rows or field_path == label_key or not isinstance(new_value, (str, int, float, bool)):
+            return False
+        node = (self.app_state.get("data_map") or {}).get(node_id)
+        if not isinstance(node, dict):
+            return False
+
+        # _collect_node_fields と同じ形式の検索テキストを作る
+        # (辞書内のフィールドは「キー名 値」、トップレベルとリスト要素は値のみ)
+        key_name = field_path.rsplit(".", 1)[1] if "." in field_path and not field_path.endswith("]") else None
+        value_str = str(new_value)
+        if value_str.strip():
+            value_str = value_str.casefold()
+            field_text = f"{key_name.casefold()} {value_str}" if key_name is not None else value_str
+        elif key_name is not None:
+            field_text = key_name.casefold()
+        else:
+            return False
+
+        # すべての行で、フィールドが登録済みの葉(配下にパスを持たない)であることを確認する
+        search_index = self.search_index
+        normalized = field_path.replace('[', '.').replace(']', '')
+        for row in rows:
+            item = search_index[row]
+            if field_path not in item.get("field_text_map", {}) or item.get("field_entries") is None:
+                return False
+            if any(normalized in parents for _, _, _, parents in item["field_entries"]):
+                return False
+
+        postings = self._token_postings if self._postings_valid() else None
+        row_texts = self._row_texts if self._row_texts_valid() else None
+        self._mark_index_changed()
+        changes = []
+        for row in rows:
+            item = search_index[row]
+            # field_text_map は同じノードの行で共有されている場合があるため、コピーして差し替える
+            field_text_map = dict(item["field_text_map"])
+            field_text_map[field_path] = field_text
+            field_entries = tuple(
+                (path, field_text, entry_normalized, parents) if path == field_path
+                else (path, text, entry_normalized, parents)
+                for path, text, entry_normalized, parents in item["field_entries"]
             )
+            node_search_text = self._node_search_text(node, field_text_map, label_key, children_key)
+            new_item = dict(item, field_text_map=field_text_map, field_entries=field_entries,
+                            text=f"{node_search_text} {node_id.casefold()}")
+            search_index[row] = new_item
+            changes.append((row, item["text"], new_item["text"]))
 
-            if not has_direct_field:
-                print(f"  除外: {node_id} は直接フィールドを持たない(深いパスのみ: {matched_paths[:2]}...)")
-                continue
+        self._apply_row_text_changes(changes, postings, row_texts)
+        return True
 
-            # このノードIDが親IDセットに含まれるかチェック O(1)
-            if node_id in parent_ids:
-                print(f"  除外: {node_id} は子ノードの親のため")
-                continue
+    def _row_texts_valid(self) -> bool:
+        """検索テキストの列が現在の search_index に対応しているかどうか"""
+        return self._row_texts_source is self.search_index and len(self._row_texts) == len(self.search_index)
+
+    def _get_row_texts(self) -> List[str]:
+        """
+        search_index の検索テキストを行番号順に並べた列を取得する
+
+        走査時に行ごとの辞書を引かずに済むよう、テキストだけを別のリストに保持する。
+        search_index が再構築されていれば作り直す
+
+        Returns:
+            List[str]: 行番号 → 検索テキスト
+        """
+        if not self._row_texts_valid():
+            self._row_texts = [item["text"] for item in self.search_index]
+            self._row_texts_source = self.search_index
+        return self._row_texts
+
+    def _row_bytes_valid(self) -> bool:
+        """UTF-8 の検索テキストの列が現在の検索テキストの列に対応しているかどうか"""
+        return self._row_bytes_source is self._row_texts and len(self._row_bytes) == len(self._row_texts)
+
+    def _get_row_bytes(self) -> List[bytes]:
+        """
+        検索テキストの列を UTF-8 にエンコードした列を取得する
+
+        ASCII の検索語は UTF-8 のバイト列中でも同じ位置にしか一致しないため、
+        日本語などを含むテキストも1文字1バイト以上の幅に広げずに走査できる
+
+        Returns:
+            List[bytes]: 行番号 → UTF-8 の検索テキスト
+        """
+        row_texts = self._get_row_texts()
+        if not self._row_bytes_valid():
+            self._row_bytes = [text.encode("utf-8") for text in row_texts]
+            self._row_bytes_source = row_texts
+        return self._row_bytes
+
+    def _get_token_postings(self) -> Dict[str, List[int]]:
+        """
+        search_index の転置インデックスを取得する
+
+        search_index が再構築・更新されていれば作り直す
+
+        Returns:
+            Dict[str, List[int]]: 語 → その語を含む行番号のリスト(昇順)
+        """
+        if not self._postings_valid():
+            postings: Dict[str, List[int]] = {}
+            for row, text in enumerate(self._get_row_texts()):
+                for token in set(_TOKEN_RE.findall(text)):
+                    postings.setdefault(token, []).append(row)
+            self._token_postings = postings
+            self._postings_source = self.search_index
+            self._postings_size = len(self.search_index)
+        return self._token_postings
+
+    def _candidate_rows(self, search_term_lower: str) -> List[int]:
+        """
+        検索語を含む可能性のある search_index の行番号を取得する
+
+        検索語が1語(空白や記号、"_" を含まない)の場合、検索テキスト中の出現は必ずいずれかの語の内部にあるため、
+        検索語を含む語の行だけを候補にする。それ以外は全行を候補とする
+
+        Args:
+            search_term_lower: casefold した検索語
+
+        Returns:
+            List[int]: 候補の行番号(昇順)
+        """
+        if not _TOKEN_RE.fullmatch(search_term_lower):
+            return list(range(len(self.search_index)))
 
-            self.search_results.append(result)
+        rows: Set[int] = set()
+        for token, token_rows in self._get_token_postings().items():
+            if search_term_lower in token:
+                rows.update(token_rows)
+        return sorted(rows)
+
+    def perform_search(self) -> None:
+        """検索を実行し結果を更新"""
+        # 検索が空の場合は結果をクリア
+        if not self.search_term:
+            self.clear_search_results()
+            return
+
+        # インデックスが構築されていない場合は構築
+        if not self.search_index:
+            self.build_search_index()
+
+        # 検索語を casefold する(大文字小文字の違いに加え ß/ss なども同一視する)
+        search_term_lower = self.search_term.casefold()
+
+        # 同じ検索語・同じインデックスに対する結果はキャッシュから取得する
+        cache_key = (search_term_lower, self._index_version)
+        cached_results = self._search_cache.pop(cache_key, None)
+        if cached_results is None:
+            cached_results = self._collect_search_results(search_term_lower)
+            if len(self._search_cache) >= _SEARCH_CACHE_SIZE:
+                # 最も長く使われていない検索語を削除
+                del self._search_cache[next(iter(self._search_cache))]
+        # 末尾に入れ直し、最近使った検索語として扱う
+        self._search_cache[cache_key] = cached_results
+        self.search_results = list(cached_results)
+        self._result_id_set = {item["id"] for item in self.search_results}
 
         # 検索結果の処理
         self.current_search_index = -1  # 初期化
@@ -512,25 +841,134 @@ class SearchManager(EventAwareManager):
         self.update_search_results_display()
 
         # 検索結果レポート
-        print(f"[OK] 検索結果: {len(self.search_results)}件")
+        _debug_print(f"[OK] 検索結果: {len(self.search_results)}件")
 
         # 検索結果がある場合は最初の結果を選択
         if self.search_results:
             self.select_search_result(0)
             # select_search_result後も結果が存在するか確認してからアクセス
             if self.search_results and 0 <= self.current_search_index < len(self.search_results):
-                print(
+                _debug_print(
                     f"  選択された結果: index={self.current_search_index}, "
                     f"ID={self.search_results[self.current_search_index]['id']}"
                 )
         else:
-            print(f"[WARNING] 検索語 '{self.search_term}' に一致する結果が見つかりませんでした")
+            _debug_print(f"[WARNING] 検索語 '{self.search_term}' に一致する結果が見つかりませんでした")
             # ハイライト対象をクリア
             self.app_state["highlight_field_paths"] = []
             # 結果が見つからない場合でも、UIを更新する必要がある
             if self.page:
                 self.page.update()
-    
+
+    def _collect_search_results(self, search_term_lower: str) -> List[Dict[str, Any]]:
+        """
+        検索インデックスから検索語に一致する結果を収集する
+
+        検索語が空白で区切られている場合は、すべての語を含む行を一致とする(AND 検索)。
+        直接フィールドでマッチしていない結果(マッチパスがない・深いパスのみ)と、
+        子ノードが結果に含まれる親ノードは除外する
+
+        Args:
+            search_term_lower: casefold した検索語
+
+        Returns:
+            List[Dict[str, Any]]: 検索結果(text, path, id, matched_paths)。
+                matched_paths は選択時に計算するため None(_get_matched_paths 参照)
+        """
+        terms = search_term_lower.split()
+        # 空白で区切った語を1つの空白で連結したもの(空白のみの検索語は区切らずにそのまま検索する)
+        normalized_term = " ".join(terms)
+        if not terms:
+            terms = [search_term_lower]
+
+        # 直前の検索語を含む検索語("hel" → "hell" など)であれば、一致する行は直前の一致行に限られる
+        # (直前の各語は今回のいずれかの語に含まれるため、AND 検索でも同様)
+        # すべての語が1語の場合、転置インデックスの候補は検索語を含む語の行のみのため、そのまま一致行になる
+        rows_matched = False
+        if self._last_match_term and self._last_match_term in normalized_term:
+            rows = self._last_match_rows
+        elif len(terms) == 1:
+            rows_matched = _TOKEN_RE.fullmatch(terms[0]) is not None
+            rows = self._candidate_rows(terms[0])
+        else:
+            # 語ごとの候補を件数の少ない順に積集合をとる
+            rows_matched = all(_TOKEN_RE.fullmatch(term) for term in terms)
+            candidates = sorted((self._candidate_rows(term) for term in terms), key=len)
+            row_set = set(candidates[0])
+            for term_rows in candidates[1:]:
+                row_set.intersection_update(term_rows)
+                if not row_set:
+                    break
+            rows = sorted(row_set)
+
+        if rows_matched:
+            matched_rows = rows
+        else:
+            # 検索テキストの列だけを走査し、一致した行の項目のみを参照する
+            # (検索語が ASCII のみの場合は UTF-8 のバイト列を走査する)
+            if search_term_lower.isascii():
+                haystacks = self._get_row_bytes()
+                needles = [term.encode("ascii") for term in terms]
+            else:
+                haystacks = self._get_row_texts()
+                needles = terms
+            if len(needles) == 1:
+                needle = needles[0]
+                matched_rows = [row for row in rows if needle in haystacks[row]]
+            else:
+                matched_rows = [row for row in rows if all(needle in haystacks[row] for needle in needles)]
+
+        # 検索実行(一時的な結果リスト)
+        temp_results = []
+        search_index = self.search_index
+        for row in matched_rows:
+            item = search_index[row]
+
+            # マッチしたパスがない・深いパス(ネストされた子フィールド)のみの場合は除外
+            # (いずれかの語が直接フィールドでマッチしていれば対象とする)
+            if not any(self._has_direct_field_match(item, term) for term in terms):
+                _debug_print(f"  除外: {item['id']} は直接フィールドでマッチしていない")
+                continue
+
+            # 結果に追加(マッチしたフィールドパスは選択時に計算する)
+            result_item = {
+                "text": item["text"],
+                "path": item["path"],
+                "id": item["id"],
+                "field_entries": item.get("field_entries"),
+                "field_text_map": item.get("field_text_map", {}),
+                "search_terms": tuple(terms),
+                "matched_paths": None  # マッチしたフィールドパスのリスト(_get_matched_paths 参照)
+            }
+            temp_results.append(result_item)
+
+        self._last_match_term = normalized_term
+        self._last_match_rows = matched_rows
+
+        # 親ノードを除外(子ノードが検索語に一致する場合)
+        result_ids = {search_index[row]["id"] for row in matched_rows}
+
+        # 各IDの区切り位置('.' / '[')までのプレフィックスのうち、結果に含まれるものを親IDとする
+        # 例: "items[0].name" → "items", "items[0]" O(n・深さ)
+        parent_ids = set()
+        for node_id in result_ids:
+            for pos, char in enumerate(node_id):
+                if pos and char in '.[' and node_id[:pos] in result_ids:
+                    parent_ids.add(node_id[:pos])
+
+        search_results = []
+        for result in temp_results:
+            node_id = result["id"]
+
+            # このノードIDが親IDセットに含まれるかチェック O(1)
+            if node_id in parent_ids:
+                _debug_print(f"  除外: {node_id} は子ノードの親のため")
+                continue
+
+            search_results.append(result)
+
+        return search_results
+
     def update_search_results_display(self) -> None:
         """検索結果の視覚的表示を更新"""
         # 検索結果表示の更新
@@ -558,7 +996,12 @@ class SearchManager(EventAwareManager):
             self.ui_controls["tree_view"].update()
     
     def _update_tree_nodes_style(self) -> None:
-        """検索結果に基づいてツリーノードのスタイルを更新"""
+        """
+        検索結果に基づいてツリーノードのスタイルを更新
+
+        プロパティの変更のみを行い、画面への反映は呼び出し元の
+        tree_view.update() でまとめて行う
+        """
         # ツリービューがない場合は何もしない
         if not self.ui_controls.get("tree_view"):
             return
@@ -574,11 +1017,10 @@ class SearchManager(EventAwareManager):
                     control.opacity = 1.0
                 if hasattr(control, "bgcolor"):
                     control.bgcolor = None
-                control.update()
             return
         
-        # 検索結果のIDを取得
-        result_ids = [item["id"] for item in self.search_results]
+        # 検索結果のID(perform_search で作成済みの集合)
+        result_ids = self._result_id_set
         
         # 現在選択されている検索結果のID
         selected_result_id = self.search_results[self.current_search_index]["id"] if 0 <= self.current_search_index < len(self.search_results) else None
@@ -613,8 +1055,6 @@ class SearchManager(EventAwareManager):
                 control.bgcolor = None
                 # 左ボーダーをリセット
                 control.border = None
-
-            control.update()
     
     def go_to_next_result(self, e: Optional[ft.ControlEvent] = None) -> None:
         """次の検索結果へ移動"""
@@ -646,10 +1086,10 @@ class SearchManager(EventAwareManager):
         selected_node_id = self.search_results[index]["id"]
 
         # マッチしたフィールドパスを取得してapp_stateに保存
-        matched_paths = self.search_results[index].get("matched_paths", [])
+        matched_paths = self._get_matched_paths(self.search_results[index])
         self.app_state["highlight_field_paths"] = matched_paths
         self.app_state["search_term"] = self.search_term  # 検索語も保存
-        print(f"[HIGHLIGHT] ハイライト対象フィールド: {matched_paths}")
+        _debug_print(f"[HIGHLIGHT] ハイライト対象フィールド: {matched_paths}")
 
         # マネージャー参照を更新
         self._update_manager_references()
@@ -662,9 +1102,9 @@ class SearchManager(EventAwareManager):
             try:
                 self.ui_state_manager.select_node(selected_node_id, bypass_lock=True)
                 selection_success = True
-                print(f"[OK] UIStateManagerでノード {selected_node_id} を選択しました")
+                _debug_print(f"[OK] UIStateManagerでノード {selected_node_id} を選択しました")
             except (AttributeError, RuntimeError, ValueError, KeyError) as e:
-                print(f"[WARNING] UIStateManagerでの選択に失敗: {e}")
+                _debug_print(f"[WARNING] UIStateManagerでの選択に失敗: {e}")
 
         # 方法2: UIManagerを使用
         if not selection_success:
@@ -673,28 +1113,28 @@ class SearchManager(EventAwareManager):
                 try:
                     ui_manager.on_tree_node_select(selected_node_id)
                     selection_success = True
-                    print(f"[OK] UIManagerでノード {selected_node_id} を選択しました")
+                    _debug_print(f"[OK] UIManagerでノード {selected_node_id} を選択しました")
                 except (AttributeError, RuntimeError, ValueError, KeyError) as e:
-                    print(f"[WARNING] UIManagerでの選択に失敗: {e}")
+                    _debug_print(f"[WARNING] UIManagerでの選択に失敗: {e}")
 
         # 方法3: 直接的なapp_state操作
         if not selection_success:
             try:
                 # app_stateを直接更新
                 self.app_state["selected_node_id"] = selected_node_id
-                print(f"[OK] app_stateでノード {selected_node_id} を選択しました")
+                _debug_print(f"[OK] app_stateでノード {selected_node_id} を選択しました")
 
                 # FormManagerを使用してフォーム更新
                 form_manager = self.app_state.get("form_manager")
                 if form_manager and hasattr(form_manager, "update_detail_form"):
                     form_manager.update_detail_form(selected_node_id)
-                    print("[OK] FormManagerでフォームを更新しました")
+                    _debug_print("[OK] FormManagerでフォームを更新しました")
                     selection_success = True
                 else:
-                    print("[WARNING] FormManagerが見つかりません")
+                    _debug_print("[WARNING] FormManagerが見つかりません")
 
             except (AttributeError, RuntimeError, ValueError, KeyError) as e:
-                print(f"[WARNING] 直接選択に失敗: {e}")
+                _debug_print(f"[WARNING] 直接選択に失敗: {e}")
 
         if not selection_success:
             print(f"[ERROR] ノード {selected_node_id} の選択に失敗しました")
@@ -704,9 +1144,12 @@ class SearchManager(EventAwareManager):
     
     def clear_search_results(self) -> None:
         """検索結果をクリア"""
+        self._cancel_debounced_search()
+
         # 検索状態をリセット
         self.search_term = ""
         self.search_results = []
+        self._result_id_set = set()
         self.current_search_index = -1
 
         # ハイライト対象をクリア
@@ -833,361 +1276,130 @@ class SearchManager(EventAwareManager):
         
         return search_ui
         
-    def update_search_index(self, node_id: Optional[str] = None) -> None:
+    def update_search_index(self, node_ids: Union[str, Iterable[str], None] = None, force: bool = False) -> None:
         """
         検索インデックスを更新する
         
         Args:
-            node_id: 更新するノードのID。Noneの場合は全インデックスを再構築
+            node_ids: 更新するノードのID(複数指定可)。Noneの場合は全インデックスを再構築
+            force: Trueの場合はnode_idsに関わらず全インデックスを再構築する
+                (見つからないノードIDが指定された場合も全体は再構築しない)
         """
-        print(f"[UPDATE] 検索インデックスを更新します: node_id={node_id}")
-        
-        # デバッグ: 更新前のインデックス状態
-        print(f"[UPDATE] 更新前のインデックス: {len(self.search_index)}ノード")
-        node_ids_before = [item['id'] for item in self.search_index]
-        print(f"[UPDATE] 更新前のノードID: {node_ids_before[:10]}..." if len(node_ids_before) > 10 else f"[UPDATE] 更新前のノードID: {node_ids_before}")
-        
+        logger.debug("検索インデックスを更新します: node_ids=%s (更新前: %dノード)", node_ids, len(self.search_index))
+
         # 全インデックス再構築
-        if node_id is None:
+        if force or node_ids is None:
             # データが変更された場合は検索インデックスを完全に再構築
             self.search_index = []
             self.build_search_index()
-            
-            # デバッグ: 再構築後のインデックス状態
-            node_ids_after = [item['id'] for item in self.search_index]
-            print(f"[OK] 検索インデックスを再構築しました({len(self.search_index)}ノード)")
-            print(f"[OK] 再構築後のノードID: {node_ids_after[:10]}..." if len(node_ids_after) > 10 else f"[OK] 再構築後のノードID: {node_ids_after}")
-            
+            logger.debug("検索インデックスを再構築しました(%dノード)", len(self.search_index))
+
             # 検索語があれば再検索を強制実行
-            if hasattr(self, 'search_term') and self.search_term:
-                # self.search_indexの状態を確認
+            if self.search_term:
                 self.perform_search()
             return
-            
-        # 特定ノードの更新
-        if node_id and self.app_state.get("data_map") and node_id in self.app_state["data_map"]:
-            # 更新対象のノードとその子ノードのIDリスト
-            updated_nodes = []
-            
-            # 更新対象ノードのIDを収集
+
+        # 指定ノード(複数の場合はまとめて)の更新
+        ids = [node_ids] if isinstance(node_ids, str) else list(node_ids)
+        changes = self._update_index_nodes(ids)
+
+        # 現在の検索条件で検索を再実行(検索結果の表示・選択も更新される)
+        # 更新した行が検索語に一致しない場合は、表示される結果が変わらないため再検索しない
+        if self._changes_affect_results(changes):
+            self.perform_search()
+
+    def _changes_affect_results(self, changes: List[Tuple[int, str, str]]) -> bool:
+        """
+        行のテキストの変更が現在の検索結果に影響するかどうか
+
+        更新前・更新後のいずれのテキストも検索語に一致しない行は、検索結果にも
+        (子ノードの一致による親ノードの除外にも)関係しない
+
+        Args:
+            changes: (行番号, 更新前のテキスト, 更新後のテキスト) のリスト
+
+        Returns:
+            bool: 検索語があり、いずれかの行が更新前または更新後に一致する場合 True
+        """
+        if not self.search_term or not changes:
+            return False
+        search_term_lower = self.search_term.casefold()
+        terms = search_term_lower.split() or [search_term_lower]
+        return any(
+            all(term in old_text for term in terms) or all(term in new_text for term in terms)
+            for _, old_text, new_text in changes
+        )
+
+    def _update_index_nodes(self, node_ids: Iterable[str]) -> List[Tuple[int, str, str]]:
+        """
+        指定ノードとその子孫ノードの検索インデックスの行をまとめて作り直す
+
+        Args:
+            node_ids: 更新するノードのID
+
+        Returns:
+            List[Tuple[int, str, str]]: (行番号, 更新前のテキスト, 更新後のテキスト) のリスト
+        """
+        data_map = self.app_state.get("data_map") or {}
+        children_map = self.app_state.get("children_map", {})
+        id_key = self.app_state.get("id_key", "id")
+        children_key = self.app_state.get("children_key", "children")
+
+        # 更新対象ノードとその子孫ノードのIDを幅優先で収集する
+        # (収集済みの判定は全ノードで共有し、重なる部分木は一度だけ走査する)
+        updated_nodes = []
+        seen = set()
+        for node_id in node_ids:
+            if node_id not in data_map:
+                # 見つからないノードIDではインデックスを変更しない(全体の再構築は force=True で明示する)
+                logger.warning("指定されたノードID '%s' が見つからないため、検索インデックスの更新をスキップします", node_id)
+                continue
+            if not isinstance(data_map[node_id], dict):
+                logger.warning("ノード '%s' が辞書型ではないため、検索インデックスの更新をスキップします", node_id)
+                continue
+            if node_id in seen:
+                continue
+            seen.add(node_id)
             updated_nodes.append(node_id)
-            
-            # 子ノードも再帰的に収集
-            children_key = self.app_state.get("children_key", "children")
-            def collect_child_nodes(parent_id):
-                node_data = self.app_state["data_map"].get(parent_id)
-                if not node_data or not isinstance(node_data, dict):
-                    return
-                
-                # children_mapから子ノードを取得
-                children = self.app_state["children_map"].get(parent_id, [])
-                for child_id in children:
-                    if child_id not in updated_nodes:
-                        updated_nodes.append(child_id)
-                        collect_child_nodes(child_id)
-                
-                # 直接データから子ノードを取得(配列やネストしたオブジェクト向け)
-                if children_key in node_data and isinstance(node_data[children_key], list):
-                    id_key = self.app_state.get("id_key", "id")
-                    for child in node_data[children_key]:
-                        if isinstance(child, dict) and id_key in child:
-                            child_id = str(child[id_key])
-                            if child_id not in updated_nodes:
-                                updated_nodes.append(child_id)
-                                collect_child_nodes(child_id)
-            
-            # 子ノードを収集
-            collect_child_nodes(node_id)
-            
-            print(f"  更新対象ノード: {updated_nodes}")
-            
-            # 対象ノードのデータを取得
-            node_data = self.app_state["data_map"].get(node_id)
-            if not node_data or not isinstance(node_data, dict):
-                print(f"[WARNING] ノード '{node_id}' が辞書型ではないため、処理をスキップします。")
-                return
-                
-            # 検索テキストに含める追加データ(ネストされた値、子ノードなど)
-            additional_texts = []
-            
-            # 編集された可能性のある子要素からテキストを抽出する特別処理
-            for child_key, child_value in node_data.items():
-                if child_key == "children_key":
-                    continue  # children_keyは別途処理
-                
-                if isinstance(child_value, dict):
-                    # 辞書全体の文字列表現を追加
-                    dict_str = str(child_value)
-                    additional_texts.append(dict_str)
-                    print(f"  抽出: 辞書型フィールド '{child_key}' の全体「{dict_str[:50]}...」を検索テキストに追加")
-                    
-                    # 辞書のすべてのキーと値を再帰的に抽出
-                    for k, v in child_value.items():
-                        # キーを追加
-                        additional_texts.append(k)
-                        # 値の型に応じた処理
-                        if isinstance(v, (str, int, float, bool)):
-                            # プリミティブ値は文字列に変換
-                            v_str = str(v)
-                            additional_texts.append(v_str)
-                            print(f"  抽出: '{child_key}.{k}' の値「{v_str}」を検索テキストに追加")
-                        elif isinstance(v, dict):
-                            # ネストされた辞書も処理
-                            v_str = str(v)
-                            additional_texts.append(v_str)
-                            print(f"  抽出: ネストされた辞書 '{child_key}.{k}' の全体「{v_str[:50]}...」を追加")
-                            # 個別の値も処理
-                            for inner_k, inner_v in v.items():
-                                additional_texts.append(inner_k)
-                                inner_v_str = str(inner_v)
-                                additional_texts.append(inner_v_str)
-                                print(f"  抽出: 内部値 '{child_key}.{k}.{inner_k}' = 「{inner_v_str}」を追加")
-                        elif isinstance(v, list):
-                            # ネストされたリストも処理
-                            v_str = str(v)
-                            additional_texts.append(v_str)
-                            for i, item in enumerate(v):
-                                item_str = str(item)
-                                additional_texts.append(item_str)
-                                print(f"  抽出: '{child_key}.{k}[{i}]' の値「{item_str}」を追加")
-                elif isinstance(child_value, list):
-                    # リスト全体の文字列表現を追加
-                    list_str = str(child_value)
-                    additional_texts.append(list_str)
-                    print(f"  抽出: リスト型フィールド '{child_key}' の全体「{list_str[:50]}...」を検索テキストに追加")
-                    
-                    # リストの各要素も処理
-                    for i, item in enumerate(child_value):
-                        item_str = str(item)
-                        additional_texts.append(item_str)
-                        print(f"  抽出: '{child_key}[{i}]' の値「{item_str}」を追加")
-                        # 特別に対象とするキーワード('a', 'b', 'ccc'など問題が報告されているキーワード)を追加
-                        if item_str in ['a', 'b', 'ccc'] or (isinstance(item, dict) and any(str(v) in ['a', 'b', 'ccc'] for v in item.values())):
-                            special_str = str(item)
-                            additional_texts.append(special_str)
-                            print(f"  特別処理: キーワード '{special_str}' を検索テキストに追加")
-                            
-                        # 辞書型の要素の場合は、さらに詳細に処理
-                        if isinstance(item, dict):
-                            for item_k, item_v in item.items():
-                                additional_texts.append(item_k)
-                                item_v_str = str(item_v)
-                                additional_texts.append(item_v_str)
-                                print(f"  抽出: '{child_key}[{i}].{item_k}' の値「{item_v_str}」を追加")
-                else:
-                    # その他の値(プリミティブ型)も追加
-                    value_str = str(child_value)
-                    additional_texts.append(value_str)
-                    print(f"  抽出: フィールド '{child_key}' の値「{value_str}」を追加")
-            
-            # 更新対象のノードを検索インデックスから削除
-            self.search_index = [item for item in self.search_index if item["id"] not in updated_nodes]
-            print(f"  更新前の中間インデックス: 削除後={len(self.search_index)}ノード")
-            
-            # 更新対象のノードを再インデックス化
-            added_items = []
-
-            # ループ外に関数を定義（B023警告回避）
-            def extract_searchable_text(obj, prefix, fields_list):
-                """オブジェクトから検索可能なテキストを再帰的に抽出"""
-                if isinstance(obj, dict):
-                    # 辞書全体を文字列として追加(JSON構造全体で検索できるように)
-                    dict_str = str(obj)
-                    if dict_str and dict_str.strip():
-                        fields_list.append(dict_str)
-
-                    for k, v in obj.items():
-                        # キー名も検索対象に追加
-                        if isinstance(k, str):
-                            fields_list.append(k)
-                        # 値を再帰的に処理
-                        extract_searchable_text(v, f"{prefix}.{k}" if prefix else k, fields_list)
-                elif isinstance(obj, list):
-                    # リスト全体を文字列として追加(重要)
-                    list_str = str(obj)
-                    if list_str and list_str.strip():
-                        fields_list.append(list_str)
-
-                    # リストの各要素も個別に追加
-                    for i, item in enumerate(obj):
-                        # 各要素を文字列化して直接追加(プリミティブ値)
-                        item_str = str(item)
-                        if item_str and item_str.strip():
-                            fields_list.append(item_str)
-                        # 複雑な型は再帰的に処理
-                        if isinstance(item, (dict, list)):
-                            extract_searchable_text(item, f"{prefix}[{i}]", fields_list)
-                elif isinstance(obj, (str, int, float, bool)):
-                    # プリミティブ値は文字列に変換して追加
-                    obj_str = str(obj)
-                    if obj_str and obj_str.strip():  # 空でない場合のみ追加
-                        fields_list.append(obj_str)
-
-            for update_id in updated_nodes:
-                node_data = self.app_state["data_map"].get(update_id)
+            queue = deque((node_id,))
+            while queue:
+                parent_id = queue.popleft()
+                node_data = data_map.get(parent_id)
                 if not node_data or not isinstance(node_data, dict):
                     continue
 
-                # 検索対象テキストの構築
-                id_key = self.app_state.get("id_key", "id")
-                label_key = self.app_state.get("label_key", "name")
-
-                # ノードの文字列表現を取得
-                node_id = str(update_id)
-                node_text = ""
+                # children_mapの子ノードIDと、ノード内に直接ネストした子ノード(IDを持つ辞書)のID
+                child_ids = list(children_map.get(parent_id, ()))
+                nested_children = node_data.get(children_key)
+                if isinstance(nested_children, list):
+                    child_ids.extend(
+                        str(child[id_key]) for child in nested_children
+                        if isinstance(child, dict) and id_key in child
+                    )
+                for child_id in child_ids:
+                    if child_id not in seen:
+                        seen.add(child_id)
+                        updated_nodes.append(child_id)
+                        queue.append(child_id)
 
-                if label_key in node_data:
-                    node_text = str(node_data.get(label_key, ""))
+        if not updated_nodes:
+            return []
 
-                # 検索対象に追加するフィールド(キーと値の両方)
-                extra_fields = []
-                
-                # すべてのフィールドを抽出
-                for key, value in node_data.items():
-                    if key != children_key:  # children_key は別途処理するので除外
-                        if key == "tags" or isinstance(value, list):  # tagsやその他リストを特別扱い
-                            print(f"    特別処理: フィールド '{key}' はリスト型なので個別に処理します")
-                            if isinstance(value, list):
-                                # リスト全体を文字列として追加
-                                list_str = str(value)
-                                if list_str and list_str.strip():
-                                    extra_fields.append(list_str)
-                                    print(f"    抽出: '{key}'の全体「{list_str[:30]}...」を検索テキストに追加")
-                                
-                                # 各要素を個別に追加
-                                for item in value:
-                                    item_str = str(item)
-                                    if item_str and item_str.strip():  # 空文字を除外
-                                        extra_fields.append(item_str)
-                                        print(f"    抽出: '{key}'の要素「{item_str}」を検索テキストに追加")
-                        
-                        # 通常の再帰処理
-                        extract_searchable_text(value, key, extra_fields)
-                        extra_fields.append(key)
-                
-                # 追加の抽出テキストを加える
-                extra_fields.extend(additional_texts)
-                
-                # 重複を排除してリストを効率化
-                unique_extra_fields = list(set(extra_fields))
-                
-                # 空文字を除外
-                unique_extra_fields = [field for field in unique_extra_fields if field and field.strip()]
-                
-                # デバッグ出力を追加
-                print(f"  ノード「{node_id}」の検索テキスト生成:")
-                print(f"    - ラベル: {node_text}")
-                print(f"    - 検索フィールド: {unique_extra_fields[:20]}{'...' if len(unique_extra_fields) > 20 else ''}")
-                
-                # 検索対象の文字列をまとめる
-                search_text = f"{node_text} {node_id} {' '.join(unique_extra_fields)}"
-                print(f"    - 検索テキスト(一部): {search_text[:100]}...")
-                
-                # 新しいインデックス項目を作成
-                new_index_item = {
-                    "text": search_text.lower(),
-                    "path": f"node:{node_id}", # 単純なパス形式に変更
-                    "node": node_data,
-                    "id": node_id
-                }
-                
-                # インデックスに追加
-                self.search_index.append(new_index_item)
-                added_items.append(new_index_item)
-            
-            # デバッグ: 更新後の状態を確認
-            print(f"[OK] 検索インデックスを更新しました: 追加={len(added_items)}ノード, 合計={len(self.search_index)}ノード")
-            added_node_ids = [item["id"] for item in added_items]
-            all_node_ids = [item["id"] for item in self.search_index]
-            print(f"  追加されたID: {added_node_ids}")
-            print(f"  更新後の全ID: {all_node_ids[:10]}..." if len(all_node_ids) > 10 else f"  更新後の全ID: {all_node_ids}")
-            
-            # インデックスに実際に追加されたか確認
-            found_ids = []
-            for test_id in updated_nodes:
-                if any(item["id"] == test_id for item in self.search_index):
-                    found_ids.append(test_id)
-            print(f"  インデックスに存在するID: {found_ids}")
-            
-            # 現在の検索語があるか確認
-            old_term = getattr(self, 'search_term', '')
-            
-            # 現在の検索条件で検索を確実に再実行(検索結果を更新するため)
-            if old_term:
-                # 検索実行前の最終チェック
-                # 数件のサンプルを表示
-                for i, item in enumerate(self.search_index):
-                    if i < 3 or item["id"] in updated_nodes:
-                        print(f"  - ID: {item['id']}, テキスト: {item['text'][:50]}...")
-                
-                # 検索語が検索テキストに含まれているか直接チェック
-                check_term = old_term.lower()
-                found_in_texts = [
-                    item["id"] for item in self.search_index
-                    if check_term in item["text"]
-                ]
-                if found_in_texts:
-                    print(f"  検索語 '{old_term}' は以下のノードに存在します: {found_in_texts}")
-                else:
-                    print(f"  検索語 '{old_term}' は検索対象テキストに見つかりませんでした")
-                
-                # 特別処理: 特定のキーワードを直接チェック
-                if check_term in ['a', 'b', 'ccc']:
-                    print(f"  特別チェック: キーワード '{check_term}' を直接探索中...")
-                    for item in self.search_index:
-                        if item["id"] == node_id:
-                            if check_term in item["text"]:
-                                print(f"    [OK] キーワード '{check_term}' はノード {node_id} のテキストに存在します")
-                            else:
-                                print(f"    [ERROR] キーワード '{check_term}' はノード {node_id} のテキストに存在しません")
-                            # 周辺コンテキストを表示
-                            context = item["text"]
-                            try:
-                                index = context.find(check_term)
-                                if index >= 0:
-                                    start = max(0, index - 20)
-                                    end = min(len(context), index + len(check_term) + 20)
-                                    surrounding = context[start:end]
-                                    print(f"    周辺コンテキスト: ...{surrounding}...")
-                            except:
-                                pass
-                
-                # 検索を強制的に実行
-                self.perform_search()
-                
-                # 検索結果の表示を強制的に更新
-                if self.search_results:
-                    print(f"[OK] 検索結果が見つかりました: {len(self.search_results)}件")
-                    result_ids = [result["id"] for result in self.search_results]
-                    print(f"  - 検索結果のID: {result_ids}")
-                    
-                    # 検索結果のUIを確実に更新
-                    self.update_search_results_display()
-                    
-                    # 検索結果が存在し、かつ最初の検索結果を選択
-                    if len(self.search_results) > 0:
-                        self.select_search_result(0)
-                    
-                    # ページ全体の更新
-                    if self.page:
-                        print("[OK] ページ全体を更新します")
-                        self.page.update()
-                else:
-                    print(f"[WARNING] 検索語 '{old_term}' に一致する結果が見つかりませんでした")
-                    # 結果が見つからない場合でも、UIを更新
-                    self.update_search_results_display()
-                    if self.page:
-                        self.page.update()
-        else:
-            print(f"[WARNING] 指定されたノードID '{node_id}' が見つからないため、検索インデックスを更新できません")
-            # 代替策として全インデックスを再構築
-            self.search_index = []
-            self.build_search_index()
-            print(f"[OK] 代替として検索インデックスを完全に再構築しました({len(self.search_index)}ノード)")
-            
-            # 検索語があれば再検索を強制実行
-            if hasattr(self, 'search_term') and self.search_term:
-                self.perform_search()
+        # 対象ノードのIDの一覧は部分木の大きさに比例するため、デバッグログが有効な場合のみ出力する
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("更新対象ノード: %s", updated_nodes)
+
+        # 更新対象のノードの行だけを作り直す(インデックス全体は再構築しない)
+        label_key = self.app_state.get("label_key", "name")
+        update_targets = []
+        for update_id in updated_nodes:
+            update_data = data_map.get(update_id)
+            if update_data and isinstance(update_data, dict):
+                update_targets.append((str(update_id), update_data))
+        changes = self._replace_index_rows(update_targets, label_key, children_key)
+
+        logger.debug("検索インデックスを更新しました: 更新=%dノード, 合計=%dノード", len(updated_nodes), len(self.search_index))
+        return changes
 
 
     def _setup_event_subscriptions(self):
@@ -1,6 +1,9 @@
 """設定管理マネージャー"""
+import atexit
+import concurrent.futures
 import json
 import os
+import threading
 from typing import Dict, Any, Optional, Callable
 from flet import ThemeMode
 from event_hub import EventHub, EventType
@@ -9,6 +12,9 @@ from logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# 設定変更から保存までの待ち時間(秒)。この間の変更はまとめて1回だけ書き込む
+_SETTINGS_FLUSH_DELAY_SEC = 0.5
+
 
 class SettingsManager:
     """アプリケーション設定の管理を担当するマネージャー"""
@@ -26,6 +32,15 @@ class SettingsManager:
         )
         self._settings: Dict[str, Any] = self._load_settings()
         self._theme_change_callbacks: list[Callable] = []
+
+        # 未保存の変更があるかどうかと、遅延保存用のタイマー
+        self._dirty = False
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        # ファイルへの書き込みは1スレッドで順に行う(呼び出し元のUIスレッドを待たせない)
+        self._write_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        # 終了時に未保存の変更を書き込む
+        atexit.register(self._flush_on_exit)
         
         # イベントハブに登録
         self._event_hub.subscribe("theme_changed", self._on_theme_changed)
@@ -56,13 +71,102 @@ class SettingsManager:
         return default_settings
     
     def save_settings(self) -> None:
-        """現在の設定をファイルに保存"""
-        os.makedirs(os.path.dirname(self._settings_file), exist_ok=True)
+        """現在の設定をファイルに保存
+
+        設定を JSON 文字列にしてから書き込み用のスレッドに渡し、書き込みは待たない
+        """
+        content = self._take_snapshot()
+        if content is None:
+            return
         try:
-            with open(self._settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self._settings, f, indent=2, ensure_ascii=False)
-        except IOError as e:
-            self._event_hub.publish("error_occurred", {"message": t("error.settings_save_failed").format(error=str(e))})
+            self._write_executor.submit(self._write_to_disk, content)
+        except RuntimeError:
+            # 終了処理中などで書き込み用のスレッドが使えない場合はその場で書き込む
+            self._write_to_disk(content)
+
+    def _take_snapshot(self) -> Optional[str]:
+        """
+        未保存の状態を解除し、保存する設定を JSON 文字列として取得する
+
+        設定の変更(_update_setting)と同じロックの中で変換するため、変換中に設定が変更されることはない。
+        書き込み用のスレッドには文字列だけを渡すため、書き込み中の変更の影響も受けない
+
+        Returns:
+            Optional[str]: 保存する内容。JSON に変換できない値がある場合は None
+        """
+        with self._flush_lock:
+            self._dirty = False
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            try:
+                return json.dumps(self._settings, separators=(',', ':'), ensure_ascii=False)
+            except (TypeError, ValueError) as e:
+                error = e
+        # 通知はロックの外で行う(通知先から設定が変更されてもデッドロックしない)
+        logger.error(f"Failed to serialize settings: {error}")
+        self._report_save_error(error)
+        return None
+
+    def _write_to_disk(self, content: str) -> None:
+        """
+        設定をファイルに書き込む
+
+        一時ファイルに書き込んでから置き換えるため、書き込み途中で終了しても設定ファイルは壊れない
+
+        Args:
+            content: 保存する内容(JSON 文字列)
+        """
+        tmp_file = self._settings_file + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self._settings_file), exist_ok=True)
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_file, self._settings_file)
+        except OSError as e:
+            logger.error(f"Failed to write settings: {e}")
+            # 書き込みに失敗した一時ファイルは残さない
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            self._report_save_error(e)
+
+    def _report_save_error(self, error: Exception) -> None:
+        """設定の保存に失敗したことを通知する"""
+        self._event_hub.publish("error_occurred", {"message": t("error.settings_save_failed").format(error=str(error))})
+
+    def _update_setting(self, key: str, value: Any) -> None:
+        """
+        設定値を変更し、保存を予約する
+
+        変更は _flush_lock の中で行う(遅延保存のタイマーのスレッドでの JSON 変換と重ならない)。
+        最後の変更から _SETTINGS_FLUSH_DELAY_SEC 秒間次の変更がなければ、一度だけ保存する
+
+        Args:
+            key: 設定のキー
+            value: 設定値
+        """
+        with self._flush_lock:
+            self._settings[key] = value
+            self._dirty = True
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(_SETTINGS_FLUSH_DELAY_SEC, self._flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush(self) -> None:
+        """未保存の変更があれば設定をファイルに保存する"""
+        if self._dirty:
+            self.save_settings()
+
+    def _flush_on_exit(self) -> None:
+        """終了時に未保存の変更をその場で書き込む"""
+        if self._dirty:
+            content = self._take_snapshot()
+            if content is not None:
+                self._write_to_disk(content)
     
     def get_theme_mode(self) -> ThemeMode:
         """現在のテーマモードを取得"""
@@ -83,8 +187,7 @@ class SettingsManager:
         if mode not in ["system", "light", "dark", "fledjson"]:
             raise ValueError(f"Invalid theme mode: {mode}")
         
-        self._settings["theme_mode"] = mode
-        self.save_settings()
+        self._update_setting("theme_mode", mode)
         
         # テーマ変更イベントを発行
         self._event_hub.publish("theme_mode_changed", {"mode": mode})
@@ -99,8 +202,7 @@ class SettingsManager:
     
     def set_color_scheme_seed(self, seed: str) -> None:
         """カラースキームシードを設定"""
-        self._settings["color_scheme_seed"] = seed
-        self.save_settings()
+        self._update_setting("color_scheme_seed", seed)
         self._event_hub.publish("color_scheme_changed", {"seed": seed})
     
     def add_theme_change_callback(self, callback: Callable) -> None:
@@ -118,12 +220,12 @@ class SettingsManager:
     
     def set_setting(self, key: str, value: Any) -> None:
         """設定値を設定"""
-        self._settings[key] = value
-        self.save_settings()
+        self._update_setting(key, value)
     
     def add_recent_file(self, file_path: str) -> None:
         """最近使用したファイルを追加"""
-        recent_files = self._settings.get("recent_files", [])
+        # 保存処理と同じリストを変更しないよう、コピーを編集して差し替える
+        recent_files = list(self._settings.get("recent_files", []))
         
         # 既に存在する場合は削除
         if file_path in recent_files:
@@ -133,8 +235,7 @@ class SettingsManager:
         recent_files.insert(0, file_path)
         
         # 最大10件まで保持
-        self._settings["recent_files"] = recent_files[:10]
-        self.save_settings()
+        self._update_setting("recent_files", recent_files[:10])
     
     def get_recent_files(self) -> list[str]:
         """最近使用したファイルのリストを取得"""
@@ -158,8 +259,7 @@ class SettingsManager:
             logger.warning(f"Invalid language code: {language}, defaulting to 'ja'")
             language = "ja"
         
-        self._settings["language"] = language
-        self.save_settings()
+        self._update_setting("language", language)
         
         # グローバル翻訳システムに反映
         set_global_language(language)
@@ -10,7 +10,6 @@ from typing import Dict, List, Any, Optional, Set, Union, Tuple, Callable
 from collections import defaultdict, Counter
 import json
 import re
-import copy
 from enum import Enum, auto
 import statistics
 from datetime import datetime
@@ -46,6 +45,13 @@ except ImportError:
     class EventPriority(Enum):
         NORMAL = auto()
 
+# フィールド名から推論した役割をキャッシュするフィールド名の数
+_ROLE_CACHE_SIZE = 4096
+
+# type_patterns のいずれかに一致しうる文字列の先頭文字（英字・記号。数字と空白は str.isdigit / str.isspace で判定する）
+# 日本語の文章など、これ以外で始まる文字列は正規表現を使わずに文字列型と判定する
+_TYPE_PATTERN_FIRST_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ._%+-$#()")
+
 class FieldType(Enum):
     """フィールドの型を表す列挙型"""
     STRING = "string"
@@ -162,9 +168,22 @@ class TemplateManager(EventAwareManager):
                 re.compile(r'^rgb\(\d+,\s?\d+,\s?\d+\)$'),  # rgb(255, 0, 0)
             ],
         }
-        
-        # フィールド名パターンによる役割推論
-        self.role_patterns = {
+
+        # 型のパターンを名前付きグループの選択（|）にまとめた正規表現
+        # （先に並べたパターンが優先されるため、type_patterns と同じ順に並べる。
+        #  同じ型の複数のパターンはグループ名に連番を付けて区別する）
+        self._type_group_to_type: Dict[str, FieldType] = {}
+        alternatives = []
+        for field_type, patterns in self.type_patterns.items():
+            for i, pattern in enumerate(patterns):
+                group_name = f"{field_type.name}_{i}"
+                self._type_group_to_type[group_name] = field_type
+                body = f"(?i:{pattern.pattern})" if pattern.flags & re.IGNORECASE else pattern.pattern
+                alternatives.append(f"(?P<{group_name}>{body})")
+        self._combined_type_re = re.compile("|".join(alternatives))
+        
+        # フィールド名パターンによる役割推論（パターンは初期化時にコンパイルする）
+        self.role_patterns = {role: [re.compile(pattern) for pattern in patterns] for role, patterns in {
             FieldRole.ID: [r'id$', r'^.*_id$', r'^id_'],
             FieldRole.PARENT_ID: [r'parent.*id', r'.*parent.*id', r'pid'],
             FieldRole.LABEL: [r'label', r'name$', r'title$'],
@@ -182,7 +201,22 @@ class TemplateManager(EventAwareManager):
             FieldRole.PRICE: [r'price', r'cost', r'amount', r'value'],
             FieldRole.QUANTITY: [r'qty', r'quantity', r'count', r'num'],
             FieldRole.CHILDREN: [r'child', r'sub', r'items'],
-        }
+        }.items()}
+
+        # 役割のパターンを1つの正規表現にまとめたもの
+        # 選択肢ごとに先頭から先読みで検索し、最初に一致した選択肢（= role_patterns の順で最初のパターン）を採用する
+        # （単純な選択では文字列中で最も左に一致したパターンが優先され、順序による優先度が変わるため）
+        self._role_group_to_role: Dict[str, FieldRole] = {}
+        alternatives = []
+        for role, patterns in self.role_patterns.items():
+            for i, pattern in enumerate(patterns):
+                group_name = f"{role.name}_{i}"
+                self._role_group_to_role[group_name] = role
+                alternatives.append(f"(?=(?s:.*?)(?:{pattern.pattern}))(?P<{group_name}>)")
+        self._combined_role_re = re.compile("|".join(alternatives))
+
+        # フィールド名（小文字） → 名前から推論した役割（一致しない場合は None）
+        self._role_by_name_cache: Dict[str, Optional[FieldRole]] = {}
         
         # 環境変数に基づく初期化メッセージ
         from debug_control import print_init
@@ -223,9 +257,16 @@ class TemplateManager(EventAwareManager):
             "source": "template_manager"
         }
         
+        # 各フィールドの出現数を1回の走査で数えておく
+        samples = data if isinstance(data, list) else [data]
+        presence = Counter()
+        for sample in samples:
+            if isinstance(sample, dict):
+                presence.update(sample.keys())
+        
         # 各フィールドを分析
         for field_name, field_value in sample_data.items():
-            field_info = self._analyze_field(field_name, field_value, data if isinstance(data, list) else [data])
+            field_info = self._analyze_field(field_name, field_value, presence, len(samples))
             template["fields"][field_name] = field_info
         
         # イベント発行
@@ -253,41 +294,13 @@ class TemplateManager(EventAwareManager):
             data: 適用先のデータ
             
         Returns:
-            テンプレートが適用されたデータ
+            テンプレートが適用されたデータ（変更のない部分は data と共有する）
         """
         if not template or not data:
             return data
-        
-        # データのコピーを作成
-        result = copy.deepcopy(data)
-        
-        # テンプレートがオブジェクト型の場合
-        if template["type"] == FieldType.OBJECT.value:
-            # 必須フィールドの補完
-            for field_name, field_info in template["fields"].items():
-                if field_info.get("importance") == FieldImportance.REQUIRED.value and field_name not in result:
-                    # サンプルデータがある場合はそれを使用
-                    if "sample_data" in template and field_name in template["sample_data"]:
-                        result[field_name] = template["sample_data"][field_name]
-                    else:
-                        # サンプルデータがない場合はデフォルト値を生成
-                        result[field_name] = self._generate_default_value(field_info["type"])
-            
-            # 再帰的に子オブジェクトにテンプレートを適用
-            for field_name, field_value in result.items():
-                if field_name in template["fields"]:
-                    field_template = template["fields"][field_name]
-                    
-                    if field_template["type"] == FieldType.OBJECT.value and isinstance(field_value, dict):
-                        result[field_name] = self.apply_template(field_template, field_value)
-                    elif field_template["type"] == FieldType.ARRAY.value and isinstance(field_value, list):
-                        # 配列の各要素にテンプレートを適用
-                        if "common_fields" in field_template and field_template["common_fields"]:
-                            result[field_name] = [
-                                self.apply_template({"type": FieldType.OBJECT.value, "fields": field_template["common_fields"]}, item)
-                                if isinstance(item, dict) else item
-                                for item in field_value
-                            ]
+
+        # 不足フィールドの補完は、変更が必要な辞書・リストだけを作り直して行う（入力全体はコピーしない）
+        result = self._merge_template(template, data)
         
         # イベント発行
         if self.event_hub:
@@ -305,6 +318,79 @@ class TemplateManager(EventAwareManager):
         
         return result
 
+    def _merge_template(self, template: Dict[str, Any], data: Any) -> Any:
+        """
+        テンプレートをデータに適用した結果を作成します
+
+        フィールドを補完する辞書と、要素が変わるリストだけを新しく作り、
+        それ以外の値は data の値をそのまま使用します（変更がなければ data 自身を返します）
+
+        Args:
+            template: 適用するテンプレート
+            data: 適用先のデータ
+
+        Returns:
+            テンプレートが適用されたデータ
+        """
+        if not template or not data:
+            return data
+
+        # テンプレートが配列型の場合、各要素に共通フィールドのテンプレートを適用
+        if template["type"] == FieldType.ARRAY.value:
+            if isinstance(data, list) and template.get("common_fields"):
+                return self._merge_items(template["common_fields"], data)
+            return data
+
+        if template["type"] != FieldType.OBJECT.value or not isinstance(data, dict):
+            return data
+
+        result = data
+        fields = template["fields"]
+
+        # 必須フィールドの補完
+        for field_name, field_info in fields.items():
+            if field_info.get("importance") == FieldImportance.REQUIRED.value and field_name not in result:
+                if result is data:
+                    result = dict(data)
+                # サンプルデータがある場合はそれを使用
+                if "sample_data" in template and field_name in template["sample_data"]:
+                    result[field_name] = template["sample_data"][field_name]
+                else:
+                    # サンプルデータがない場合はデフォルト値を生成
+                    result[field_name] = self._generate_default_value(field_info["type"])
+
+        # 再帰的に子オブジェクトにテンプレートを適用
+        for field_name, field_value in list(result.items()):
+            field_template = fields.get(field_name)
+            if field_template is None:
+                continue
+
+            new_value = field_value
+            if field_template["type"] == FieldType.OBJECT.value and isinstance(field_value, dict):
+                new_value = self._merge_template(field_template, field_value)
+            elif field_template["type"] == FieldType.ARRAY.value and isinstance(field_value, list):
+                if field_template.get("common_fields"):
+                    new_value = self._merge_items(field_template["common_fields"], field_value)
+
+            if new_value is not field_value:
+                if result is data:
+                    result = dict(data)
+                result[field_name] = new_value
+
+        return result
+
+    def _merge_items(self, common_fields: Dict[str, Any], items: List[Any]) -> List[Any]:
+        """配列の各要素に共通フィールドのテンプレートを適用します（いずれかの要素が変わった場合のみ新しいリストを返します）"""
+        item_template = {"type": FieldType.OBJECT.value, "fields": common_fields}
+        new_items = []
+        changed = False
+        for item in items:
+            new_item = self._merge_template(item_template, item) if isinstance(item, dict) else item
+            if new_item is not item:
+                changed = True
+            new_items.append(new_item)
+        return new_items if changed else items
+
     def suggest_field_roles(self, data: Union[Dict, List[Dict]]) -> Dict[str, FieldRole]:
         """
         データから各フィールドの役割を推測します
@@ -322,19 +408,15 @@ class TemplateManager(EventAwareManager):
             if not data:
                 return field_roles
             
-            # 全てのフィールドを収集
-            all_fields = set()
+            # 全てのフィールドの値を1回の走査で収集（フィールドは最初に出現した順）
+            samples_by_field: Dict[str, List[Any]] = defaultdict(list)
             for item in data:
                 if isinstance(item, dict):
-                    all_fields.update(item.keys())
+                    for field_name, field_value in item.items():
+                        samples_by_field[field_name].append(field_value)
             
             # 各フィールドを分析
-            for field_name in all_fields:
-                sample_values = []
-                for item in data:
-                    if isinstance(item, dict) and field_name in item:
-                        sample_values.append(item[field_name])
-                
+            for field_name, sample_values in samples_by_field.items():
                 role = self._infer_field_role(field_name, sample_values)
                 field_roles[field_name] = role
         
@@ -383,12 +465,14 @@ class TemplateManager(EventAwareManager):
         
         return patterns
 
-    def _analyze_field(self, field_name: str, field_value: Any, samples: List[Dict]) -> Dict[str, Any]:
-        """単一フィールドの詳細分析"""
+    def _analyze_field(self, field_name: str, field_value: Any, presence: Counter,
+                       sample_count: int) -> Dict[str, Any]:
+        """単一フィールドの詳細分析（presence はフィールド名ごとの出現サンプル数）"""
+        role = self._infer_field_role(field_name, [field_value])
         field_info = {
             "type": self._infer_field_type(field_value),
-            "role": self._infer_field_role(field_name, [field_value]).value,
-            "importance": self._infer_field_importance(field_name, field_value, samples),
+            "role": role.value,
+            "importance": self._infer_field_importance(field_name, field_value, presence, sample_count, role),
             "nullable": field_value is None,
             "sample_value": field_value
         }
@@ -419,11 +503,15 @@ class TemplateManager(EventAwareManager):
         elif isinstance(value, float):
             return FieldType.NUMBER.value
         elif isinstance(value, str):
-            # 文字列の場合はパターンマッチングで詳細な型を判定
-            for field_type, patterns in self.type_patterns.items():
-                for pattern in patterns:
-                    if pattern.match(value):
-                        return field_type.value
+            # 文字列の場合はパターンマッチングで詳細な型を判定（1回の match で全パターンを調べる）
+            # 空文字列や、どのパターンにも一致しえない文字で始まる文字列は先に除外する
+            if not value:
+                return FieldType.STRING.value
+            first_char = value[0]
+            if first_char in _TYPE_PATTERN_FIRST_CHARS or first_char.isdigit() or first_char.isspace():
+                match = self._combined_type_re.match(value)
+                if match:
+                    return self._type_group_to_type[match.lastgroup].value
             return FieldType.STRING.value
         elif isinstance(value, list):
             return FieldType.ARRAY.value
@@ -434,15 +522,25 @@ class TemplateManager(EventAwareManager):
 
     def _infer_field_role(self, field_name: str, sample_values: List[Any]) -> FieldRole:
         """フィールド名と値から役割を推論"""
-        field_name_lower = field_name.lower()
-        
-        # フィールド名パターンによる推論
-        for role, patterns in self.role_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, field_name_lower):
-                    return role
-        
-        # 値のパターンによる追加推論
+        return (self._infer_role_by_name(field_name.lower())
+                or self._infer_role_by_value(sample_values)
+                or FieldRole.UNKNOWN)
+
+    def _infer_role_by_name(self, field_name_lower: str) -> Optional[FieldRole]:
+        """フィールド名パターンから役割を推論（結果はフィールド名ごとにキャッシュする）"""
+        if field_name_lower in self._role_by_name_cache:
+            return self._role_by_name_cache[field_name_lower]
+
+        # 全パターンを1回の match で調べる
+        match = self._combined_role_re.match(field_name_lower)
+        role = self._role_group_to_role[match.lastgroup] if match else None
+        if len(self._role_by_name_cache) >= _ROLE_CACHE_SIZE:
+            self._role_by_name_cache.clear()
+        self._role_by_name_cache[field_name_lower] = role
+        return role
+
+    def _infer_role_by_value(self, sample_values: List[Any]) -> Optional[FieldRole]:
+        """値のパターンから役割を推論"""
         if sample_values:
             first_value = sample_values[0]
             if isinstance(first_value, str):
@@ -450,20 +548,20 @@ class TemplateManager(EventAwareManager):
                 for pattern in self.type_patterns[FieldType.ID]:
                     if pattern.match(first_value):
                         return FieldRole.ID
-        
-        return FieldRole.UNKNOWN
+        return None
 
-    def _infer_field_importance(self, field_name: str, field_value: Any, samples: List[Dict]) -> str:
-        """フィールドの重要度を推論"""
+    def _infer_field_importance(self, field_name: str, field_value: Any, presence: Counter,
+                                sample_count: int, role: Optional[FieldRole] = None) -> str:
+        """フィールドの重要度を推論（role が指定されていれば推論済みの役割を使用する）"""
         # IDフィールドは必須
-        role = self._infer_field_role(field_name, [field_value])
+        if role is None:
+            role = self._infer_field_role(field_name, [field_value])
         if role in [FieldRole.ID, FieldRole.PARENT_ID]:
             return FieldImportance.REQUIRED.value
         
         # 全サンプルに存在するフィールドは推奨
-        if samples:
-            presence_count = sum(1 for sample in samples if isinstance(sample, dict) and field_name in sample)
-            presence_ratio = presence_count / len(samples)
+        if sample_count:
+            presence_ratio = presence[field_name] / sample_count
             
             if presence_ratio >= 0.9:
                 return FieldImportance.REQUIRED.value
@@ -487,21 +585,20 @@ class TemplateManager(EventAwareManager):
         
         # 各フィールドの代表値を決定
         for field_name in all_fields:
-            values = []
+            # 値の文字列表現ごとの出現回数と、その文字列表現を持つ最初の値（元の型を保持するため）
+            value_counts = Counter()
+            first_values = {}
             for sample in samples:
                 if isinstance(sample, dict) and field_name in sample:
-                    values.append(sample[field_name])
+                    value = sample[field_name]
+                    value_str = str(value)
+                    value_counts[value_str] += 1
+                    first_values.setdefault(value_str, value)
             
-            if values:
+            if value_counts:
                 # 最も頻出する値を使用（同頻度の場合は最初の値）
-                value_counts = Counter(str(v) for v in values)
                 most_common_str = value_counts.most_common(1)[0][0]
-                
-                # 元の型を保持
-                for v in values:
-                    if str(v) == most_common_str:
-                        merged[field_name] = v
-                        break
+                merged[field_name] = first_values[most_common_str]
         
         return merged
 
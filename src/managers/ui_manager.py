@@ -1550,6 +1550,7 @@ class UIManager(EventAwareManager):
                 "is_dirty": False,
                 "data_map": {},  # 明示的に初期化
                 "children_map": {},  # 明示的に初期化
+                "parent_map": {},  # 明示的に初期化
                 "root_ids": []  # 明示的に初期化
             })
             
@@ -5,7 +5,7 @@
 日本語と英語の翻訳辞書を提供し、動的な言語切り替えをサポートします。
 """
 
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -28,6 +28,9 @@ class TranslationSystem:
         
         self._initialized = True
         self._current_language = "ja"  # デフォルトは日本語
+
+        # 解決済み翻訳のキャッシュ((キー, デフォルト値) → 翻訳)。言語変更時にクリアする
+        self._resolved_cache: Dict[Tuple[str, Optional[str]], str] = {}
         
         # 翻訳辞書
         self._translations: Dict[str, Dict[str, str]] = {
@@ -132,6 +135,7 @@ class TranslationSystem:
             "error.list_item_add": {"ja": "リスト項目追加中にエラー: {error}", "en": "Error adding list item: {error}"},
             "error.list_item_delete": {"ja": "リスト項目削除中にエラー: {error}", "en": "Error deleting list item: {error}"},
             "error.field_delete_failed": {"ja": "フィールドの削除に失敗しました: {error}", "en": "Failed to delete field: {error}"},
+            "error.field_already_exists": {"ja": "フィールド '{field}' は既に存在します", "en": "Field '{field}' already exists"},
             "error.node_add_failed": {"ja": "新規ノードの追加に失敗しました: {error}", "en": "Failed to add new node: {error}"},
             "error.no_data_to_add": {"ja": "追加するデータがありません", "en": "No data to add"},
             "error.invalid_id_value": {"ja": "IDフィールド '{field}' に有効な値を設定してください", "en": "Please set a valid value for ID field '{field}'"},
@@ -170,6 +174,7 @@ class TranslationSystem:
             "notification.node_id_deleted": {"ja": "ノードID '{id}' を削除しました", "en": "Node ID '{id}' deleted"},
             "notification.field_deleted": {"ja": "'{field}' フィールドを削除しました", "en": "'{field}' field deleted"},
             "notification.field_added": {"ja": "フィールド '{field}' を追加しました", "en": "Field '{field}' added"},
+            "notification.field_changes_batched": {"ja": "{last} (他 {count} 件)", "en": "{last} (+{count} more)"},
             
             # ダイアログ
             "dialog.field_delete_title": {"ja": "フィールドの削除", "en": "Delete Field"},
@@ -369,6 +374,7 @@ class TranslationSystem:
             language = "ja"
         
         self._current_language = language
+        self._resolved_cache.clear()
         logger.info(f"Language changed to: {language}")
     
     def get_language(self) -> str:
@@ -386,6 +392,17 @@ class TranslationSystem:
         Returns:
             翻訳されたテキスト
         """
+        cache_key = (key, default)
+        cached = self._resolved_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        translation = self._resolve(key, default)
+        self._resolved_cache[cache_key] = translation
+        return translation
+
+    def _resolve(self, key: str, default: Optional[str]) -> str:
+        """翻訳辞書から現在の言語の翻訳を解決する"""
         if key in self._translations:
             translation = self._translations[key].get(self._current_language)
             if translation:
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+EditBufferの単体テスト
+プレフィックス索引が dict 操作に追従することを確認する
+"""
+
+import copy
+import unittest
+import sys
+import os
+
+# テスト対象のモジュールをインポート
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from edit_buffer import EditBuffer
+
+
+class TestEditBuffer(unittest.TestCase):
+    """EditBufferのテスト"""
+
+    def setUp(self):
+        """テストの準備"""
+        self.buffer = EditBuffer({
+            "name": "Item",
+            "items[0].name": "A",
+            "items[0].value": 1,
+            "items[1].name": "B",
+            "items[2]": "C",
+            "profile.contact.email": "a@example.com",
+        })
+
+    def test_behaves_like_dict(self):
+        """通常の dict として扱えることを確認"""
+        self.assertIsInstance(self.buffer, dict)
+        self.assertEqual(self.buffer["items[0].name"], "A")
+        self.assertEqual(list(self.buffer)[0], "name")
+
+    def test_list_entries(self):
+        """リストのインデックスごとにキーを取得できることを確認"""
+        entries = self.buffer.list_entries("items")
+        self.assertEqual(set(entries.keys()), {0, 1, 2})
+        self.assertEqual(entries[0], ["items[0].name", "items[0].value"])
+        self.assertEqual(entries[2], ["items[2]"])
+        self.assertEqual(self.buffer.list_entries("missing"), {})
+
+    def test_list_indices(self):
+        """項目があるインデックスを昇順で取得できることを確認"""
+        self.buffer["items[10]"] = "K"
+        self.assertEqual(self.buffer.list_indices("items"), [0, 1, 2, 10])
+        self.assertEqual(self.buffer.list_indices("missing"), [])
+
+    def test_max_list_index(self):
+        """最大インデックスを取得できることを確認"""
+        self.assertEqual(self.buffer.max_list_index("items"), 2)
+        self.assertEqual(self.buffer.max_list_index("missing"), -1)
+
+    def test_list_item_fields(self):
+        """項目のキーとインデックス以降の部分が挿入時に解析されていることを確認"""
+        self.assertEqual(
+            self.buffer.list_item_fields("items", 0),
+            [("items[0].name", ".name"), ("items[0].value", ".value")]
+        )
+        self.assertEqual(self.buffer.list_item_fields("items", 2), [("items[2]", "")])
+        self.assertEqual(self.buffer.list_item_fields("items", 9), [])
+
+    def test_subtree_keys(self):
+        """指定パス自身と配下のキーを取得できることを確認"""
+        self.assertEqual(self.buffer.subtree_keys("items[0]"), ["items[0].name", "items[0].value"])
+        self.assertEqual(self.buffer.subtree_keys("items[2]"), ["items[2]"])
+        self.assertEqual(self.buffer.subtree_keys("profile"), ["profile.contact.email"])
+        self.assertEqual(self.buffer.subtree_keys("name"), ["name"])
+
+    def test_index_follows_mutations(self):
+        """削除・pop・clear で索引が更新されることを確認"""
+        del self.buffer["items[0].name"]
+        self.buffer.pop("items[1].name")
+        self.assertEqual(self.buffer.list_entries("items"), {0: ["items[0].value"], 2: ["items[2]"]})
+
+        self.buffer["items[3].name"] = "D"
+        self.assertIn(3, self.buffer.list_entries("items"))
+
+        self.buffer.clear()
+        self.assertEqual(self.buffer.list_entries("items"), {})
+        self.assertEqual(self.buffer.subtree_keys("profile"), [])
+
+    def test_copy_rebuilds_index(self):
+        """deepcopy した EditBuffer でも索引が使えることを確認"""
+        copied = copy.deepcopy(self.buffer)
+        self.assertIsInstance(copied, EditBuffer)
+        self.assertEqual(copied.list_entries("items"), self.buffer.list_entries("items"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -234,4 +234,32 @@ class TestEditBufferSave:
         
         # Verify no changes were made
         assert app_state["selected_node_id"] == "item1"
-        assert "item1" in app_state["data_map"]
\ No newline at end of file
+        assert "item1" in app_state["data_map"]
+
+    def test_save_id_rename_then_commit_new_node(self, form_manager, data_manager, app_state):
+        """Test that a node renamed via save_changes is not overwritten by the next generated ID"""
+        nodes = [{"id": i, "name": f"Item {i}"} for i in range(1, 11)]
+        app_state["raw_data"] = nodes
+        app_state["data_map"] = {str(node["id"]): node for node in nodes}
+        app_state["data_manager"] = data_manager
+        app_state["analysis_results"] = {
+            "heuristic_suggestions": {"identifier": "id"},
+            "field_details": [{"name": "id", "types": [("int", 10)]}],
+        }
+        assert form_manager._get_numeric_id_max(list(app_state["data_map"])) == 10
+
+        # Rename node 5 to 11 with the Save button
+        event = Mock()
+        app_state["selected_node_id"] = "5"
+        app_state["edit_buffer"] = {"id": 11}
+        app_state["is_dirty"] = True
+        form_manager.save_changes(event)
+        assert app_state["data_map"]["11"]["name"] == "Item 5"
+
+        # Commit a new node without an ID
+        app_state["add_mode"] = True
+        app_state["edit_buffer"] = {"name": "New Item"}
+        form_manager.commit_new_node(event)
+
+        assert app_state["data_map"]["11"]["name"] == "Item 5"
+        assert app_state["data_map"]["12"]["name"] == "New Item"
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+SearchManagerの検索インデックスの単体テスト
+転置インデックスで絞り込んだ候補が、全件の部分一致検索と同じ結果になることを確認する
+"""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# テスト対象のモジュールをインポート
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from managers.search_manager import SearchManager
+
+
+class TestSearchIndex(unittest.TestCase):
+    """検索インデックスのテスト"""
+
+    def setUp(self):
+        """テストの準備"""
+        nodes = [
+            {
+                "id": str(i),
+                "name": f"ノード{i} Hello_World",
+                "tags": ["alpha", f"tag{i}"],
+                "profile": {"email": f"user{i}@example.com", "memo": "日本語のメモ"},
+            }
+            for i in range(5)
+        ]
+        self.app_state = {
+            "raw_data": nodes,
+            "data_map": {node["id"]: node for node in nodes},
+            "children_map": {},
+            "id_key": "id",
+            "label_key": "name",
+            "children_key": "children",
+        }
+        self.manager = SearchManager(self.app_state, {}, None)
+        self.manager.build_search_index()
+
+    def _brute_force_rows(self, term):
+        return [i for i, item in enumerate(self.manager.search_index) if term in item["text"]]
+
+    def _candidate_matches(self, term):
+        index = self.manager.search_index
+        return [i for i in self.manager._candidate_rows(term) if term in index[i]["text"]]
+
+    def test_candidates_match_substring_search(self):
+        """1語・複数語・記号を含む検索語で全件検索と同じ行が得られることを確認"""
+        for term in ["alpha", "lph", "o_w", "tag3", "本語", "example.com", "user1@", "hello world", "missing"]:
+            with self.subTest(term=term):
+                self.assertEqual(self._candidate_matches(term), self._brute_force_rows(term))
+
+    def test_field_text_map_holds_leaf_values(self):
+        """フィールドごとの検索テキストに葉の値のみが登録されることを確認"""
+        field_text_map = self.manager.search_index[0]["field_text_map"]
+        self.assertEqual(field_text_map["tags[0]"], "alpha")
+        self.assertEqual(field_text_map["profile.email"], "email user0@example.com")
+        self.assertNotIn("profile", field_text_map)
+        self.assertEqual(self.manager._find_matched_field_paths(self.manager.search_index[0], "メモ"), ["profile.memo"])
+
+    def test_search_text_is_casefolded(self):
+        """検索テキストが casefold され、ß と ss を同一視できることを確認"""
+        self.app_state["data_map"]["1"]["city"] = "Straße"
+        self.manager.build_search_index()
+        self.assertEqual(self.manager.search_index[1]["field_text_map"]["city"], "strasse")
+        self.assertEqual(self._candidate_matches("STRASSE".casefold()), [1])
+
+    def test_extended_term_reuses_previous_rows(self):
+        """検索語を打ち足した場合、直前の一致行のみから同じ結果が得られることを確認"""
+        self.manager._collect_search_results("tag")
+        self.assertEqual(self.manager._last_match_rows, [0, 1, 2, 3, 4])
+        extended = self.manager._collect_search_results("tag3")
+        self.assertEqual(self.manager._last_match_rows, [3])
+        self.assertEqual([r["id"] for r in extended], ["3"])
+
+        # インデックスが変わった場合は直前の一致行を使わない
+        self.app_state["data_map"]["1"]["tags"].append("tag3")
+        self.manager.update_search_index("1")
+        self.assertEqual(self.manager._last_match_rows, [])
+        self.assertEqual([r["id"] for r in self.manager._collect_search_results("tag3")], ["1", "3"])
+
+    def test_multi_term_query_matches_all_terms(self):
+        """空白区切りの検索語がすべての語を含む行に一致することを確認"""
+        results = self.manager._collect_search_results("tag2 alpha")
+        self.assertEqual([r["id"] for r in results], ["2"])
+        self.assertIsNone(results[0]["matched_paths"])
+        self.assertEqual(self.manager._get_matched_paths(results[0]), ["tags[1]", "tags[0]"])
+        self.assertEqual(self.manager._collect_search_results("tag2 missing"), [])
+
+        # 語を打ち足した場合も直前の一致行から絞り込める
+        self.manager._collect_search_results("alpha")
+        self.assertEqual([r["id"] for r in self.manager._collect_search_results("alpha tag4")], ["4"])
+
+    def test_mark_field_dirty_matches_rebuild(self):
+        """フィールド単位の更新結果が全体の再構築と一致し、構成が変わる変更は対象外になることを確認"""
+        self.manager._get_token_postings()
+        node = self.app_state["data_map"]["3"]
+        node["profile"]["email"] = "Changed@Example.org"
+        self.assertTrue(self.manager.mark_field_dirty("3", "profile.email", node["profile"]["email"]))
+        node["tags"][1] = "omega"
+        self.assertTrue(self.manager.mark_field_dirty("3", "tags[1]", "omega"))
+        updated_rows = [(item["id"], item["text"], item["field_text_map"]) for item in self.manager.search_index]
+        updated_postings = dict(self.manager._get_token_postings())
+
+        self.manager.build_search_index()
+        self.assertEqual(updated_rows, [(item["id"], item["text"], item["field_text_map"])
+                                        for item in self.manager.search_index])
+        self.assertEqual(updated_postings, self.manager._get_token_postings())
+
+        self.assertFalse(self.manager.mark_field_dirty("3", "name", "renamed"))
+        self.assertFalse(self.manager.mark_field_dirty("3", "profile", "flat"))
+        self.assertFalse(self.manager.mark_field_dirty("3", "tags[1]", ""))
+        self.assertFalse(self.manager.mark_field_dirty("3", "missing", "value"))
+
+    def test_postings_follow_index_rebuild(self):
+        """インデックス再構築後に転置インデックスが作り直されることを確認"""
+        self.assertEqual(self._candidate_matches("tag4"), self._brute_force_rows("tag4"))
+        self.app_state["data_map"]["4"]["tags"].append("fresh")
+        self.manager.build_search_index()
+        self.assertEqual(len(self._candidate_matches("fresh")), 1)
+
+    def test_update_search_index_matches_rebuild(self):
+        """ノード単位の更新結果が全体の再構築と一致することを確認"""
+        self.manager._get_token_postings()
+        self.manager._get_row_bytes()
+        self.app_state["data_map"]["2"]["tags"] = ["beta"]
+        self.manager.update_search_index("2")
+        self.app_state["data_map"]["9"] = {"id": "9", "name": "new", "tags": ["gamma"]}
+        self.manager.update_search_index("9")
+        updated_rows = [(item["id"], item["text"]) for item in self.manager.search_index]
+        updated_postings = dict(self.manager._get_token_postings())
+        self.assertTrue(self.manager._row_texts_valid())
+        self.assertEqual(self.manager._row_texts, [text for _, text in updated_rows])
+        self.assertTrue(self.manager._row_bytes_valid())
+        self.assertEqual(self.manager._row_bytes, [text.encode("utf-8") for _, text in updated_rows])
+        self.assertEqual([r["id"] for r in self.manager._collect_search_results("beta")], ["2"])
+
+        self.manager.build_search_index()
+        self.assertEqual(updated_rows, [(item["id"], item["text"]) for item in self.manager.search_index])
+        self.assertEqual(updated_postings, self.manager._get_token_postings())
+
+    def test_unknown_node_id_keeps_index(self):
+        """見つからないノードIDでは全体を再構築せず、force=True の場合のみ再構築することを確認"""
+        index = self.manager.search_index
+        version = self.manager._index_version
+        with self.assertLogs("managers.search_manager", level="WARNING"):
+            self.manager.update_search_index("missing")
+        self.assertIs(self.manager.search_index, index)
+        self.assertEqual(self.manager._index_version, version)
+
+        self.manager.update_search_index("missing", force=True)
+        self.assertIsNot(self.manager.search_index, index)
+
+    def test_batched_updates_match_rebuild(self):
+        """複数ノードの一括更新が全体の再構築と一致することを確認"""
+        self.app_state["data_map"]["0"]["tags"] = ["beta"]
+        self.app_state["data_map"]["4"]["tags"] = ["delta"]
+        self.manager.update_search_index(["0", "4", "0", "missing"])
+        updated_rows = [(item["id"], item["text"]) for item in self.manager.search_index]
+
+        self.manager.build_search_index()
+        self.assertEqual(updated_rows, [(item["id"], item["text"]) for item in self.manager.search_index])
+
+    def test_unrelated_update_skips_search(self):
+        """検索語に一致しない行の更新では再検索せず、一致する行の更新では再検索することを確認"""
+        self.manager.search_term = "tag3"
+        with patch.object(self.manager, "perform_search") as perform_search:
+            self.app_state["data_map"]["1"]["tags"].append("other")
+            self.manager.update_search_index("1")
+            perform_search.assert_not_called()
+
+            # 更新後に一致する場合・更新前に一致していた場合は再検索する
+            self.app_state["data_map"]["1"]["tags"].append("tag3")
+            self.manager.update_search_index("1")
+            self.app_state["data_map"]["3"]["tags"] = []
+            self.manager.update_search_index("3")
+            self.assertEqual(perform_search.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+SettingsManagerの単体テスト
+設定の遅延保存・一時ファイル経由の書き込み・終了時の保存を確認する
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock, patch
+import sys
+
+# テスト対象のモジュールをインポート
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import managers.settings_manager as settings_module
+from managers.settings_manager import SettingsManager
+
+
+class TestSettingsManager(unittest.TestCase):
+    """SettingsManagerのテスト"""
+
+    def setUp(self):
+        """テストの準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.event_hub = Mock()
+        with patch.object(settings_module.atexit, "register") as register:
+            self.manager = SettingsManager(self.event_hub)
+        self.exit_hook = register.call_args[0][0]
+        # 実際の設定ファイルではなく一時ディレクトリに書き込む
+        self.settings_file = os.path.join(self.temp_dir, "data", "settings.json")
+        self.manager._settings_file = self.settings_file
+
+    def tearDown(self):
+        """後片付け"""
+        with self.manager._flush_lock:
+            if self.manager._flush_timer is not None:
+                self.manager._flush_timer.cancel()
+            self.manager._dirty = False
+        self.manager._write_executor.shutdown(wait=True)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _read_settings(self):
+        with open(self.settings_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_setters_are_saved_once_after_delay(self):
+        """連続した変更が遅延後に1回だけ保存されることを確認"""
+        with patch.object(settings_module, "_SETTINGS_FLUSH_DELAY_SEC", 0.05), \
+                patch.object(self.manager, "_write_to_disk", wraps=self.manager._write_to_disk) as write:
+            self.manager.set_setting("auto_save", False)
+            self.manager.set_color_scheme_seed("teal")
+            self.manager.add_recent_file("a.json")
+            self.assertFalse(os.path.exists(self.settings_file))
+
+            timer = self.manager._flush_timer
+            timer.join()
+            self.manager._write_executor.shutdown(wait=True)
+
+        self.assertEqual(write.call_count, 1)
+        saved = self._read_settings()
+        self.assertFalse(saved["auto_save"])
+        self.assertEqual(saved["color_scheme_seed"], "teal")
+        self.assertEqual(saved["recent_files"], ["a.json"])
+        self.assertFalse(self.manager._dirty)
+
+    def test_setters_wait_for_snapshot_lock(self):
+        """JSON への変換中(ロック保持中)は設定が変更されないことを確認"""
+        with self.manager._flush_lock:
+            setter = threading.Thread(target=self.manager.set_setting, args=("added", 1))
+            setter.start()
+            setter.join(0.05)
+            self.assertTrue(setter.is_alive())
+            self.assertNotIn("added", self.manager._settings)
+        setter.join()
+        self.assertEqual(self.manager.get_setting("added"), 1)
+
+    def test_write_replaces_file_atomically(self):
+        """一時ファイルに書き込んでから置き換え、失敗時は元のファイルと通知を残すことを確認"""
+        self.manager._write_to_disk('{"theme_mode":"dark"}')
+        self.assertEqual(self._read_settings(), {"theme_mode": "dark"})
+        self.assertFalse(os.path.exists(self.settings_file + ".tmp"))
+
+        with patch.object(settings_module.os, "replace", side_effect=OSError("disk full")):
+            self.manager._write_to_disk('{"theme_mode":"light"}')
+        self.assertEqual(self._read_settings(), {"theme_mode": "dark"})
+        self.assertFalse(os.path.exists(self.settings_file + ".tmp"))
+        self.assertEqual(self.event_hub.publish.call_args[0][0], "error_occurred")
+
+    def test_unserializable_value_is_reported(self):
+        """JSON に変換できない値は書き込まずに通知されることを確認"""
+        self.manager.set_setting("bad", {1, 2})
+        self.manager.save_settings()
+        self.manager._write_executor.shutdown(wait=True)
+        self.assertFalse(os.path.exists(self.settings_file))
+        self.assertEqual(self.event_hub.publish.call_args[0][0], "error_occurred")
+
+    def test_exit_hook_writes_pending_changes(self):
+        """終了時の処理で未保存の変更がその場で書き込まれることを確認"""
+        self.assertEqual(self.exit_hook, self.manager._flush_on_exit)
+        self.manager.set_theme_mode("dark")
+        self.exit_hook()
+        self.assertEqual(self._read_settings()["theme_mode"], "dark")
+        self.assertFalse(self.manager._dirty)
+
+    def test_save_after_executor_shutdown_writes_synchronously(self):
+        """書き込み用のスレッドが終了した後はその場で書き込むことを確認"""
+        self.manager._write_executor.shutdown(wait=True)
+        self.manager.set_setting("auto_save", False)
+        self.manager.save_settings()
+        self.assertFalse(self._read_settings()["auto_save"])
+
+
+if __name__ == '__main__':
+    unittest.main()